@@ -21,4 +21,6 @@ urlpatterns = [
     path('api/load-scenarios/', views.load_sample_scenarios, name='load_scenarios'),
     path('api/metrics/', views.api_full_metrics, name='api_full_metrics'),
     path('api/query/', views.api_hive_query, name='api_hive_query'),
+    path('api/query/<uuid:job_id>/', views.api_hive_query_job, name='api_hive_query_job'),
+    path('api/query/<uuid:job_id>/results/', views.api_hive_query_results, name='api_hive_query_results'),
 ]
@@ -2,9 +2,11 @@
 Views for Hive Assessment Tool
 Dynamic data retrieval with SQLite fallback
 """
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
+from django.urls import reverse
 from django.utils import timezone
 from django.db.models import Avg, Count, Max, Min
 import time
@@ -15,8 +17,9 @@ from hive_assessment.models import (
     AssessmentScenario, QueryBenchmark, PerformanceMetric,
     HiveConfiguration, OptimizationRecommendation
 )
+from hive_climate.admission import admission_controlled
 from hive_climate.hive_connector import get_hive_manager, is_hive_available, is_hive_enabled
-from hive_climate.models import ClimateObservation, WeatherStation, Region
+from hive_climate.services.statistics import get_statistics
 
 logger = logging.getLogger(__name__)
 
@@ -39,11 +42,12 @@ def get_assessment_stats():
 
 def get_climate_data_stats():
     """Get climate data statistics for display"""
+    snapshot = get_statistics()
     return {
-        'observations': ClimateObservation.objects.count(),
-        'stations': WeatherStation.objects.count(),
-        'regions': Region.objects.count(),
-        'countries': WeatherStation.objects.values('country').distinct().count(),
+        'observations': snapshot.observation_count,
+        'stations': snapshot.station_count,
+        'regions': snapshot.region_count,
+        'countries': snapshot.country_count,
     }
 
 
@@ -99,6 +103,7 @@ def assessment_dashboard(request):
     return render(request, 'hive_assessment/dashboard.html', context)
 
 
+@admission_controlled('assessment')
 def run_assessment(request):
     """
     Execute a benchmark assessment
@@ -483,6 +488,7 @@ def api_recommendations(request):
     })
 
 
+@admission_controlled('metrics')
 def api_full_metrics(request):
     """
     API endpoint for fetching all available metrics from Hive and HDFS.
@@ -700,24 +706,107 @@ def api_hive_query(request):
     if not is_hive_enabled() or not is_hive_available():
         return JsonResponse({'error': 'Hive is not available'}, status=503)
     
-    try:
-        hive = get_hive_manager()
-        start = time.time()
-        results = hive.execute_query(query)
-        execution_time = time.time() - start
-        
-        return JsonResponse({
-            'success': True,
-            'query': query,
-            'execution_time': round(execution_time, 3),
-            'row_count': len(results) if results else 0,
-            'results': results[:100] if results else [],  # Limit results
-        })
-    except Exception as e:
+    # Runs as a background job; slow queries return 202 with the job to poll
+    from hive_climate.services.query_jobs import read_page, run_job
+    
+    job = run_job(query, user=request.user)
+    if job.status == 'failed':
         return JsonResponse({
             'success': False,
-            'error': str(e),
+            'job_id': str(job.pk),
+            'error': job.error_message,
         }, status=500)
+    if job.status != 'succeeded':
+        return JsonResponse({
+            'success': True,
+            'query': query,
+            'job_id': str(job.pk),
+            'status': job.status,
+            **_query_job_urls(request, job),
+        }, status=202)
+    
+    columns, results = read_page(job, 0, 100)
+    return JsonResponse({
+        'success': True,
+        'query': query,
+        'job_id': str(job.pk),
+        'execution_time': round(job.execution_time, 3),
+        'row_count': job.row_count,
+        'columns': columns,
+        'results': results,
+        **_query_job_urls(request, job),
+    })
+
+
+def _query_job_urls(request, job):
+    """Status and results URLs of a job under the same access rules as api_hive_query"""
+    return {
+        'status_url': request.build_absolute_uri(reverse('hive_assessment:api_hive_query_job', args=[job.pk])),
+        'results_url': request.build_absolute_uri(reverse('hive_assessment:api_hive_query_results', args=[job.pk])),
+    }
+
+
+def _get_query_job(request, job_id):
+    """
+    A query job the requester may read, or None
+    
+    Job ids are random UUIDs handed out by api_hive_query; a job
+    submitted by a signed-in user is only shown to that user and staff.
+    """
+    from hive_climate.models import HiveQueryJob
+    
+    job = HiveQueryJob.objects.filter(pk=job_id).first()
+    if job is None or job.submitted_by_id is None or request.user.is_staff:
+        return job
+    if job.submitted_by_id != request.user.pk:
+        return None
+    return job
+
+
+def api_hive_query_job(request, job_id):
+    """
+    Status of a query started by api_hive_query
+    """
+    from hive_climate.services.query_jobs import job_status
+    
+    job = _get_query_job(request, job_id)
+    if job is None:
+        return JsonResponse({'error': 'Unknown job'}, status=404)
+    return JsonResponse({**job_status(job), **_query_job_urls(request, job)})
+
+
+def api_hive_query_results(request, job_id):
+    """
+    Page through the results of a query started by api_hive_query
+    """
+    from hive_climate.services.query_jobs import JobExpired, JobNotReady, read_page
+    
+    job = _get_query_job(request, job_id)
+    if job is None:
+        return JsonResponse({'error': 'Unknown job'}, status=404)
+    
+    max_limit = getattr(settings, 'HIVE_QUERY_PAGE_MAX', 10000)
+    try:
+        offset = max(0, int(request.GET.get('offset', 0)))
+        limit = max(1, min(int(request.GET.get('limit', 100)), max_limit))
+    except ValueError:
+        return JsonResponse({'error': 'offset and limit must be integers'}, status=400)
+    
+    try:
+        columns, rows = read_page(job, offset, limit)
+    except JobExpired as e:
+        return JsonResponse({'error': str(e)}, status=410)
+    except JobNotReady as e:
+        return JsonResponse({'error': str(e), 'status': job.status}, status=409)
+    
+    return JsonResponse({
+        'job_id': str(job.pk),
+        'count': job.row_count,
+        'offset': offset,
+        'limit': limit,
+        'columns': columns,
+        'results': rows,
+    })
 
 
 def load_sample_scenarios(request):
@@ -0,0 +1,208 @@
+"""
+Admission Control for expensive endpoints
+
+Endpoints are grouped into classes (settings.ADMISSION_CONTROL) that each
+allow a fixed number of concurrent requests plus a bounded queue of
+waiting ones. A request that finds the queue full is shed at once with a
+429; one that waits longer than the class timeout gets a 503. Both carry
+a Retry-After estimated from recent service times, so a burst of slow
+requests can't take every worker away from the cheap endpoints.
+
+Limits are per process: with several server processes each one admits
+up to the configured concurrency.
+"""
+import functools
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict
+
+from django.conf import settings
+from django.http import HttpRequest, JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(APIException):
+    """Base for requests shed by admission control; wait sets Retry-After"""
+
+    def __init__(self, endpoint_class: str, retry_after: int, detail=None):
+        super().__init__(detail)
+        self.endpoint_class = endpoint_class
+        self.wait = retry_after
+
+
+class QueueFull(AdmissionRejected):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    default_detail = 'Too many concurrent requests for this endpoint, retry later'
+    default_code = 'queue_full'
+
+
+class QueueTimeout(AdmissionRejected):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Server busy, the request waited too long to start'
+    default_code = 'queue_timeout'
+
+
+class Gate:
+    """
+    Concurrency limit with a bounded FIFO wait queue for one endpoint class
+
+    Args:
+        name: Endpoint class name
+        concurrency: Requests running at once
+        queue: Requests allowed to wait for a slot
+        timeout: Seconds a request may wait before it is shed
+    """
+
+    def __init__(self, name: str, concurrency: int, queue: int, timeout: float):
+        self.name = name
+        self.concurrency = max(1, int(concurrency))
+        self.queue = max(0, int(queue))
+        self.timeout = float(timeout)
+        self._condition = threading.Condition()
+        self._active = 0
+        self._tickets = []
+        self._next_ticket = 0
+        # Moving average of service time, seeds the Retry-After estimate
+        self._service_time = 1.0
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.max_queue_depth = 0
+
+    def retry_after(self, queued: int = None) -> int:
+        """Seconds until a slot is likely free for a new arrival"""
+        queued = len(self._tickets) if queued is None else queued
+        return max(1, math.ceil(self._service_time * (queued + 1) / self.concurrency))
+
+    def acquire(self):
+        """
+        Take a slot, waiting in line for at most the class timeout
+
+        Raises:
+            QueueFull: The wait queue is full
+            QueueTimeout: No slot freed up in time
+        """
+        with self._condition:
+            if self._active < self.concurrency and not self._tickets:
+                self._active += 1
+                self.admitted += 1
+                return
+            if len(self._tickets) >= self.queue:
+                self.rejected_full += 1
+                retry_after = self.retry_after()
+                logger.warning(f"Admission '{self.name}': queue full ({len(self._tickets)} waiting), shedding request")
+                raise QueueFull(self.name, retry_after)
+
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._tickets.append(ticket)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._tickets))
+            deadline = time.monotonic() + self.timeout
+            try:
+                while not (self._tickets[0] == ticket and self._active < self.concurrency):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected_timeout += 1
+                        logger.warning(f"Admission '{self.name}': request waited {self.timeout}s, shedding it")
+                        raise QueueTimeout(self.name, self.retry_after())
+                    self._condition.wait(remaining)
+            finally:
+                self._tickets.remove(ticket)
+                # The head of the line may have changed
+                self._condition.notify_all()
+            self._active += 1
+            self.admitted += 1
+
+    def release(self, elapsed: float):
+        with self._condition:
+            self._active -= 1
+            self._service_time = 0.8 * self._service_time + 0.2 * elapsed
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                'concurrency': self.concurrency,
+                'queue_limit': self.queue,
+                'timeout': self.timeout,
+                'active': self._active,
+                'queue_depth': len(self._tickets),
+                'max_queue_depth': self.max_queue_depth,
+                'admitted': self.admitted,
+                'rejected_queue_full': self.rejected_full,
+                'rejected_timeout': self.rejected_timeout,
+                'avg_service_time': round(self._service_time, 3),
+            }
+
+
+_gates: Dict[str, Gate] = {}
+_gates_lock = threading.Lock()
+
+
+def get_gate(endpoint_class: str):
+    """Gate for an endpoint class, or None when it has no limit"""
+    if not getattr(settings, 'ADMISSION_CONTROL_ENABLED', True):
+        return None
+    config = getattr(settings, 'ADMISSION_CONTROL', {}).get(endpoint_class)
+    if not config:
+        return None
+    with _gates_lock:
+        gate = _gates.get(endpoint_class)
+        if gate is None:
+            gate = Gate(
+                endpoint_class,
+                concurrency=config.get('concurrency', 1),
+                queue=config.get('queue', 0),
+                timeout=config.get('timeout', 5),
+            )
+            _gates[endpoint_class] = gate
+        return gate
+
+
+def admission_stats() -> Dict[str, Dict[str, Any]]:
+    """Current load and rejection counts per endpoint class"""
+    stats = {}
+    for endpoint_class in getattr(settings, 'ADMISSION_CONTROL', {}):
+        gate = get_gate(endpoint_class)
+        if gate is not None:
+            stats[endpoint_class] = gate.stats()
+    return stats
+
+
+def admission_controlled(endpoint_class: str):
+    """
+    Run a view under the endpoint class's concurrency limit
+
+    Works on plain Django views and on viewset methods. Shed requests get
+    a JSON error with a Retry-After header: plain views answer
+    {'error': ...}, viewset methods raise an AdmissionRejected that DRF
+    renders. Placed under conditional_on_data_version, 304s skip the gate.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            gate = get_gate(endpoint_class)
+            if gate is None:
+                return view(*args, **kwargs)
+            plain_view = isinstance(args[0], HttpRequest)
+            try:
+                gate.acquire()
+            except AdmissionRejected as e:
+                if not plain_view:
+                    raise
+                response = JsonResponse({'error': str(e.detail)}, status=e.status_code)
+                response['Retry-After'] = str(e.wait)
+                return response
+
+            start = time.monotonic()
+            try:
+                return view(*args, **kwargs)
+            finally:
+                gate.release(time.monotonic() - start)
+        return wrapper
+    return decorator
@@ -8,7 +8,7 @@ from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
 from hive_climate.api_views import (
     RegionViewSet, WeatherStationViewSet, ClimateObservationViewSet,
-    AnalyticsViewSet, HiveQueryViewSet, DataImportLogViewSet, HealthViewSet
+    AnalyticsViewSet, HiveQueryViewSet, HiveQueryJobViewSet, DataImportLogViewSet, HealthViewSet
 )
 
 # Create router and register viewsets
@@ -17,6 +17,7 @@ router.register(r'regions', RegionViewSet, basename='region')
 router.register(r'stations', WeatherStationViewSet, basename='weatherstation')
 router.register(r'observations', ClimateObservationViewSet, basename='climateobservation')
 router.register(r'analytics', AnalyticsViewSet, basename='analytics')
+router.register(r'hive/jobs', HiveQueryJobViewSet, basename='hive-job')
 router.register(r'hive', HiveQueryViewSet, basename='hive')
 router.register(r'import-logs', DataImportLogViewSet, basename='importlog')
 router.register(r'health', HealthViewSet, basename='health')
@@ -1,10 +1,18 @@
 """
 API ViewSets for Climate Data
 """
-from django.db.models import Avg, Sum, Count, Q, Min, Max
+import contextlib
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.db.models import Sum, Count, F, Q
 from django.utils import timezone
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
@@ -13,29 +21,213 @@ from drf_spectacular.types import OpenApiTypes
 
 from hive_climate.models import (
     Region, WeatherStation, ClimateObservation,
-    DataImportLog, HiveQueryLog
+    DataImportLog, HiveQueryJob, StationMonthlyRollup, RegionMonthlyRollup, StationProfile,
+    StationBaseline, RegionBaseline, RegionAnomaly, ROLLUP_MEASURES
 )
 from hive_climate.serializers import (
     RegionSerializer, WeatherStationSerializer, WeatherStationListSerializer,
     ClimateObservationSerializer, ClimateObservationCreateSerializer,
     TemperatureTrendSerializer, PrecipitationDataSerializer,
     OceanConditionsSerializer, DataImportLogSerializer,
-    HiveQueryLogSerializer, HiveQueryExecuteSerializer
+    HiveQueryLogSerializer, HiveQueryExecuteSerializer,
+    OBSERVATION_ROWS, STATION_LIST_ROWS, REGION_ROWS
+)
+from hive_climate.pagination import ObservationKeysetPagination
+from hive_climate.admission import admission_controlled, admission_stats
+from hive_climate.conditional import conditional_on_data_version
+from hive_climate.renderers import (
+    ArrowRenderer, CSVRenderer, FastJSONRenderer, NDJSONRenderer, ParquetRenderer, dumps,
+)
+from hive_climate.services.climatology import reference_period
+from hive_climate.services.data_version import WritesBlocked, guard_writes
+from hive_climate.services.derived import data_changed
+from hive_climate.services.export import (
+    ARROW_FORMATS, CONTENT_TYPES as EXPORT_CONTENT_TYPES, is_parquet_available, iter_objects,
+    stream_export, stream_rows_arrow,
+)
+from hive_climate.services import cube, pushdown
+from hive_climate.services.downsampling import RESOLUTIONS, get_downsampled_series
+from hive_climate.services.ingest import IngestError, ingest_batch
+from hive_climate.services.query_jobs import (
+    JobExpired, JobNotReady, cancel_job, job_status, read_page, run_job, submit_job,
 )
-from hive_climate.hive_connector import get_hive_manager
+from hive_climate.services.rollups import rollup_average, station_partitions
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Accepted request media types for observation batch ingest
+INGEST_CONTENT_TYPES = {
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'text/csv': 'csv',
+}
+
+# Response header naming the engine that computed an analytics result
+ENGINE_HEADER = 'X-Query-Engine'
+
+ENGINE_PARAMETER = OpenApiParameter(
+    'engine', OpenApiTypes.STR, enum=pushdown.ENGINES, default='auto',
+    description='auto pushes the aggregation down to Hive when local data does not cover the range or it is too large',
+)
+
+FIELDS_PARAMETER = OpenApiParameter(
+    'fields', OpenApiTypes.STR,
+    description='Comma-separated fields to return; only the matching columns are queried',
+)
+
+
+class HiveUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Hive is not available'
+
+
+class LoadInProgress(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'A data load is in progress; writes are paused until it finishes'
+    default_code = 'load_in_progress'
+    # Seconds for Retry-After
+    wait = 60
+
 
-class RegionViewSet(viewsets.ReadOnlyModelViewSet):
+@contextlib.contextmanager
+def guarded_write():
+    """Run an API write under data_version.guard_writes, as a 503 while a load runs"""
+    try:
+        with guard_writes():
+            yield
+    except WritesBlocked:
+        raise LoadInProgress()
+
+
+class GuardedWritesMixin:
+    """
+    create/update/destroy refused while a staged load runs
+    
+    Rows written between a load copying the live table and swapping in
+    the new generation would be lost (see data_version.block_writes).
+    """
+    
+    def create(self, request, *args, **kwargs):
+        with guarded_write():
+            return super().create(request, *args, **kwargs)
+    
+    def update(self, request, *args, **kwargs):
+        with guarded_write():
+            return super().update(request, *args, **kwargs)
+    
+    def destroy(self, request, *args, **kwargs):
+        with guarded_write():
+            return super().destroy(request, *args, **kwargs)
+
+
+class ValuesListMixin:
+    """
+    list() built from values() rows instead of serializer instances
+    
+    Filtering, ordering and pagination are unchanged; list_rows
+    (a serializers.ValuesRows) reproduces the list serializer's output.
+    """
+    list_rows = None
+    
+    def get_list_rows(self):
+        return self.list_rows
+    
+    def list(self, request, *args, **kwargs):
+        rows = self.get_list_rows()
+        queryset = rows.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(rows.to_representation(page))
+        return Response(rows.to_representation(queryset))
+
+
+class SparseFieldsMixin:
+    """
+    ?fields=a,b limits a response to the named fields
+    
+    Lists select only the matching columns (and joins) through
+    get_list_rows(); other reads drop the unrequested serializer fields
+    and, where the remaining ones allow it, the select_related joins and
+    unused columns.
+    """
+    fields_query_param = 'fields'
+    # Paths list() selects even when not requested, e.g. pagination keys
+    list_row_keys = ()
+    
+    def requested_fields(self):
+        """Requested field names, or None for all"""
+        if not hasattr(self, '_requested_fields'):
+            raw = self.request.query_params.get(self.fields_query_param) if self.request else None
+            names = [name.strip() for name in raw.split(',') if name.strip()] if raw else []
+            self._requested_fields = names or None
+        return self._requested_fields
+    
+    def get_list_rows(self):
+        rows = super().get_list_rows()
+        fields = self.requested_fields()
+        if fields is None:
+            return rows
+        try:
+            return rows.subset(fields, extra_paths=self.list_row_keys)
+        except ValueError as e:
+            raise ValidationError({self.fields_query_param: str(e)})
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.requested_fields()
+        if fields is None or self.action != 'retrieve':
+            return queryset
+        serializer_fields = self.get_serializer_class()().fields
+        sources = [serializer_fields[name].source for name in fields if name in serializer_fields]
+        if not any('.' in source or source == '*' for source in sources):
+            queryset = queryset.select_related(None)
+            concrete = {field.name for field in queryset.model._meta.concrete_fields}
+            if all(source in concrete for source in sources):
+                queryset = queryset.only(queryset.model._meta.pk.name, *sources)
+        return queryset
+    
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.requested_fields()
+        if fields is None or self.request.method not in ('GET', 'HEAD'):
+            return serializer
+        target = getattr(serializer, 'child', serializer)
+        unknown = [name for name in fields if name not in target.fields]
+        if unknown:
+            raise ValidationError({self.fields_query_param: f"Unknown fields: {', '.join(unknown)}"})
+        for name in list(target.fields):
+            if name not in fields:
+                target.fields.pop(name)
+        return serializer
+
+
+class RegionViewSet(SparseFieldsMixin, ValuesListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing Region data
     """
-    queryset = Region.objects.all()
+    queryset = Region.objects.annotate(station_count=Count('stations')).order_by('name')
     serializer_class = RegionSerializer
+    list_rows = REGION_ROWS
     permission_classes = [IsAuthenticatedOrReadOnly]
     
+    def get_queryset(self):
+        fields = self.requested_fields()
+        if fields is not None and 'station_count' not in fields:
+            # Skip the station join and GROUP BY nobody asked for
+            return Region.objects.order_by('name')
+        return super().get_queryset()
+    
+    @extend_schema(parameters=[FIELDS_PARAMETER])
+    @conditional_on_data_version
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @extend_schema(parameters=[FIELDS_PARAMETER])
+    @conditional_on_data_version
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
     @extend_schema(
         summary="Get stations in region",
         description="Retrieve all weather stations in the specified region"
@@ -44,16 +236,17 @@ class RegionViewSet(viewsets.ReadOnlyModelViewSet):
     def stations(self, request, pk=None):
         """Get all stations in a region"""
         region = self.get_object()
-        stations = region.stations.filter(is_active=True)
+        stations = region.stations.filter(is_active=True).select_related('region')
         serializer = WeatherStationListSerializer(stations, many=True)
         return Response(serializer.data)
 
 
-class WeatherStationViewSet(viewsets.ModelViewSet):
+class WeatherStationViewSet(GuardedWritesMixin, SparseFieldsMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for Weather Station data
     """
-    queryset = WeatherStation.objects.select_related('region').all()
+    queryset = WeatherStation.objects.select_related('region', 'summary').all()
+    list_rows = STATION_LIST_ROWS
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['country', 'region', 'is_coastal', 'is_active']
@@ -66,6 +259,33 @@ class WeatherStationViewSet(viewsets.ModelViewSet):
             return WeatherStationListSerializer
         return WeatherStationSerializer
     
+    @extend_schema(parameters=[FIELDS_PARAMETER])
+    @conditional_on_data_version
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    def perform_create(self, serializer):
+        serializer.save()
+        data_changed()
+    
+    def perform_update(self, serializer):
+        old_partitions = station_partitions(serializer.instance)
+        old_region_id = serializer.instance.region_id
+        station = serializer.save()
+        if station.region_id != old_region_id:
+            # Move the station's months from the old region rollup to the new one
+            data_changed(
+                {(station.pk, year, month) for _, year, month in old_partitions},
+                region_partitions=old_partitions,
+            )
+        else:
+            data_changed()
+    
+    def perform_destroy(self, instance):
+        old_partitions = station_partitions(instance)
+        instance.delete()
+        data_changed(region_partitions=old_partitions)
+    
     @extend_schema(
         summary="Get recent observations",
         description="Retrieve recent climate observations for this station",
@@ -78,7 +298,9 @@ class WeatherStationViewSet(viewsets.ModelViewSet):
         """Get recent observations for a station"""
         station = self.get_object()
         limit = int(request.query_params.get('limit', 10))
-        observations = station.observations.order_by('-observation_date')[:limit]
+        observations = station.observations.select_related(
+            'station', 'station__region'
+        ).order_by('-observation_date')[:limit]
         serializer = ClimateObservationSerializer(observations, many=True)
         return Response(serializer.data)
     
@@ -88,24 +310,28 @@ class WeatherStationViewSet(viewsets.ModelViewSet):
     )
     @action(detail=True, methods=['get'])
     def statistics(self, request, pk=None):
-        """Get statistics for a station"""
+        """Get statistics for a station from its precomputed profile"""
         station = self.get_object()
-        stats = station.observations.aggregate(
-            total_observations=Count('id'),
-            avg_temp=Avg('temp_mean'),
-            avg_precipitation=Avg('precipitation'),
-            avg_humidity=Avg('humidity'),
-            min_date=Min('observation_date'),
-            max_date=Max('observation_date')
-        )
+        profile = StationProfile.objects.filter(station=station).first()
+        lifetime = profile.statistics if profile else {}
+        stats = {
+            'total_observations': lifetime.get('total_observations', 0),
+            'avg_temp': lifetime.get('avg_temp'),
+            'avg_precipitation': lifetime.get('avg_precip'),
+            'avg_humidity': lifetime.get('avg_humidity'),
+            'min_date': lifetime.get('min_date'),
+            'max_date': lifetime.get('max_date'),
+        }
         return Response(stats)
 
 
-class ClimateObservationViewSet(viewsets.ModelViewSet):
+class ClimateObservationViewSet(GuardedWritesMixin, SparseFieldsMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for Climate Observation data
     """
     queryset = ClimateObservation.objects.select_related('station', 'station__region').all()
+    list_rows = OBSERVATION_ROWS
+    list_row_keys = ('id', 'observation_date')
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = {
@@ -119,58 +345,156 @@ class ClimateObservationViewSet(viewsets.ModelViewSet):
     ordering_fields = ['observation_date', 'year', 'month', 'temp_mean']
     ordering = ['-observation_date']
     
+    @property
+    def paginator(self):
+        """Keyset pagination when a cursor is requested, page numbers otherwise"""
+        if not hasattr(self, '_paginator') and ObservationKeysetPagination.requested(self.request):
+            self._paginator = ObservationKeysetPagination()
+        return super().paginator
+    
     def get_serializer_class(self):
         if self.action == 'create':
             return ClimateObservationCreateSerializer
         return ClimateObservationSerializer
     
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if self.action == 'list':
+            renderers.append(ArrowRenderer())
+        return renderers
+    
+    @extend_schema(parameters=[FIELDS_PARAMETER])
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format == 'arrow':
+            return self._list_arrow(request)
+        return super().list(request, *args, **kwargs)
+    
+    def _list_arrow(self, request):
+        """
+        One page as an Arrow IPC stream in the list schema
+        
+        Pagination links go in a Link header and the total, when known,
+        in X-Total-Count.
+        """
+        if not is_parquet_available():
+            return Response({'error': 'Arrow output requires pyarrow'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        
+        rows = self.get_list_rows()
+        queryset = rows.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            chunks = iter_objects(queryset)
+        else:
+            chunks = [page]
+        response = StreamingHttpResponse(
+            stream_rows_arrow(rows, chunks), content_type=EXPORT_CONTENT_TYPES['arrow']
+        )
+        if page is not None:
+            links = [
+                f'<{url}>; rel="{rel}"'
+                for url, rel in ((self.paginator.get_next_link(), 'next'), (self.paginator.get_previous_link(), 'prev'))
+                if url
+            ]
+            if links:
+                response['Link'] = ', '.join(links)
+            paginator = self.paginator
+            if isinstance(paginator, ObservationKeysetPagination):
+                count = paginator.count
+            else:
+                count = paginator.page.paginator.count
+            if count is not None:
+                response['X-Total-Count'] = str(count)
+        return response
+    
+    def perform_create(self, serializer):
+        obs = serializer.save()
+        data_changed({(obs.station_id, obs.year, obs.month)})
+    
+    def perform_update(self, serializer):
+        old = serializer.instance
+        partitions = {(old.station_id, old.year, old.month)}
+        obs = serializer.save()
+        partitions.add((obs.station_id, obs.year, obs.month))
+        data_changed(partitions)
+    
+    def perform_destroy(self, instance):
+        partitions = {(instance.station_id, instance.year, instance.month)}
+        instance.delete()
+        data_changed(partitions)
+    
+    @extend_schema(
+        summary="Bulk ingest",
+        description=(
+            "Validate and upsert a batch of observations posted as NDJSON (application/x-ndjson) "
+            "or CSV (text/csv) with station_id and observation_date plus any measurement columns. "
+            "Invalid rows are reported in rejects; the rest are written in one transaction."
+        ),
+        request={'application/x-ndjson': OpenApiTypes.STR, 'text/csv': OpenApiTypes.STR},
+    )
+    @action(detail=False, methods=['post'])
+    def ingest(self, request):
+        """Bulk ingest observations"""
+        content_type = request.content_type.split(';')[0].strip().lower()
+        batch_format = INGEST_CONTENT_TYPES.get(content_type)
+        if batch_format is None:
+            return Response(
+                {'error': f"Content-Type must be one of {', '.join(INGEST_CONTENT_TYPES)}"},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+        
+        max_bytes = getattr(settings, 'INGEST_MAX_BYTES', 32 * 1024 * 1024)
+        # Read the raw stream: request.body is capped by DATA_UPLOAD_MAX_MEMORY_SIZE
+        body = request.stream.read(max_bytes + 1) if request.stream is not None else b''
+        if len(body) > max_bytes:
+            return Response(
+                {'error': f'Batch is larger than {max_bytes} bytes'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        
+        try:
+            with guarded_write():
+                stats = ingest_batch(body, batch_format)
+        except IngestError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(stats)
+    
     @extend_schema(
         summary="Export data",
-        description="Export filtered observations as CSV or JSON",
+        description="Stream all filtered observations as JSON, CSV, NDJSON, Parquet or an Arrow IPC stream",
         parameters=[
-            OpenApiParameter('format', OpenApiTypes.STR, description='Export format (csv or json)', default='json')
+            OpenApiParameter('format', OpenApiTypes.STR, description='Export format (json, csv, ndjson, parquet or arrow)', default='json')
         ]
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=[
+        FastJSONRenderer, CSVRenderer, NDJSONRenderer, ParquetRenderer, ArrowRenderer,
+    ])
     def export(self, request):
         """Export observations"""
-        from django.http import HttpResponse
-        import csv
-        import json
-        
-        export_format = request.query_params.get('format', 'json')
-        queryset = self.filter_queryset(self.get_queryset())[:1000]  # Limit exports
+        queryset = self.filter_queryset(self.get_queryset())
+        export_format = request.accepted_renderer.format
         
-        if export_format == 'csv':
-            response = HttpResponse(content_type='text/csv')
-            response['Content-Disposition'] = 'attachment; filename="climate_data.csv"'
-            
-            writer = csv.writer(response)
-            writer.writerow([
-                'Station ID', 'Station Name', 'Country', 'Region', 'Date',
-                'Temp Max', 'Temp Min', 'Temp Mean', 'Precipitation', 
-                'Humidity', 'SST', 'Salinity'
-            ])
-            
-            for obs in queryset:
-                writer.writerow([
-                    obs.station.station_id,
-                    obs.station.station_name,
-                    obs.station.country,
-                    obs.station.region.name,
-                    obs.observation_date,
-                    obs.temp_max,
-                    obs.temp_min,
-                    obs.temp_mean,
-                    obs.precipitation,
-                    obs.humidity,
-                    obs.sea_surface_temp,
-                    obs.ocean_salinity,
-                ])
-            return response
+        if export_format == 'json':
+            response = StreamingHttpResponse(self._stream_json(queryset), content_type='application/json')
         else:
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            if export_format in ARROW_FORMATS and not is_parquet_available():
+                return Response(
+                    {'error': f'{export_format} export requires pyarrow'},
+                    status=status.HTTP_501_NOT_IMPLEMENTED
+                )
+            response = StreamingHttpResponse(
+                stream_export(queryset, export_format), content_type=EXPORT_CONTENT_TYPES[export_format]
+            )
+            response['Content-Disposition'] = f'attachment; filename="climate_data.{export_format}"'
+        return response
+    
+    def _stream_json(self, queryset):
+        """JSON array of observations in the list schema, encoded chunk by chunk"""
+        yield b'['
+        separator = b''
+        for chunk in iter_objects(OBSERVATION_ROWS.values(queryset)):
+            yield separator + dumps(OBSERVATION_ROWS.to_representation(chunk))[1:-1]
+            separator = b','
+        yield b']'
 
 
 class AnalyticsViewSet(viewsets.ViewSet):
@@ -185,99 +509,348 @@ class AnalyticsViewSet(viewsets.ViewSet):
         parameters=[
             OpenApiParameter('start_year', OpenApiTypes.INT, description='Start year'),
             OpenApiParameter('end_year', OpenApiTypes.INT, description='End year'),
+            ENGINE_PARAMETER,
         ]
     )
     @action(detail=False, methods=['get'])
+    @conditional_on_data_version(vary_on=pushdown.engine_state)
+    @admission_controlled('analytics')
     def temperature_trends(self, request):
         """Get temperature trends"""
-        start_year = request.query_params.get('start_year', 2015)
-        end_year = request.query_params.get('end_year', 2024)
+        try:
+            start_year = int(request.query_params.get('start_year', 2015))
+            end_year = int(request.query_params.get('end_year', 2024))
+        except ValueError:
+            return Response({'error': 'start_year and end_year must be integers'}, status=status.HTTP_400_BAD_REQUEST)
         
-        trends = ClimateObservation.objects.filter(
+        trends = RegionMonthlyRollup.objects.filter(
             year__gte=start_year,
             year__lte=end_year
-        ).values('year', 'station__region__name').annotate(
-            avg_temp_max=Avg('temp_max'),
-            avg_temp_min=Avg('temp_min'),
-            avg_temp_mean=Avg('temp_mean')
-        ).order_by('year', 'station__region__name')
+        ).values('year', 'region__name').annotate(
+            **{
+                f'{measure}_{stat}': Sum(f'{measure}_{stat}')
+                for measure in ('temp_max', 'temp_min', 'temp_mean')
+                for stat in ('sum', 'count')
+            }
+        ).order_by('year', 'region__name')
+        trends, engine = self._aggregate(
+            request, start_year, end_year, trends,
+            lambda: pushdown.temperature_trends(start_year, end_year),
+        )
         
         data = []
         for item in trends:
-            data.append({
-                'year': item['year'],
-                'region': item['station__region__name'],
-                'avg_temp_max': round(item['avg_temp_max'], 2) if item['avg_temp_max'] else None,
-                'avg_temp_min': round(item['avg_temp_min'], 2) if item['avg_temp_min'] else None,
-                'avg_temp_mean': round(item['avg_temp_mean'], 2) if item['avg_temp_mean'] else None,
-            })
+            row = {'year': item['year'], 'region': item['region__name']}
+            for measure in ('temp_max', 'temp_min', 'temp_mean'):
+                avg = rollup_average(item[f'{measure}_sum'], item[f'{measure}_count'])
+                row[f'avg_{measure}'] = round(avg, 2) if avg else None
+            data.append(row)
         
         serializer = TemperatureTrendSerializer(data, many=True)
-        return Response(serializer.data)
+        return self._engine_response(serializer.data, engine)
     
     @extend_schema(
         summary="Precipitation data",
-        description="Get precipitation statistics by region"
+        description="Get precipitation statistics by region",
+        parameters=[
+            OpenApiParameter('year', OpenApiTypes.INT, description='Year (defaults to the current year)'),
+            ENGINE_PARAMETER,
+        ]
     )
     @action(detail=False, methods=['get'])
+    @conditional_on_data_version(vary_on=pushdown.engine_state)
+    @admission_controlled('analytics')
     def precipitation(self, request):
         """Get precipitation data"""
-        year = request.query_params.get('year', timezone.now().year)
+        try:
+            year = int(request.query_params.get('year', timezone.now().year))
+        except ValueError:
+            return Response({'error': 'year must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
         
-        data = ClimateObservation.objects.filter(
+        data = RegionMonthlyRollup.objects.filter(
             year=year,
-            precipitation__isnull=False
-        ).values('station__region__name').annotate(
-            total_precipitation=Sum('precipitation'),
-            avg_precipitation=Avg('precipitation'),
-            observation_count=Count('id')
+            precipitation_count__gt=0
+        ).values('region__name').annotate(
+            total_precipitation=Sum('precipitation_sum'),
+            observation_count=Sum('precipitation_count')
         )
+        data, engine = self._aggregate(request, year, year, data, lambda: pushdown.precipitation(year))
         
         results = []
         for item in data:
+            avg_precipitation = rollup_average(item['total_precipitation'], item['observation_count'])
             results.append({
-                'region': item['station__region__name'],
+                'region': item['region__name'],
                 'year': year,
                 'total_precipitation': round(item['total_precipitation'], 2),
-                'avg_precipitation': round(item['avg_precipitation'], 2),
+                'avg_precipitation': round(avg_precipitation, 2),
                 'observation_count': item['observation_count']
             })
         
         serializer = PrecipitationDataSerializer(results, many=True)
-        return Response(serializer.data)
+        return self._engine_response(serializer.data, engine)
     
     @extend_schema(
         summary="Ocean conditions",
-        description="Get ocean temperature and salinity data"
+        description="Get ocean temperature and salinity data",
+        parameters=[
+            OpenApiParameter('year', OpenApiTypes.INT, description='Year (defaults to the current year)'),
+            ENGINE_PARAMETER,
+        ]
     )
     @action(detail=False, methods=['get'])
+    @conditional_on_data_version(vary_on=pushdown.engine_state)
+    @admission_controlled('analytics')
     def ocean_conditions(self, request):
         """Get ocean conditions"""
-        year = request.query_params.get('year', timezone.now().year)
+        try:
+            year = int(request.query_params.get('year', timezone.now().year))
+        except ValueError:
+            return Response({'error': 'year must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
         
-        data = ClimateObservation.objects.filter(
+        data = StationMonthlyRollup.objects.filter(
             year=year,
-            sea_surface_temp__isnull=False
+            sea_surface_temp_count__gt=0
         ).values('month').annotate(
-            avg_sst=Avg('sea_surface_temp'),
-            avg_salinity=Avg('ocean_salinity'),
+            sst_sum=Sum('sea_surface_temp_sum'),
+            sst_count=Sum('sea_surface_temp_count'),
+            salinity_sum=Sum('sst_salinity_sum'),
+            salinity_count=Sum('sst_salinity_count'),
             station_count=Count('station', distinct=True)
         ).order_by('month')
+        data, engine = self._aggregate(request, year, year, data, lambda: pushdown.ocean_conditions(year))
         
         month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
                       'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
         
         results = []
         for item in data:
+            avg_salinity = rollup_average(item['salinity_sum'], item['salinity_count'])
             results.append({
                 'month': month_names[item['month'] - 1],
-                'avg_sst': round(item['avg_sst'], 2),
-                'avg_salinity': round(item['avg_salinity'], 2) if item['avg_salinity'] else None,
+                'avg_sst': round(rollup_average(item['sst_sum'], item['sst_count']), 2),
+                'avg_salinity': round(avg_salinity, 2) if avg_salinity else None,
                 'station_count': item['station_count']
             })
         
         serializer = OceanConditionsSerializer(results, many=True)
-        return Response(serializer.data)
+        return self._engine_response(serializer.data, engine)
+    
+    def _aggregate(self, request, first_year, last_year, local_rows, hive_rows):
+        """
+        Rows from the local queryset or, in pushdown mode, from Hive
+        
+        Returns:
+            (rows, engine name)
+        """
+        try:
+            return pushdown.aggregate(
+                request.query_params.get('engine', 'auto'), first_year, last_year,
+                lambda: local_rows, hive_rows,
+            )
+        except ValueError as e:
+            raise ValidationError({'engine': str(e)})
+        except pushdown.PushdownError as e:
+            raise HiveUnavailable(str(e))
+    
+    def _engine_response(self, data, engine):
+        response = Response(data)
+        response[ENGINE_HEADER] = engine
+        if engine == pushdown.HIVE_ENGINE:
+            # Hive-side changes don't bump the data version, so don't let
+            # clients revalidate this body against it
+            patch_cache_control(response, no_cache=True)
+        return response
+    
+    @extend_schema(
+        summary="Downsampled time series",
+        description="Get a station or region series reduced to a point budget for charting",
+        parameters=[
+            OpenApiParameter('station', OpenApiTypes.STR, description='Station ID'),
+            OpenApiParameter('region', OpenApiTypes.STR, description='Region code (used if no station is given)'),
+            OpenApiParameter('measure', OpenApiTypes.STR, description='Measure, e.g. temp_mean', default='temp_mean'),
+            OpenApiParameter('points', OpenApiTypes.INT, description='Maximum number of points', default=500),
+            OpenApiParameter('method', OpenApiTypes.STR, description='lttb or minmax', default='lttb'),
+            OpenApiParameter('resolution', OpenApiTypes.STR, description='daily or monthly (stations only)', default='daily'),
+        ]
+    )
+    @action(detail=False, methods=['get'])
+    @conditional_on_data_version
+    @admission_controlled('analytics')
+    def series(self, request):
+        """Get a downsampled time series"""
+        station = request.query_params.get('station')
+        region = request.query_params.get('region')
+        if not station and not region:
+            return Response({'error': 'Pass a station or region'}, status=status.HTTP_400_BAD_REQUEST)
+        scope, key = ('station', station) if station else ('region', region)
+        
+        max_points = getattr(settings, 'SERIES_MAX_POINTS', 5000)
+        try:
+            points = int(request.query_params.get('points', 500))
+        except ValueError:
+            return Response({'error': 'points must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 3 <= points <= max_points:
+            return Response({'error': f'points must be between 3 and {max_points}'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        resolution = request.query_params.get('resolution', 'daily')
+        if resolution not in RESOLUTIONS:
+            return Response({'error': f'resolution must be one of {", ".join(RESOLUTIONS)}'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            data = get_downsampled_series(
+                scope, key,
+                request.query_params.get('measure', 'temp_mean'),
+                points,
+                request.query_params.get('method', 'lttb'),
+                resolution,
+            )
+        except (WeatherStation.DoesNotExist, Region.DoesNotExist):
+            return Response({'error': f'Unknown {scope}: {key}'}, status=status.HTTP_404_NOT_FOUND)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(data)
+    
+    @extend_schema(
+        summary="Anomaly cube",
+        description="Get monthly anomalies per region against the climatology reference period",
+        parameters=[
+            OpenApiParameter('region', OpenApiTypes.STR, description='Region code'),
+            OpenApiParameter('measure', OpenApiTypes.STR, description='Measure, e.g. temp_mean', default='temp_mean'),
+            OpenApiParameter('start_year', OpenApiTypes.INT, description='Start year'),
+            OpenApiParameter('end_year', OpenApiTypes.INT, description='End year'),
+        ]
+    )
+    @action(detail=False, methods=['get'])
+    @conditional_on_data_version
+    @admission_controlled('analytics')
+    def anomalies(self, request):
+        """Get region x year x month anomaly cells"""
+        measure = request.query_params.get('measure', 'temp_mean')
+        if measure not in ROLLUP_MEASURES:
+            return Response({'error': f'Unknown measure: {measure}'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        params = request.query_params
+        try:
+            start_year = int(params['start_year']) if params.get('start_year') else None
+            end_year = int(params['end_year']) if params.get('end_year') else None
+        except ValueError:
+            return Response({'error': 'start_year and end_year must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        cells = RegionAnomaly.objects.filter(**{f'{measure}_mean__isnull': False})
+        region = params.get('region')
+        if region:
+            cells = cells.filter(region__code=region)
+        if start_year is not None:
+            cells = cells.filter(year__gte=start_year)
+        if end_year is not None:
+            cells = cells.filter(year__lte=end_year)
+        
+        start, end = reference_period()
+        data = [
+            {
+                'region': item['region__code'],
+                'year': item['year'],
+                'month': item['month'],
+                'mean': round(item['mean'], 2),
+                'anomaly': round(item['anomaly'], 2) if item['anomaly'] is not None else None,
+            }
+            for item in cells.order_by('region__code', 'year', 'month').values(
+                'region__code', 'year', 'month',
+                mean=F(f'{measure}_mean'), anomaly=F(f'{measure}_anomaly'),
+            )
+        ]
+        return Response({
+            'measure': measure,
+            'reference_period': [start, end],
+            'cells': data,
+        })
+    
+    @extend_schema(
+        summary="Climatology baselines",
+        description="Get the monthly climatology of a station or region over the reference period",
+        parameters=[
+            OpenApiParameter('station', OpenApiTypes.STR, description='Station ID'),
+            OpenApiParameter('region', OpenApiTypes.STR, description='Region code (used if no station is given)'),
+        ]
+    )
+    @action(detail=False, methods=['get'])
+    @conditional_on_data_version
+    @admission_controlled('analytics')
+    def baselines(self, request):
+        """Get monthly baselines for a station or region"""
+        station = request.query_params.get('station')
+        region = request.query_params.get('region')
+        if station:
+            baselines = StationBaseline.objects.filter(station__station_id=station)
+        elif region:
+            baselines = RegionBaseline.objects.filter(region__code=region)
+        else:
+            return Response({'error': 'Pass a station or region'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        start, end = reference_period()
+        data = []
+        for baseline in baselines.order_by('month'):
+            row = {'month': baseline.month}
+            for measure in ROLLUP_MEASURES:
+                mean = getattr(baseline, f'{measure}_mean')
+                row[measure] = round(mean, 2) if mean is not None else None
+                row[f'{measure}_count'] = getattr(baseline, f'{measure}_count')
+            data.append(row)
+        return Response({
+            'station' if station else 'region': station or region,
+            'reference_period': [start, end],
+            'months': data,
+        })
+    
+    @extend_schema(
+        summary="OLAP cube",
+        description=(
+            "Group observations by any dimensions and aggregate any measures. "
+            "Served from the smallest rollup that covers the dimensions and filters; "
+            "the response names the source used and the query latency."
+        ),
+        parameters=[
+            OpenApiParameter('dimensions', OpenApiTypes.STR,
+                             description=f'Comma-separated dimensions: {", ".join(cube.DIMENSIONS)}'),
+            OpenApiParameter('measures', OpenApiTypes.STR, default='count',
+                             description=f'Comma-separated measures: count or <aggregate>:<column>, '
+                                         f'aggregate one of {", ".join(cube.AGGREGATES)}'),
+            OpenApiParameter('start_year', OpenApiTypes.INT, description='Start year'),
+            OpenApiParameter('end_year', OpenApiTypes.INT, description='End year'),
+        ] + [
+            OpenApiParameter(attribute, OpenApiTypes.STR, description=f'Comma-separated {attribute} values to keep')
+            for attribute in cube.DIMENSIONS + cube.FILTER_ONLY
+        ]
+    )
+    @action(detail=False, methods=['get'])
+    @conditional_on_data_version
+    @admission_controlled('analytics')
+    def cube(self, request):
+        """Aggregate observations over the requested dimensions"""
+        params = request.query_params
+        
+        def split(value):
+            return [part.strip() for part in value.split(',') if part.strip()]
+        
+        try:
+            start_year = int(params['start_year']) if params.get('start_year') else None
+            end_year = int(params['end_year']) if params.get('end_year') else None
+        except ValueError:
+            return Response({'error': 'start_year and end_year must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            measures = cube.parse_measures(split(params.get('measures', 'count')))
+            filters = cube.parse_filters({
+                attribute: split(params[attribute])
+                for attribute in cube.DIMENSIONS + cube.FILTER_ONLY
+                if params.get(attribute)
+            })
+            data = cube.query_cube(split(params.get('dimensions', '')), measures, filters, start_year, end_year)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
 
 
 class HiveQueryViewSet(viewsets.ViewSet):
@@ -293,72 +866,141 @@ class HiveQueryViewSet(viewsets.ViewSet):
     )
     @action(detail=False, methods=['post'])
     def execute(self, request):
-        """Execute a Hive query"""
+        """
+        Execute a Hive query
+        
+        The query runs as a background job. If it finishes within
+        HIVE_QUERY_SYNC_WAIT seconds the first page of results is returned
+        as before; otherwise the response is 202 with the job to poll.
+        """
         serializer = HiveQueryExecuteSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        query = serializer.validated_data['query']
-        fetch_results = serializer.validated_data['fetch_results']
+        job = run_job(
+            serializer.validated_data['query'],
+            user=request.user,
+            fetch_results=serializer.validated_data['fetch_results'],
+        )
+        return job_response(request, job)
+
+
+def job_urls(request, job):
+    """Absolute status and results URLs of a query job"""
+    return {
+        'status_url': request.build_absolute_uri(reverse('api:hive-job-detail', args=[job.pk])),
+        'results_url': request.build_absolute_uri(reverse('api:hive-job-results', args=[job.pk])),
+    }
+
+
+def job_response(request, job, page_size=100):
+    """
+    Response for a submitted job in the shape of the old synchronous
+    execute endpoint, plus the job id and URLs
+    """
+    if job.status == 'failed':
+        return Response({
+            'success': False,
+            'job_id': str(job.pk),
+            'error': job.error_message,
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    data = {'success': True, 'job_id': str(job.pk), 'status': job.status, **job_urls(request, job)}
+    if job.status != 'succeeded':
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+    
+    data['execution_time'] = job.execution_time
+    if job.fetch_results:
+        data['rows_returned'] = job.row_count
+        data['columns'], data['results'] = read_page(job, 0, page_size)
+    else:
+        data['message'] = 'Query executed successfully'
+    return Response(data)
+
+
+class HiveQueryJobViewSet(viewsets.ViewSet):
+    """
+    Background Hive query jobs (Admin only)
+    
+    Submit a query, poll its status, page through the spooled results and
+    cancel it. Jobs expire after HIVE_QUERY_JOB_TTL seconds.
+    """
+    permission_classes = [IsAdminUser]
+    lookup_value_regex = '[0-9a-fA-F-]{36}'
+    
+    def _get_job(self, pk):
+        job = HiveQueryJob.objects.filter(pk=pk).first()
+        if job is None:
+            raise NotFound('Unknown job')
+        return job
+    
+    @extend_schema(
+        summary="Submit Hive query job",
+        description="Queue a Hive query; returns the job id to poll",
+        request=HiveQueryExecuteSerializer,
+    )
+    def create(self, request):
+        serializer = HiveQueryExecuteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
         
+        job = submit_job(
+            serializer.validated_data['query'],
+            user=request.user,
+            fetch_results=serializer.validated_data['fetch_results'],
+        )
+        return Response({**job_status(job), **job_urls(request, job)}, status=status.HTTP_202_ACCEPTED)
+    
+    @extend_schema(summary="Hive query job status")
+    def retrieve(self, request, pk=None):
+        job = self._get_job(pk)
+        return Response({**job_status(job), **job_urls(request, job)})
+    
+    @extend_schema(
+        summary="Hive query job results",
+        description="Page through the spooled results of a finished job",
+        parameters=[
+            OpenApiParameter('offset', OpenApiTypes.INT, description='First row', default=0),
+            OpenApiParameter('limit', OpenApiTypes.INT, description='Rows per page', default=100),
+        ]
+    )
+    @action(detail=True, methods=['get'])
+    def results(self, request, pk=None):
+        job = self._get_job(pk)
+        max_limit = getattr(settings, 'HIVE_QUERY_PAGE_MAX', 10000)
         try:
-            hive = get_hive_manager()
-            start_time = timezone.now()
-            
-            if fetch_results:
-                results = hive.execute_query(query)
-                execution_time = (timezone.now() - start_time).total_seconds()
-                
-                # Log query
-                HiveQueryLog.objects.create(
-                    query=query,
-                    query_type='select',
-                    execution_time=execution_time,
-                    rows_returned=len(results) if results else 0,
-                    status='success',
-                    executed_by=request.user
-                )
-                
-                return Response({
-                    'success': True,
-                    'rows_returned': len(results) if results else 0,
-                    'execution_time': execution_time,
-                    'results': results[:100]  # Limit results
-                })
-            else:
-                hive.execute_query(query, fetch_all=False)
-                execution_time = (timezone.now() - start_time).total_seconds()
-                
-                HiveQueryLog.objects.create(
-                    query=query,
-                    query_type='other',
-                    execution_time=execution_time,
-                    status='success',
-                    executed_by=request.user
-                )
-                
-                return Response({
-                    'success': True,
-                    'message': 'Query executed successfully',
-                    'execution_time': execution_time
-                })
-                
-        except Exception as e:
-            logger.error(f"Hive query failed: {str(e)}")
-            
-            # Log failed query
-            HiveQueryLog.objects.create(
-                query=query,
-                query_type='other',
-                execution_time=0,
-                status='error',
-                error_message=str(e),
-                executed_by=request.user
-            )
-            
-            return Response({
-                'success': False,
-                'error': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            offset = max(0, int(request.query_params.get('offset', 0)))
+            limit = max(1, min(int(request.query_params.get('limit', 100)), max_limit))
+        except ValueError:
+            return Response({'error': 'offset and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            columns, rows = read_page(job, offset, limit)
+        except JobExpired as e:
+            return Response({'error': str(e)}, status=status.HTTP_410_GONE)
+        except JobNotReady as e:
+            return Response({'error': str(e), 'status': job.status}, status=status.HTTP_409_CONFLICT)
+        
+        url = request.build_absolute_uri()
+        next_url = None
+        if offset + len(rows) < job.row_count:
+            next_url = replace_query_param(replace_query_param(url, 'offset', offset + limit), 'limit', limit)
+        previous_url = None
+        if offset > 0:
+            previous_url = replace_query_param(replace_query_param(url, 'offset', max(0, offset - limit)), 'limit', limit)
+        return Response({
+            'job_id': str(job.pk),
+            'count': job.row_count,
+            'offset': offset,
+            'next': next_url,
+            'previous': previous_url,
+            'columns': columns,
+            'results': rows,
+        })
+    
+    @extend_schema(summary="Cancel Hive query job")
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        job = cancel_job(self._get_job(pk))
+        return Response(job_status(job))
 
 
 class DataImportLogViewSet(viewsets.ReadOnlyModelViewSet):
@@ -403,7 +1045,8 @@ class HealthViewSet(viewsets.ViewSet):
                 'regions': status_info['regions_count'],
                 'stations': status_info['stations_count'],
                 'observations': status_info['observations_count'],
-            }
+            },
+            'admission': admission_stats(),
         })
     
     @extend_schema(
@@ -5,3 +5,14 @@ class HiveClimateConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hive_climate'
     verbose_name = 'Hive Climate Data Dashboard'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        connection_created.connect(enable_sqlite_wal, dispatch_uid='hive_climate_sqlite_wal')
+
+
+def enable_sqlite_wal(sender, connection, **kwargs):
+    """Let dashboard readers keep reading while a load or table swap is writing"""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=WAL')
@@ -0,0 +1,88 @@
+"""
+Conditional GET for Climate Data API
+
+Responses that only change when climate data changes carry a strong ETag
+derived from the data version and the request, a Last-Modified from the
+time of the last bump and a shared Cache-Control policy. Requests with a
+matching If-None-Match or If-Modified-Since get a 304 before the view
+runs, so no aggregation query is made. A view that sends its own
+Cache-Control: no-cache opts that response out.
+"""
+import functools
+import hashlib
+from calendar import timegm
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from hive_climate.services.data_version import get_data_state
+
+
+def data_etag(request, version: str, extra=None) -> str:
+    """
+    Strong ETag for a request under a data version token
+
+    The path, query parameters and Accept header are part of the tag, so
+    each representation of each resource gets its own. extra adds any
+    other state the response depends on.
+    """
+    parts = (
+        version,
+        request.path,
+        sorted(request.GET.lists()),
+        request.META.get('HTTP_ACCEPT', ''),
+        extra,
+    )
+    digest = hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:20]
+    return quote_etag(f'v{version}-{digest}')
+
+
+def _is_browsable(request) -> bool:
+    """Browsable API pages include per-user content and are never shared"""
+    format_param = request.GET.get('format')
+    if format_param:
+        return format_param == 'api'
+    return 'text/html' in request.META.get('HTTP_ACCEPT', '')
+
+
+def conditional_on_data_version(view_method=None, vary_on=None):
+    """
+    Conditional GET for a viewset method whose output depends only on the
+    request and the climate data
+
+    Runs after authentication and throttling. Successful and 304 responses
+    get ETag, Last-Modified and Cache-Control (public, max-age of
+    settings.API_CACHE_MAX_AGE) headers and vary on Accept.
+
+    Args:
+        vary_on: Optional callable returning other state the output
+            depends on; it becomes part of the ETag. Such views are not
+            validated by Last-Modified, since that state can change
+            without a data version bump
+    """
+    if view_method is None:
+        return functools.partial(conditional_on_data_version, vary_on=vary_on)
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or _is_browsable(request):
+            return view_method(self, request, *args, **kwargs)
+
+        version, changed_at = get_data_state()
+        etag = data_etag(request, version, vary_on() if vary_on else None)
+        last_modified = timegm(changed_at.utctimetuple()) if changed_at and not vary_on else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code != 200 or 'no-cache' in response.get('Cache-Control', ''):
+                return response
+
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=getattr(settings, 'API_CACHE_MAX_AGE', 60))
+        patch_vary_headers(response, ['Accept'])
+        return response
+    return wrapper
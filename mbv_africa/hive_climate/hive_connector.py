@@ -11,6 +11,8 @@ import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+AVAILABILITY_CACHE_KEY = 'hive_climate:hive_available'
+
 # Lazy imports to handle missing dependencies gracefully
 _pyhive_available = False
 try:
@@ -61,19 +63,22 @@ class HiveConnectionManager:
         
         try:
             logger.info(f"Connecting to Hive at {self.host}:{self.port}/{self.database}")
-            connection = hive.Connection(
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                username=self.username,
-                auth=self.auth
-            )
+            connection = self._connect()
             logger.info("Hive connection established successfully")
             return connection
         except Exception as e:
             logger.error(f"Failed to connect to Hive: {str(e)}")
             raise
     
+    def _connect(self):
+        return hive.Connection(
+            host=self.host,
+            port=self.port,
+            database=self.database,
+            username=self.username,
+            auth=self.auth
+        )
+    
     @contextmanager
     def get_cursor(self):
         """
@@ -223,11 +228,22 @@ class HiveConnectionManager:
             logger.debug("PyHive library not available")
             return False
         
+        # Probes run often, so a down server is logged at debug level only
+        connection = None
         try:
-            return self.test_connection()
+            connection = self._connect()
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                return cursor.fetchone()[0] == 1
+            finally:
+                cursor.close()
         except Exception as e:
             logger.debug(f"Hive not available: {str(e)}")
             return False
+        finally:
+            if connection:
+                connection.close()
     
     def get_databases(self) -> List[str]:
         """
@@ -348,3 +364,24 @@ def is_hive_available() -> bool:
         return manager.is_available()
     except Exception:
         return False
+
+
+def is_hive_available_cached() -> bool:
+    """
+    is_hive_available(), reusing the last probe result for
+    settings.HIVE_AVAILABILITY_TTL seconds
+    
+    For per-request decisions, where a live probe on every request would
+    add a connection (or a connect timeout) to each one.
+    """
+    if not is_hive_enabled() or not _pyhive_available:
+        return False
+    
+    from django.conf import settings
+    from django.core.cache import cache
+    
+    available = cache.get(AVAILABILITY_CACHE_KEY)
+    if available is None:
+        available = is_hive_available()
+        cache.set(AVAILABILITY_CACHE_KEY, available, getattr(settings, 'HIVE_AVAILABILITY_TTL', 30))
+    return available
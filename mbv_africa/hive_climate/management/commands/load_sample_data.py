@@ -34,10 +34,33 @@ class Command(BaseCommand):
             action='store_true',
             help='Only load observation data (assumes stations exist)',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Number of CSV parser processes (defaults to settings.CSV_LOAD_WORKERS)',
+        )
+        parser.add_argument(
+            '--shard-size',
+            type=int,
+            help='Approximate shard size in MB for parallel parsing (defaults to settings.CSV_LOAD_SHARD_SIZE)',
+        )
         parser.add_argument(
             '--clear',
             action='store_true',
-            help='Clear existing data before loading',
+            help=(
+                'Clear existing data before loading. Staged loads only replace observations; '
+                'stations and regions are upserted, not cleared (use --direct to clear everything)'
+            ),
+        )
+        parser.add_argument(
+            '--no-vacuum',
+            action='store_true',
+            help='Skip reclaiming disk space after --clear',
+        )
+        parser.add_argument(
+            '--direct',
+            action='store_true',
+            help='Write observations straight into the live table instead of a staging table',
         )
 
     def handle(self, *args, **options):
@@ -58,16 +81,50 @@ class Command(BaseCommand):
         
         self.stdout.write(f'Loading sample data from: {data_dir}')
         
-        # Clear data if requested
-        if options['clear']:
-            self.stdout.write('Clearing existing data...')
-            from hive_climate.models import ClimateObservation, WeatherStation, Region
-            ClimateObservation.objects.all().delete()
-            WeatherStation.objects.all().delete()
-            Region.objects.all().delete()
-            self.stdout.write(self.style.SUCCESS('Data cleared'))
-        
         sync_service = DataSyncService()
+        staged = getattr(settings, 'STAGED_LOADS', True) and not options['direct']
+        staged = staged and not options['stations_only']
+        
+        # The import log's completion bumps the data version and warms the dashboard cache
+        sync_service.start_import_log(
+            import_type='full' if options['clear'] else 'manual', source='csv'
+        )
+        try:
+            self.load(sync_service, data_dir, staged, options)
+        except Exception as e:
+            sync_service.finish_import_log(status='failed', error_message=str(e))
+            raise
+        sync_service.finish_import_log(status='completed')
+        
+        # Show summary
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS('Sample data loading complete!'))
+        
+        status = sync_service.get_status()
+        self.stdout.write(f"Database now contains:")
+        self.stdout.write(f"  - {status['regions_count']} regions")
+        self.stdout.write(f"  - {status['stations_count']} weather stations")
+        self.stdout.write(f"  - {status['observations_count']} climate observations")
+    
+    def load(self, sync_service, data_dir, staged, options):
+        """Clear (if requested) and load stations and observations"""
+        import_log = sync_service.import_log
+        
+        # Clear data if requested. Staged loads keep serving the current
+        # observations and replace them in one swap at the end instead.
+        # Stations and regions can't be cleared up front without deleting
+        # the live observations, so a staged load keeps them
+        if options['clear'] and not staged:
+            self.stdout.write('Clearing existing data...')
+            cleared = sync_service.clear_data(vacuum=not options['no_vacuum'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Data cleared ({cleared['mode']}, {cleared['seconds']}s)"
+            ))
+        elif options['clear']:
+            self.stdout.write(self.style.WARNING(
+                'Staged load: observations will be replaced; existing stations and regions '
+                'are kept and updated (use --direct to clear them too)'
+            ))
         
         # Ensure regions exist
         self.stdout.write('Creating regions...')
@@ -82,6 +139,7 @@ class Command(BaseCommand):
             if stations_file.exists():
                 self.stdout.write(f'Loading stations from {stations_file}...')
                 stats = sync_service._load_stations_from_csv(stations_file)
+                self.record(import_log, stats)
                 self.stdout.write(
                     self.style.SUCCESS(
                         f"Stations: {stats['created']} created, "
@@ -98,11 +156,23 @@ class Command(BaseCommand):
             observations_file = data_dir / 'portfolio_observations.csv'
             if observations_file.exists():
                 limit = options.get('limit')
+                workers = options.get('workers') or getattr(settings, 'CSV_LOAD_WORKERS', 1)
+                shard_size = options.get('shard_size')
+                shard_size = shard_size * 1024 * 1024 if shard_size else None
                 self.stdout.write(
-                    f'Loading observations from {observations_file}...'
+                    f'Loading observations from {observations_file} with {workers} worker(s)...'
                     + (f' (limit: {limit})' if limit else '')
                 )
-                stats = sync_service._load_observations_from_csv(observations_file, limit=limit)
+                if staged:
+                    stats = sync_service.load_observations_staged(
+                        observations_file, replace=options['clear'],
+                        limit=limit, workers=workers, shard_size=shard_size
+                    )
+                else:
+                    stats = sync_service._load_observations_from_csv(
+                        observations_file, limit=limit, workers=workers, shard_size=shard_size
+                    )
+                self.record(import_log, stats)
                 self.stdout.write(
                     self.style.SUCCESS(
                         f"Observations: {stats['created']} created, "
@@ -113,13 +183,10 @@ class Command(BaseCommand):
                 self.stderr.write(
                     self.style.WARNING(f'Observations file not found: {observations_file}')
                 )
-        
-        # Show summary
-        self.stdout.write('')
-        self.stdout.write(self.style.SUCCESS('Sample data loading complete!'))
-        
-        status = sync_service.get_status()
-        self.stdout.write(f"Database now contains:")
-        self.stdout.write(f"  - {status['regions_count']} regions")
-        self.stdout.write(f"  - {status['stations_count']} weather stations")
-        self.stdout.write(f"  - {status['observations_count']} climate observations")
+    
+    def record(self, import_log, stats):
+        """Add load statistics to the import log"""
+        import_log.records_imported += stats.get('created', 0)
+        import_log.records_updated += stats.get('updated', 0)
+        import_log.records_failed += stats.get('errors', 0)
+        import_log.records_processed += sum(stats.get(key, 0) for key in ('created', 'updated', 'errors', 'skipped'))
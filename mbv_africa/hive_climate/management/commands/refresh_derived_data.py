@@ -0,0 +1,22 @@
+"""
+Django management command to rebuild rollups and other derived tables
+Run once after upgrading an existing database, or after editing
+observations outside the app
+python manage.py refresh_derived_data
+"""
+from django.core.management.base import BaseCommand
+
+from hive_climate.services.data_version import bump_data_version
+from hive_climate.services.derived import refresh_derived_data
+
+
+class Command(BaseCommand):
+    help = 'Rebuild rollup tables and other data derived from climate observations'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding derived data...')
+        stats = refresh_derived_data()
+        for name, table_stats in stats.items():
+            self.stdout.write(self.style.SUCCESS(f"{name}: {table_stats}"))
+        version = bump_data_version('refresh_derived_data')
+        self.stdout.write(f"Data version: {version}")
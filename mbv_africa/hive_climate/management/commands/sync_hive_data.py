@@ -50,6 +50,14 @@ class Command(BaseCommand):
             default=None,
             help='End date for observations (YYYY-MM-DD)'
         )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help=(
+                'Clear existing climate data before a --full sync. With STAGED_LOADS '
+                'only observations are replaced; stations and regions are upserted, not cleared'
+            )
+        )
         parser.add_argument(
             '--test-connection',
             action='store_true',
@@ -80,7 +88,7 @@ class Command(BaseCommand):
             # Determine what to sync
             if options['full']:
                 self.stdout.write(self.style.WARNING('Performing FULL synchronization...'))
-                stats = sync_service.full_sync(limit=options['limit'])
+                stats = sync_service.full_sync(limit=options['limit'], clear=options['clear'])
                 self.print_full_stats(stats)
                 
             elif options['regions']:
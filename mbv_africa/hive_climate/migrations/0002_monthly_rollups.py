@@ -0,0 +1,114 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hive_climate', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegionMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('observation_count', models.IntegerField(default=0)),
+                ('temp_max_count', models.IntegerField(default=0)),
+                ('temp_max_sum', models.FloatField(blank=True, null=True)),
+                ('temp_max_min', models.FloatField(blank=True, null=True)),
+                ('temp_max_max', models.FloatField(blank=True, null=True)),
+                ('temp_max_sumsq', models.FloatField(blank=True, null=True)),
+                ('temp_min_count', models.IntegerField(default=0)),
+                ('temp_min_sum', models.FloatField(blank=True, null=True)),
+                ('temp_min_min', models.FloatField(blank=True, null=True)),
+                ('temp_min_max', models.FloatField(blank=True, null=True)),
+                ('temp_min_sumsq', models.FloatField(blank=True, null=True)),
+                ('temp_mean_count', models.IntegerField(default=0)),
+                ('temp_mean_sum', models.FloatField(blank=True, null=True)),
+                ('temp_mean_min', models.FloatField(blank=True, null=True)),
+                ('temp_mean_max', models.FloatField(blank=True, null=True)),
+                ('temp_mean_sumsq', models.FloatField(blank=True, null=True)),
+                ('precipitation_count', models.IntegerField(default=0)),
+                ('precipitation_sum', models.FloatField(blank=True, null=True)),
+                ('precipitation_min', models.FloatField(blank=True, null=True)),
+                ('precipitation_max', models.FloatField(blank=True, null=True)),
+                ('precipitation_sumsq', models.FloatField(blank=True, null=True)),
+                ('humidity_count', models.IntegerField(default=0)),
+                ('humidity_sum', models.FloatField(blank=True, null=True)),
+                ('humidity_min', models.FloatField(blank=True, null=True)),
+                ('humidity_max', models.FloatField(blank=True, null=True)),
+                ('humidity_sumsq', models.FloatField(blank=True, null=True)),
+                ('sea_surface_temp_count', models.IntegerField(default=0)),
+                ('sea_surface_temp_sum', models.FloatField(blank=True, null=True)),
+                ('sea_surface_temp_min', models.FloatField(blank=True, null=True)),
+                ('sea_surface_temp_max', models.FloatField(blank=True, null=True)),
+                ('sea_surface_temp_sumsq', models.FloatField(blank=True, null=True)),
+                ('ocean_salinity_count', models.IntegerField(default=0)),
+                ('ocean_salinity_sum', models.FloatField(blank=True, null=True)),
+                ('ocean_salinity_min', models.FloatField(blank=True, null=True)),
+                ('ocean_salinity_max', models.FloatField(blank=True, null=True)),
+                ('ocean_salinity_sumsq', models.FloatField(blank=True, null=True)),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to='hive_climate.region')),
+            ],
+            options={
+                'ordering': ['year', 'month'],
+                'indexes': [models.Index(fields=['year', 'month'], name='hive_climat_year_55ddd3_idx')],
+                'unique_together': {('region', 'year', 'month')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StationMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('observation_count', models.IntegerField(default=0)),
+                ('temp_max_count', models.IntegerField(default=0)),
+                ('temp_max_sum', models.FloatField(blank=True, null=True)),
+                ('temp_max_min', models.FloatField(blank=True, null=True)),
+                ('temp_max_max', models.FloatField(blank=True, null=True)),
+                ('temp_max_sumsq', models.FloatField(blank=True, null=True)),
+                ('temp_min_count', models.IntegerField(default=0)),
+                ('temp_min_sum', models.FloatField(blank=True, null=True)),
+                ('temp_min_min', models.FloatField(blank=True, null=True)),
+                ('temp_min_max', models.FloatField(blank=True, null=True)),
+                ('temp_min_sumsq', models.FloatField(blank=True, null=True)),
+                ('temp_mean_count', models.IntegerField(default=0)),
+                ('temp_mean_sum', models.FloatField(blank=True, null=True)),
+                ('temp_mean_min', models.FloatField(blank=True, null=True)),
+                ('temp_mean_max', models.FloatField(blank=True, null=True)),
+                ('temp_mean_sumsq', models.FloatField(blank=True, null=True)),
+                ('precipitation_count', models.IntegerField(default=0)),
+                ('precipitation_sum', models.FloatField(blank=True, null=True)),
+                ('precipitation_min', models.FloatField(blank=True, null=True)),
+                ('precipitation_max', models.FloatField(blank=True, null=True)),
+                ('precipitation_sumsq', models.FloatField(blank=True, null=True)),
+                ('humidity_count', models.IntegerField(default=0)),
+                ('humidity_sum', models.FloatField(blank=True, null=True)),
+                ('humidity_min', models.FloatField(blank=True, null=True)),
+                ('humidity_max', models.FloatField(blank=True, null=True)),
+                ('humidity_sumsq', models.FloatField(blank=True, null=True)),
+                ('sea_surface_temp_count', models.IntegerField(default=0)),
+                ('sea_surface_temp_sum', models.FloatField(blank=True, null=True)),
+                ('sea_surface_temp_min', models.FloatField(blank=True, null=True)),
+                ('sea_surface_temp_max', models.FloatField(blank=True, null=True)),
+                ('sea_surface_temp_sumsq', models.FloatField(blank=True, null=True)),
+                ('ocean_salinity_count', models.IntegerField(default=0)),
+                ('ocean_salinity_sum', models.FloatField(blank=True, null=True)),
+                ('ocean_salinity_min', models.FloatField(blank=True, null=True)),
+                ('ocean_salinity_max', models.FloatField(blank=True, null=True)),
+                ('ocean_salinity_sumsq', models.FloatField(blank=True, null=True)),
+                ('station', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to='hive_climate.weatherstation')),
+            ],
+            options={
+                'ordering': ['year', 'month'],
+                'indexes': [models.Index(fields=['year', 'month'], name='hive_climat_year_890660_idx')],
+                'unique_together': {('station', 'year', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hive_climate', '0002_monthly_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('reason', models.CharField(blank=True, max_length=100)),
+                ('changed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
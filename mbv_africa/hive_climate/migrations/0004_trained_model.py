@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hive_climate', '0003_data_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainedModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('feature_set', models.CharField(help_text='Comma-separated feature names', max_length=200)),
+                ('data_version', models.PositiveBigIntegerField()),
+                ('status', models.CharField(choices=[('training', 'Training'), ('ready', 'Ready'), ('failed', 'Failed')], default='training', max_length=20)),
+                ('intercept', models.FloatField(blank=True, null=True)),
+                ('coefficients', models.JSONField(blank=True, default=list)),
+                ('metrics', models.JSONField(blank=True, default=dict)),
+                ('artifact', models.JSONField(blank=True, default=dict, help_text='Dashboard result and monthly predictions')),
+                ('error_message', models.TextField(blank=True)),
+                ('training_time', models.FloatField(blank=True, help_text='Training time in seconds', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('trained_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-data_version'],
+                'unique_together': {('name', 'feature_set', 'data_version')},
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hive_climate', '0004_trained_model'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('observation_count', models.PositiveBigIntegerField(default=0)),
+                ('station_count', models.IntegerField(default=0)),
+                ('active_station_count', models.IntegerField(default=0)),
+                ('coastal_station_count', models.IntegerField(default=0)),
+                ('region_count', models.IntegerField(default=0)),
+                ('country_count', models.IntegerField(default=0)),
+                ('coastal_observation_count', models.PositiveBigIntegerField(default=0, help_text='Observations with sea surface temperature')),
+                ('first_observation_date', models.DateField(blank=True, null=True)),
+                ('last_observation_date', models.DateField(blank=True, null=True)),
+                ('observation_bytes', models.PositiveBigIntegerField(blank=True, help_text='On-disk size of the observation table', null=True)),
+                ('database_bytes', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'data statistics',
+            },
+        ),
+    ]
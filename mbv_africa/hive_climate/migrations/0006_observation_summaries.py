@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hive_climate', '0005_data_statistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegionSummary',
+            fields=[
+                ('observation_count', models.PositiveBigIntegerField(default=0)),
+                ('coastal_observation_count', models.PositiveBigIntegerField(default=0, help_text='Observations with sea surface temperature')),
+                ('first_observation_date', models.DateField(blank=True, null=True)),
+                ('last_observation_date', models.DateField(blank=True, null=True)),
+                ('region', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='hive_climate.region')),
+                ('station_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='StationSummary',
+            fields=[
+                ('observation_count', models.PositiveBigIntegerField(default=0)),
+                ('coastal_observation_count', models.PositiveBigIntegerField(default=0, help_text='Observations with sea surface temperature')),
+                ('first_observation_date', models.DateField(blank=True, null=True)),
+                ('last_observation_date', models.DateField(blank=True, null=True)),
+                ('station', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='hive_climate.weatherstation')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
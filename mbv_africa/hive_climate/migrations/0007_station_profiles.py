@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:26
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hive_climate', '0006_observation_summaries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StationProfile',
+            fields=[
+                ('station', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile', serialize=False, to='hive_climate.weatherstation')),
+                ('statistics', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('climatology', models.JSONField(blank=True, default=list, help_text='Monthly averages, one entry per calendar month')),
+                ('recent_observations', models.JSONField(blank=True, default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
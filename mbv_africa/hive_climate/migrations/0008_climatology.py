@@ -0,0 +1,98 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hive_climate', '0007_station_profiles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegionAnomaly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('temp_max_mean', models.FloatField(blank=True, null=True)),
+                ('temp_max_anomaly', models.FloatField(blank=True, null=True)),
+                ('temp_min_mean', models.FloatField(blank=True, null=True)),
+                ('temp_min_anomaly', models.FloatField(blank=True, null=True)),
+                ('temp_mean_mean', models.FloatField(blank=True, null=True)),
+                ('temp_mean_anomaly', models.FloatField(blank=True, null=True)),
+                ('precipitation_mean', models.FloatField(blank=True, null=True)),
+                ('precipitation_anomaly', models.FloatField(blank=True, null=True)),
+                ('humidity_mean', models.FloatField(blank=True, null=True)),
+                ('humidity_anomaly', models.FloatField(blank=True, null=True)),
+                ('sea_surface_temp_mean', models.FloatField(blank=True, null=True)),
+                ('sea_surface_temp_anomaly', models.FloatField(blank=True, null=True)),
+                ('ocean_salinity_mean', models.FloatField(blank=True, null=True)),
+                ('ocean_salinity_anomaly', models.FloatField(blank=True, null=True)),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='anomalies', to='hive_climate.region')),
+            ],
+            options={
+                'ordering': ['year', 'month'],
+                'indexes': [models.Index(fields=['year', 'month'], name='hive_climat_year_6ef613_idx')],
+                'unique_together': {('region', 'year', 'month')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RegionBaseline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.IntegerField()),
+                ('reference_start', models.IntegerField(help_text='First year of the reference period')),
+                ('reference_end', models.IntegerField(help_text='Last year of the reference period')),
+                ('temp_max_mean', models.FloatField(blank=True, null=True)),
+                ('temp_max_count', models.IntegerField(default=0)),
+                ('temp_min_mean', models.FloatField(blank=True, null=True)),
+                ('temp_min_count', models.IntegerField(default=0)),
+                ('temp_mean_mean', models.FloatField(blank=True, null=True)),
+                ('temp_mean_count', models.IntegerField(default=0)),
+                ('precipitation_mean', models.FloatField(blank=True, null=True)),
+                ('precipitation_count', models.IntegerField(default=0)),
+                ('humidity_mean', models.FloatField(blank=True, null=True)),
+                ('humidity_count', models.IntegerField(default=0)),
+                ('sea_surface_temp_mean', models.FloatField(blank=True, null=True)),
+                ('sea_surface_temp_count', models.IntegerField(default=0)),
+                ('ocean_salinity_mean', models.FloatField(blank=True, null=True)),
+                ('ocean_salinity_count', models.IntegerField(default=0)),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='baselines', to='hive_climate.region')),
+            ],
+            options={
+                'ordering': ['month'],
+                'unique_together': {('region', 'month')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StationBaseline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.IntegerField()),
+                ('reference_start', models.IntegerField(help_text='First year of the reference period')),
+                ('reference_end', models.IntegerField(help_text='Last year of the reference period')),
+                ('temp_max_mean', models.FloatField(blank=True, null=True)),
+                ('temp_max_count', models.IntegerField(default=0)),
+                ('temp_min_mean', models.FloatField(blank=True, null=True)),
+                ('temp_min_count', models.IntegerField(default=0)),
+                ('temp_mean_mean', models.FloatField(blank=True, null=True)),
+                ('temp_mean_count', models.IntegerField(default=0)),
+                ('precipitation_mean', models.FloatField(blank=True, null=True)),
+                ('precipitation_count', models.IntegerField(default=0)),
+                ('humidity_mean', models.FloatField(blank=True, null=True)),
+                ('humidity_count', models.IntegerField(default=0)),
+                ('sea_surface_temp_mean', models.FloatField(blank=True, null=True)),
+                ('sea_surface_temp_count', models.IntegerField(default=0)),
+                ('ocean_salinity_mean', models.FloatField(blank=True, null=True)),
+                ('ocean_salinity_count', models.IntegerField(default=0)),
+                ('station', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='baselines', to='hive_climate.weatherstation')),
+            ],
+            options={
+                'ordering': ['month'],
+                'unique_together': {('station', 'month')},
+            },
+        ),
+    ]
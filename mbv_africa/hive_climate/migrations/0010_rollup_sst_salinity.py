@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:59
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_sst_salinity(apps, schema_editor):
+    """Fill the new columns of existing rollup rows"""
+    ClimateObservation = apps.get_model('hive_climate', 'ClimateObservation')
+    StationMonthlyRollup = apps.get_model('hive_climate', 'StationMonthlyRollup')
+    RegionMonthlyRollup = apps.get_model('hive_climate', 'RegionMonthlyRollup')
+
+    observations = ClimateObservation.objects.filter(
+        station=OuterRef('station'), year=OuterRef('year'), month=OuterRef('month'),
+        sea_surface_temp__isnull=False, ocean_salinity__isnull=False,
+    ).order_by().values('station')
+    StationMonthlyRollup.objects.update(
+        sst_salinity_count=Coalesce(Subquery(observations.annotate(n=Count('id')).values('n')[:1]), 0),
+        sst_salinity_sum=Subquery(observations.annotate(total=Sum('ocean_salinity')).values('total')[:1]),
+    )
+
+    stations = StationMonthlyRollup.objects.filter(
+        station__region=OuterRef('region'), year=OuterRef('year'), month=OuterRef('month'),
+    ).order_by().values('station__region')
+    RegionMonthlyRollup.objects.update(
+        sst_salinity_count=Coalesce(Subquery(stations.annotate(n=Sum('sst_salinity_count')).values('n')[:1]), 0),
+        sst_salinity_sum=Subquery(stations.annotate(total=Sum('sst_salinity_sum')).values('total')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hive_climate', '0009_hive_query_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='regionmonthlyrollup',
+            name='sst_salinity_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='regionmonthlyrollup',
+            name='sst_salinity_sum',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='stationmonthlyrollup',
+            name='sst_salinity_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='stationmonthlyrollup',
+            name='sst_salinity_sum',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_sst_salinity, migrations.RunPython.noop),
+    ]
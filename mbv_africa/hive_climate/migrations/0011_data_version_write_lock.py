@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hive_climate', '0010_rollup_sst_salinity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataversion',
+            name='writes_blocked_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
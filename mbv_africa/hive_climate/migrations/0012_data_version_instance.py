@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:16
+
+import uuid
+from django.db import migrations, models
+
+
+def create_data_version(apps, schema_editor):
+    """Create the version row up front so every database has its own instance"""
+    DataVersion = apps.get_model('hive_climate', 'DataVersion')
+    DataVersion.objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hive_climate', '0011_data_version_write_lock'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataversion',
+            name='instance',
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+        migrations.RunPython(create_data_version, migrations.RunPython.noop),
+    ]
@@ -4,8 +4,22 @@ Uses Linear Regression for temperature prediction and visualization
 """
 import numpy as np
 from typing import Dict, List, Tuple, Any
-from django.db.models import Avg, Count
-from hive_climate.models import ClimateObservation, WeatherStation
+from django.db.models import Sum
+from hive_climate.models import ClimateObservation, RegionMonthlyRollup
+from hive_climate.services.model_registry import load_artifact, train_model
+from hive_climate.services.rollups import rollup_average
+
+TEMPERATURE_MODEL_NAME = 'temperature_regression'
+FEATURE_NAMES = ['month_sin', 'month_cos', 'humidity', 'precipitation']
+
+NO_DATA_RESULT = {
+    'status': 'no_data',
+    'message': 'Not enough data to train model. Run: python manage.py load_sample_data',
+    'metrics': {'rmse': 0, 'mae': 0, 'r2': 0},
+    'feature_importance': [],
+    'predictions': [],
+    'actuals': [],
+}
 
 
 def prepare_regression_data() -> Tuple[np.ndarray, np.ndarray, List[str]]:
@@ -13,26 +27,21 @@ def prepare_regression_data() -> Tuple[np.ndarray, np.ndarray, List[str]]:
     Prepare data for linear regression: predict temp_mean from month and other features
     Returns X (features), y (target), feature_names
     """
-    observations = ClimateObservation.objects.filter(
+    rows = np.array(list(ClimateObservation.objects.filter(
         temp_mean__isnull=False,
         humidity__isnull=False,
         precipitation__isnull=False
-    ).values('month', 'humidity', 'precipitation', 'temp_mean', 'year')[:5000]
+    ).values_list('month', 'humidity', 'precipitation', 'temp_mean')[:5000]), dtype=float)
     
-    if len(observations) < 10:
+    if len(rows) < 10:
         return np.array([]), np.array([]), []
     
-    # Convert to numpy arrays
-    X = []
-    y = []
-    for obs in observations:
-        # Features: month (cyclical), humidity, precipitation
-        month_sin = np.sin(2 * np.pi * obs['month'] / 12)
-        month_cos = np.cos(2 * np.pi * obs['month'] / 12)
-        X.append([month_sin, month_cos, obs['humidity'], obs['precipitation']])
-        y.append(obs['temp_mean'])
+    # Features: month (cyclical), humidity, precipitation
+    month_angle = 2 * np.pi * rows[:, 0] / 12
+    X = np.column_stack([np.sin(month_angle), np.cos(month_angle), rows[:, 1], rows[:, 2]])
+    y = rows[:, 3]
     
-    return np.array(X), np.array(y), ['month_sin', 'month_cos', 'humidity', 'precipitation']
+    return X, y, list(FEATURE_NAMES)
 
 
 class SimpleLinearRegression:
@@ -129,23 +138,11 @@ class SimpleLinearRegression:
         return importance
 
 
-def train_temperature_model() -> Dict[str, Any]:
+def _evaluate_model(X: np.ndarray, y: np.ndarray, feature_names: List[str]) -> Dict[str, Any]:
     """
-    Train a linear regression model on climate data
+    Fit on the first 80% of the data and evaluate on the rest
     Returns model info, metrics, predictions for visualization
     """
-    X, y, feature_names = prepare_regression_data()
-    
-    if len(X) < 10:
-        return {
-            'status': 'no_data',
-            'message': 'Not enough data to train model. Run: python manage.py load_sample_data',
-            'metrics': {'rmse': 0, 'mae': 0, 'r2': 0},
-            'feature_importance': [],
-            'predictions': [],
-            'actuals': [],
-        }
-    
     # Split data (80% train, 20% test)
     split_idx = int(len(X) * 0.8)
     X_train, X_test = X[:split_idx], X[split_idx:]
@@ -165,7 +162,7 @@ def train_temperature_model() -> Dict[str, Any]:
     return {
         'status': 'trained',
         'message': f'Model trained on {len(X_train)} samples, tested on {len(X_test)} samples',
-        'metrics': metrics,
+        'metrics': {name: float(value) for name, value in metrics.items()},
         'feature_importance': model.get_feature_importance(),
         'predictions': [round(float(p), 2) for p in y_pred],
         'actuals': [round(float(a), 2) for a in y_test[:sample_size]],
@@ -188,39 +185,36 @@ def _format_equation(model: SimpleLinearRegression) -> str:
     return "temp_mean = " + " ".join(terms)
 
 
-def get_monthly_predictions() -> List[Dict[str, Any]]:
+def _monthly_predictions(model: SimpleLinearRegression, X: np.ndarray) -> List[Dict[str, Any]]:
     """
-    Generate monthly temperature predictions using the model
-    Returns predictions for each month for visualization
+    Predict each calendar month at average humidity and precipitation
+    Actual monthly averages come from the region rollup in one query
     """
-    X, y, feature_names = prepare_regression_data()
-    
-    if len(X) < 10:
-        return []
-    
-    # Train model on all data
-    model = SimpleLinearRegression()
-    model.fit(X, y, feature_names)
-    
-    # Generate predictions for each month
-    predictions = []
     avg_humidity = np.mean(X[:, 2]) if len(X) > 0 else 60
     avg_precip = np.mean(X[:, 3]) if len(X) > 0 else 50
     
+    months = np.arange(1, 13)
+    month_angle = 2 * np.pi * months / 12
+    X_pred = np.column_stack([
+        np.sin(month_angle), np.cos(month_angle),
+        np.full(12, avg_humidity), np.full(12, avg_precip),
+    ])
+    predicted = model.predict(X_pred)
+    
+    actuals = {
+        item['month']: rollup_average(item['temp_sum'], item['temp_count'])
+        for item in RegionMonthlyRollup.objects.filter(temp_mean_count__gt=0).values('month').annotate(
+            temp_sum=Sum('temp_mean_sum'),
+            temp_count=Sum('temp_mean_count')
+        )
+    }
+    
     month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
                    'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
     
-    for month in range(1, 13):
-        month_sin = np.sin(2 * np.pi * month / 12)
-        month_cos = np.cos(2 * np.pi * month / 12)
-        X_pred = np.array([[month_sin, month_cos, avg_humidity, avg_precip]])
-        pred_temp = model.predict(X_pred)[0]
-        
-        # Get actual average for this month
-        actual_avg = ClimateObservation.objects.filter(
-            month=month, temp_mean__isnull=False
-        ).aggregate(avg=Avg('temp_mean'))['avg'] or pred_temp
-        
+    predictions = []
+    for month, pred_temp in zip(months, predicted):
+        actual_avg = actuals.get(int(month)) or pred_temp
         predictions.append({
             'month': month_names[month - 1],
             'predicted': round(float(pred_temp), 1),
@@ -228,3 +222,60 @@ def get_monthly_predictions() -> List[Dict[str, Any]]:
         })
     
     return predictions
+
+
+def fit_temperature_model() -> Dict[str, Any]:
+    """
+    Fit the temperature model and build its dashboard artifact
+    
+    Loads the training data once, evaluates on a held-out split and fits
+    the prediction model on all rows. Used as the model registry trainer.
+    """
+    X, y, feature_names = prepare_regression_data()
+    
+    if len(X) < 10:
+        return {
+            'intercept': None,
+            'coefficients': [],
+            'metrics': NO_DATA_RESULT['metrics'],
+            'artifact': {'result': NO_DATA_RESULT, 'monthly_predictions': []},
+        }
+    
+    result = _evaluate_model(X, y, feature_names)
+    
+    # Train model on all data for the monthly predictions
+    model = SimpleLinearRegression()
+    model.fit(X, y, feature_names)
+    
+    return {
+        'intercept': float(model.intercept),
+        'coefficients': [float(c) for c in model.coefficients],
+        'metrics': result['metrics'],
+        'artifact': {'result': result, 'monthly_predictions': _monthly_predictions(model, X)},
+    }
+
+
+def load_temperature_model() -> Dict[str, Any]:
+    """Stored temperature model artifact for the current data version"""
+    return load_artifact(TEMPERATURE_MODEL_NAME, FEATURE_NAMES, fit_temperature_model)
+
+
+def ensure_temperature_model():
+    """Train the temperature model for the current data version if missing"""
+    return train_model(TEMPERATURE_MODEL_NAME, FEATURE_NAMES, fit_temperature_model)
+
+
+def train_temperature_model() -> Dict[str, Any]:
+    """
+    Temperature model info, metrics and predictions for visualization
+    Served from the model registry; see fit_temperature_model
+    """
+    return load_temperature_model()['result']
+
+
+def get_monthly_predictions() -> List[Dict[str, Any]]:
+    """
+    Monthly temperature predictions for visualization
+    Served from the model registry; see fit_temperature_model
+    """
+    return load_temperature_model()['monthly_predictions']
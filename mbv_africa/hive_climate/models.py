@@ -1,3 +1,6 @@
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -83,6 +86,187 @@ class ClimateObservation(models.Model):
         return f"{self.station.station_id} - {self.observation_date}"
 
 
+# Observation measures aggregated by the monthly rollup tables
+ROLLUP_MEASURES = [
+    'temp_max', 'temp_min', 'temp_mean', 'precipitation',
+    'humidity', 'sea_surface_temp', 'ocean_salinity',
+]
+
+# Per-measure rollup columns: <measure>_count, <measure>_sum, ...
+ROLLUP_STATISTICS = ['count', 'sum', 'min', 'max', 'sumsq']
+
+
+class MonthlyRollup(models.Model):
+    """
+    Pre-aggregated observations for one month
+    
+    Each measure in ROLLUP_MEASURES has count, sum, min, max and sum of
+    squares columns, so averages and standard deviations can be combined
+    across any set of rows. Maintained by services.rollups.
+    """
+    year = models.IntegerField()
+    month = models.IntegerField()
+    observation_count = models.IntegerField(default=0)
+    # Salinity from readings that also have a sea surface temperature, so
+    # ocean averages cover the same observations as the SST average
+    sst_salinity_count = models.IntegerField(default=0)
+    sst_salinity_sum = models.FloatField(null=True, blank=True)
+    
+    class Meta:
+        abstract = True
+
+
+for _measure in ROLLUP_MEASURES:
+    MonthlyRollup.add_to_class(f'{_measure}_count', models.IntegerField(default=0))
+    MonthlyRollup.add_to_class(f'{_measure}_sum', models.FloatField(null=True, blank=True))
+    MonthlyRollup.add_to_class(f'{_measure}_min', models.FloatField(null=True, blank=True))
+    MonthlyRollup.add_to_class(f'{_measure}_max', models.FloatField(null=True, blank=True))
+    MonthlyRollup.add_to_class(f'{_measure}_sumsq', models.FloatField(null=True, blank=True))
+
+
+class StationMonthlyRollup(MonthlyRollup):
+    """Observation aggregates per (station, year, month)"""
+    station = models.ForeignKey(WeatherStation, on_delete=models.CASCADE, related_name='monthly_rollups')
+    
+    class Meta:
+        ordering = ['year', 'month']
+        unique_together = ['station', 'year', 'month']
+        indexes = [
+            models.Index(fields=['year', 'month']),
+        ]
+    
+    def __str__(self):
+        return f"{self.station_id} - {self.year}-{self.month:02d}"
+
+
+class RegionMonthlyRollup(MonthlyRollup):
+    """Observation aggregates per (region, year, month)"""
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name='monthly_rollups')
+    
+    class Meta:
+        ordering = ['year', 'month']
+        unique_together = ['region', 'year', 'month']
+        indexes = [
+            models.Index(fields=['year', 'month']),
+        ]
+    
+    def __str__(self):
+        return f"{self.region_id} - {self.year}-{self.month:02d}"
+
+
+class MonthlyBaseline(models.Model):
+    """
+    Climatological mean for one calendar month over a reference period
+    
+    Each measure in ROLLUP_MEASURES has a mean and the number of
+    observations it was computed from. Maintained by services.climatology.
+    """
+    month = models.IntegerField()
+    reference_start = models.IntegerField(help_text="First year of the reference period")
+    reference_end = models.IntegerField(help_text="Last year of the reference period")
+    
+    class Meta:
+        abstract = True
+
+
+for _measure in ROLLUP_MEASURES:
+    MonthlyBaseline.add_to_class(f'{_measure}_mean', models.FloatField(null=True, blank=True))
+    MonthlyBaseline.add_to_class(f'{_measure}_count', models.IntegerField(default=0))
+
+
+class StationBaseline(MonthlyBaseline):
+    """Climatology per (station, calendar month)"""
+    station = models.ForeignKey(WeatherStation, on_delete=models.CASCADE, related_name='baselines')
+    
+    class Meta:
+        ordering = ['month']
+        unique_together = ['station', 'month']
+    
+    def __str__(self):
+        return f"{self.station_id} - month {self.month} ({self.reference_start}-{self.reference_end})"
+
+
+class RegionBaseline(MonthlyBaseline):
+    """Climatology per (region, calendar month)"""
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name='baselines')
+    
+    class Meta:
+        ordering = ['month']
+        unique_together = ['region', 'month']
+    
+    def __str__(self):
+        return f"{self.region_id} - month {self.month} ({self.reference_start}-{self.reference_end})"
+
+
+class RegionAnomaly(models.Model):
+    """
+    Anomaly cube cell: a region's monthly mean and its departure from the
+    region baseline for that calendar month. Maintained by services.climatology.
+    """
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name='anomalies')
+    year = models.IntegerField()
+    month = models.IntegerField()
+    
+    class Meta:
+        ordering = ['year', 'month']
+        unique_together = ['region', 'year', 'month']
+        indexes = [
+            models.Index(fields=['year', 'month']),
+        ]
+    
+    def __str__(self):
+        return f"{self.region_id} - {self.year}-{self.month:02d}"
+
+
+for _measure in ROLLUP_MEASURES:
+    RegionAnomaly.add_to_class(f'{_measure}_mean', models.FloatField(null=True, blank=True))
+    RegionAnomaly.add_to_class(f'{_measure}_anomaly', models.FloatField(null=True, blank=True))
+
+
+class ObservationSummary(models.Model):
+    """Observation counters and date bounds, maintained by services.summaries"""
+    observation_count = models.PositiveBigIntegerField(default=0)
+    coastal_observation_count = models.PositiveBigIntegerField(default=0, help_text="Observations with sea surface temperature")
+    first_observation_date = models.DateField(null=True, blank=True)
+    last_observation_date = models.DateField(null=True, blank=True)
+    
+    class Meta:
+        abstract = True
+
+
+class StationSummary(ObservationSummary):
+    """Observation counters for one station"""
+    station = models.OneToOneField(WeatherStation, on_delete=models.CASCADE, primary_key=True, related_name='summary')
+    
+    def __str__(self):
+        return f"{self.station_id}: {self.observation_count} observations"
+
+
+class RegionSummary(ObservationSummary):
+    """Station and observation counters for one region"""
+    region = models.OneToOneField(Region, on_delete=models.CASCADE, primary_key=True, related_name='summary')
+    station_count = models.IntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.region_id}: {self.station_count} stations, {self.observation_count} observations"
+
+
+class StationProfile(models.Model):
+    """
+    Precomputed station page data: lifetime statistics, a 12-month
+    climatology and the most recent observations. Maintained by
+    services.profiles whenever the station's observations change.
+    """
+    station = models.OneToOneField(WeatherStation, on_delete=models.CASCADE, primary_key=True, related_name='profile')
+    statistics = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    climatology = models.JSONField(default=list, blank=True, help_text="Monthly averages, one entry per calendar month")
+    recent_observations = models.JSONField(default=list, blank=True, encoder=DjangoJSONEncoder)
+    refreshed_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Profile of {self.station_id}"
+
+
 class DataImportLog(models.Model):
     """Track data imports from Hive"""
     import_type = models.CharField(max_length=50, choices=[
@@ -142,3 +326,131 @@ class HiveQueryLog(models.Model):
     
     def __str__(self):
         return f"{self.query_type} - {self.executed_at.strftime('%Y-%m-%d %H:%M:%S')}"
+
+
+class HiveQueryJob(models.Model):
+    """
+    Hive query executed in the background
+    
+    Results are spooled to a local columnar file (result_path) and paged
+    from there. Jobs and their spool files expire expires_at. Maintained
+    by services.query_jobs.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
+        ('expired', 'Expired'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    query = models.TextField()
+    fetch_results = models.BooleanField(default=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    cancel_requested = models.BooleanField(default=False)
+    columns = models.JSONField(default=list, blank=True)
+    row_count = models.BigIntegerField(null=True, blank=True)
+    result_path = models.CharField(max_length=500, blank=True)
+    result_format = models.CharField(max_length=20, blank=True, help_text="parquet or ndjson")
+    error_message = models.TextField(blank=True)
+    submitted_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.id} ({self.status})"
+    
+    @property
+    def execution_time(self):
+        if self.started_at and self.finished_at:
+            return (self.finished_at - self.started_at).total_seconds()
+        return None
+
+
+class DataVersion(models.Model):
+    """
+    Single-row token bumped whenever climate data changes
+    
+    Cached dashboard and API data is keyed by this version, so a bump
+    invalidates everything at once. Also holds the write lock taken by
+    staged loads. Maintained by services.data_version.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    reason = models.CharField(max_length=100, blank=True)
+    changed_at = models.DateTimeField(auto_now=True)
+    # Random per database: versions restart at 1 in a new database, so cache
+    # keys and ETags carry this too
+    instance = models.UUIDField(default=uuid.uuid4, editable=False)
+    # Set while a staged load runs; API writes are refused until then
+    writes_blocked_until = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"v{self.version} ({self.reason})" if self.reason else f"v{self.version}"
+
+
+class DataStatistics(models.Model):
+    """
+    Single-row snapshot of dataset counters shown on the dashboards
+    
+    Refreshed in the same transaction as the rollups whenever observations
+    or stations change, so readers fetch one row instead of scanning the
+    observation table. Maintained by services.statistics.
+    """
+    observation_count = models.PositiveBigIntegerField(default=0)
+    station_count = models.IntegerField(default=0)
+    active_station_count = models.IntegerField(default=0)
+    coastal_station_count = models.IntegerField(default=0)
+    region_count = models.IntegerField(default=0)
+    country_count = models.IntegerField(default=0)
+    coastal_observation_count = models.PositiveBigIntegerField(default=0, help_text="Observations with sea surface temperature")
+    first_observation_date = models.DateField(null=True, blank=True)
+    last_observation_date = models.DateField(null=True, blank=True)
+    observation_bytes = models.PositiveBigIntegerField(null=True, blank=True, help_text="On-disk size of the observation table")
+    database_bytes = models.PositiveBigIntegerField(null=True, blank=True)
+    refreshed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = 'data statistics'
+    
+    def __str__(self):
+        return f"{self.observation_count} observations ({self.refreshed_at})"
+
+
+class TrainedModel(models.Model):
+    """
+    Persisted ML model artifact, keyed by data version and feature set
+    
+    Holds the fitted coefficients, evaluation metrics and the precomputed
+    dashboard predictions so page views never fit a model. Maintained by
+    services.model_registry.
+    """
+    name = models.CharField(max_length=50)
+    feature_set = models.CharField(max_length=200, help_text="Comma-separated feature names")
+    data_version = models.PositiveBigIntegerField()
+    status = models.CharField(max_length=20, choices=[
+        ('training', 'Training'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ], default='training')
+    intercept = models.FloatField(null=True, blank=True)
+    coefficients = models.JSONField(default=list, blank=True)
+    metrics = models.JSONField(default=dict, blank=True)
+    artifact = models.JSONField(default=dict, blank=True, help_text="Dashboard result and monthly predictions")
+    error_message = models.TextField(blank=True)
+    training_time = models.FloatField(null=True, blank=True, help_text="Training time in seconds")
+    created_at = models.DateTimeField(auto_now_add=True)
+    trained_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-data_version']
+        unique_together = ['name', 'feature_set', 'data_version']
+    
+    def __str__(self):
+        return f"{self.name} v{self.data_version} ({self.status})"
@@ -0,0 +1,196 @@
+"""
+Pagination for Climate Data API
+"""
+import base64
+import json
+from collections import OrderedDict
+from datetime import date
+
+from django.db import connection
+from django.db.models import Q, Sum
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from hive_climate.models import StationMonthlyRollup
+from hive_climate.services.statistics import get_statistics
+
+# Observation filters that the station rollup can answer exactly
+ROLLUP_COUNT_FILTERS = {
+    'station__country', 'station__region', 'year', 'year__gte', 'year__lte', 'month',
+}
+
+# Query parameters that don't filter observations
+NON_FILTER_PARAMS = {'cursor', 'pagination', 'page', 'page_size', 'count', 'ordering', 'format', 'fields'}
+
+
+class ObservationKeysetPagination(BasePagination):
+    """
+    Keyset pagination on (observation_date, id)
+
+    Each page continues from the last row of the previous one with a
+    WHERE on the observation_date index instead of an OFFSET, so deep
+    pages cost the same as the first. Cursors are opaque tokens.
+
+    Enabled with ?pagination=cursor or by passing a cursor. The total is
+    skipped unless ?count=approximate or ?count=exact is given.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    count_modes = ('none', 'approximate', 'exact')
+
+    @classmethod
+    def requested(cls, request) -> bool:
+        params = request.query_params
+        return params.get('pagination') == 'cursor' or cls.cursor_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        ordering = request.query_params.get('ordering', '-observation_date')
+        if ordering not in ('observation_date', '-observation_date'):
+            raise ValidationError({'ordering': 'Cursor pagination orders by observation_date or -observation_date'})
+        self.descending = ordering == '-observation_date'
+        cursor = self.decode_cursor(request)
+        self.count = self.get_count(queryset, request)
+
+        reverse = bool(cursor and cursor['reverse'])
+        # A backwards page walks the index the other way and is flipped afterwards
+        descending = self.descending != reverse
+        direction = '-' if descending else ''
+        ordered = queryset.order_by(f'{direction}observation_date', f'{direction}id')
+        if cursor:
+            position = date.fromisoformat(cursor['date'])
+            lookup = 'lt' if descending else 'gt'
+            # The redundant inclusive bound lets the planner seek the index
+            # instead of scanning it up to the position
+            ordered = ordered.filter(
+                Q(**{f'observation_date__{lookup}': position})
+                | Q(observation_date=position, **{f'id__{lookup}': cursor['id']}),
+                **{f'observation_date__{lookup}e': position}
+            )
+
+        rows = list(ordered[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, api_settings.PAGE_SIZE or 100))
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: 'Must be an integer'})
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            date.fromisoformat(cursor['date'])
+            return {'date': cursor['date'], 'id': int(cursor['id']), 'reverse': bool(cursor.get('reverse'))}
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound('Invalid cursor')
+
+    def encode_cursor(self, obj, reverse=False):
+        if isinstance(obj, dict):
+            # values() row from the fast list path
+            payload = {'date': obj['observation_date'].isoformat(), 'id': obj['id']}
+        else:
+            payload = {'date': obj.observation_date.isoformat(), 'id': obj.pk}
+        if reverse:
+            payload['reverse'] = True
+        encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+        return encoded.decode('ascii').rstrip('=')
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+        return remove_query_param(url, 'pagination')
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        url = replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(self.page[0], reverse=True)
+        )
+        return remove_query_param(url, 'pagination')
+
+    def get_count(self, queryset, request):
+        """Total rows for the requested count mode, or None"""
+        mode = request.query_params.get('count', 'none')
+        if mode not in self.count_modes:
+            raise ValidationError({'count': f"Must be one of {', '.join(self.count_modes)}"})
+        if mode == 'none':
+            return None
+        if mode == 'exact':
+            return queryset.count()
+        return self.estimate_count(queryset, request)
+
+    def estimate_count(self, queryset, request):
+        """
+        Cheap total for ?count=approximate
+
+        Unfiltered totals come from the statistics snapshot and rollup-shaped
+        filters from the station rollup; anything else uses the PostgreSQL
+        planner estimate where available.
+        """
+        filters = {
+            key: value for key, value in request.query_params.items()
+            if key not in NON_FILTER_PARAMS
+        }
+        if not filters:
+            return get_statistics().observation_count
+        if set(filters) <= ROLLUP_COUNT_FILTERS:
+            try:
+                total = StationMonthlyRollup.objects.filter(**filters).aggregate(
+                    total=Sum('observation_count')
+                )['total']
+                return total or 0
+            except (TypeError, ValueError):
+                return None
+        if connection.vendor == 'postgresql':
+            sql, params = queryset.order_by().query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        return None
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'count': {'type': 'integer', 'nullable': True},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
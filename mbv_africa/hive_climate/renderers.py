@@ -0,0 +1,82 @@
+"""
+Renderers for Climate Data API
+
+FastJSONRenderer is the default JSON renderer. The export formats are
+produced by streaming responses, so their renderers mostly exist for
+content negotiation: they make ?format=csv and Accept: text/csv select
+the format. Error responses are rendered as JSON.
+"""
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+    _orjson_available = True
+except ImportError:
+    _orjson_available = False
+
+
+def dumps(data) -> bytes:
+    """Encode data like FastJSONRenderer does"""
+    if not _orjson_available:
+        return json.dumps(data, cls=encoders.JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return orjson.dumps(
+        data,
+        default=encoders.JSONEncoder().default,
+        option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed
+
+    Output matches the stock renderer: compact, UTF-8, and anything orjson
+    does not handle natively (datetimes, decimals, lazy strings) goes
+    through DRF's JSONEncoder. Indented output falls back to the stock
+    renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not _orjson_available or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class ExportRenderer(BaseRenderer):
+    """Negotiation-only renderer for a streamed export format"""
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, bytes):
+            return data
+        return json.dumps(data).encode('utf-8')
+
+
+class CSVRenderer(ExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+
+class NDJSONRenderer(ExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+
+class ParquetRenderer(ExportRenderer):
+    media_type = 'application/vnd.apache.parquet'
+    format = 'parquet'
+
+
+class ArrowRenderer(ExportRenderer):
+    """Arrow IPC stream; load with pyarrow.ipc.open_stream(...).read_pandas()"""
+    media_type = 'application/vnd.apache.arrow.stream'
+    format = 'arrow'
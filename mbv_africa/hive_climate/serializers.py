@@ -1,6 +1,9 @@
 """
 Serializers for Climate Data API
 """
+import copy
+
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
 from rest_framework import serializers
 from hive_climate.models import (
     Region, WeatherStation, ClimateObservation,
@@ -17,6 +20,9 @@ class RegionSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'code', 'description', 'station_count']
     
     def get_station_count(self, obj):
+        # Annotated by RegionViewSet; counted directly for other callers
+        if hasattr(obj, 'station_count'):
+            return obj.station_count
         return obj.stations.count()
 
 
@@ -36,12 +42,22 @@ class WeatherStationSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at']
     
+    # Both come from the maintained StationSummary counters;
+    # select_related('summary') makes them query-free
+    def _summary(self, obj):
+        try:
+            return obj.summary
+        except ObjectDoesNotExist:
+            # Station without observations
+            return None
+    
     def get_observation_count(self, obj):
-        return obj.observations.count()
+        summary = self._summary(obj)
+        return summary.observation_count if summary else 0
     
     def get_latest_observation(self, obj):
-        latest = obj.observations.first()
-        return latest.observation_date if latest else None
+        summary = self._summary(obj)
+        return summary.last_observation_date if summary else None
 
 
 class WeatherStationListSerializer(serializers.ModelSerializer):
@@ -174,3 +190,116 @@ class HiveQueryExecuteSerializer(serializers.Serializer):
                     f"Query contains potentially dangerous keyword: {keyword}"
                 )
         return value
+
+
+class ValuesRows:
+    """
+    Builds a serializer's list representation straight from values() rows
+    
+    Used by the list endpoints instead of instantiating model objects and
+    running DRF's field machinery per row. Output names must match the
+    serializer's fields, in order; this is checked when the spec is built.
+    """
+    
+    def __init__(self, serializer_class, fields):
+        """
+        Args:
+            serializer_class: Serializer whose output is reproduced
+            fields: (output name, ORM path) pairs, or a bare name when both
+                are equal; paths may name annotations of the queryset
+        """
+        self.fields = [(field, field) if isinstance(field, str) else field for field in fields]
+        self.names = [name for name, _ in self.fields]
+        self.paths = [path for _, path in self.fields]
+        
+        expected = list(serializer_class.Meta.fields)
+        if self.names != expected:
+            raise ValueError(f"{serializer_class.__name__} fields {expected} != row fields {self.names}")
+        
+        # Model field types by path (None for annotations), e.g. for binary formats
+        self.internal_types = {}
+        for name, path in self.fields:
+            model_field = self._model_field(serializer_class.Meta.model, path)
+            self.internal_types[path] = model_field.get_internal_type() if model_field is not None else None
+        
+        # Reuse the serializer's own representation for non-JSON-native values
+        self.converters = {}
+        for path, internal_type in self.internal_types.items():
+            if internal_type == 'DateTimeField':
+                self.converters[path] = serializers.DateTimeField().to_representation
+            elif internal_type == 'DateField':
+                self.converters[path] = serializers.DateField().to_representation
+    
+    @staticmethod
+    def _model_field(model, path):
+        field = None
+        for part in path.split('__'):
+            if model is None:
+                return None
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return None
+            model = field.related_model
+        return field
+    
+    def subset(self, names, extra_paths=()):
+        """
+        Spec producing only the named output fields, in spec order
+        
+        Args:
+            names: Output field names to keep
+            extra_paths: Paths to select anyway, e.g. pagination keys
+        
+        Raises:
+            ValueError: Unknown field name
+        """
+        unknown = [name for name in names if name not in self.names]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        rows = copy.copy(self)
+        rows.fields = [field for field in self.fields if field[0] in names]
+        rows.names = [name for name, _ in rows.fields]
+        rows.paths = [path for _, path in rows.fields]
+        rows.paths += [path for path in extra_paths if path not in rows.paths]
+        return rows
+    
+    def values(self, queryset):
+        """values() queryset with the row paths"""
+        return queryset.values(*self.paths)
+    
+    def to_representation(self, rows):
+        """List of output dictionaries for values() rows"""
+        converters = self.converters
+        fields = self.fields
+        result = []
+        for row in rows:
+            item = {}
+            for name, path in fields:
+                value = row[path]
+                if value is not None and path in converters:
+                    value = converters[path](value)
+                item[name] = value
+            result.append(item)
+        return result
+
+
+OBSERVATION_ROWS = ValuesRows(ClimateObservationSerializer, [
+    'id', ('station', 'station_id'), ('station_id', 'station__station_id'),
+    ('station_name', 'station__station_name'), ('region', 'station__region__name'),
+    ('country', 'station__country'),
+    'observation_date', 'year', 'month',
+    'temp_max', 'temp_min', 'temp_mean',
+    'precipitation', 'humidity',
+    'sea_surface_temp', 'ocean_salinity',
+    'data_quality', 'created_at', 'updated_at',
+])
+
+STATION_LIST_ROWS = ValuesRows(WeatherStationListSerializer, [
+    'id', 'station_id', 'station_name', 'country',
+    ('region_name', 'region__name'), 'latitude', 'longitude', 'is_coastal', 'is_active',
+])
+
+REGION_ROWS = ValuesRows(RegionSerializer, [
+    'id', 'name', 'code', 'description', 'station_count',
+])
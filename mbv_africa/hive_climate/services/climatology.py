@@ -0,0 +1,201 @@
+"""
+Climatology Service
+Maintains monthly climatology baselines per station and per region over a
+configurable reference period (settings.CLIMATOLOGY_REFERENCE_PERIOD), and
+the region x year x month anomaly cube derived from them. Everything is
+computed from the rollup tables; after a write only the affected cells
+are recomputed.
+"""
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum, Value
+from django.db.models.functions import NullIf
+
+from hive_climate.models import (
+    RegionAnomaly, RegionBaseline, RegionMonthlyRollup, StationBaseline,
+    StationMonthlyRollup, WeatherStation, ROLLUP_MEASURES,
+)
+from hive_climate.services.rollups import Partition, chunked, insert_from_queryset, rollup_average
+
+logger = logging.getLogger(__name__)
+
+
+def reference_period() -> Tuple[int, int]:
+    """(first year, last year) of the climatology reference period"""
+    start, end = getattr(settings, 'CLIMATOLOGY_REFERENCE_PERIOD', (1991, 2020))
+    return int(start), int(end)
+
+
+def _baseline_queryset(rollups, group_by: str):
+    """Per (group, month) means over the reference period from a rollup queryset"""
+    start, end = reference_period()
+    # Means first: once a <measure>_count annotation exists it shadows the column
+    aggregates = {
+        f'{measure}_mean': Sum(f'{measure}_sum') / NullIf(Sum(f'{measure}_count'), 0)
+        for measure in ROLLUP_MEASURES
+    }
+    for measure in ROLLUP_MEASURES:
+        aggregates[f'{measure}_count'] = Sum(f'{measure}_count')
+    return rollups.filter(year__gte=start, year__lte=end).order_by().values(
+        group_by, 'month'
+    ).annotate(
+        reference_start=Value(start),
+        reference_end=Value(end),
+        **aggregates
+    )
+
+
+def _rebuild_station_baselines(station_pks: Optional[Set[int]]) -> int:
+    if station_pks is None:
+        StationBaseline.objects.all().delete()
+        return insert_from_queryset(
+            StationBaseline, _baseline_queryset(StationMonthlyRollup.objects.all(), 'station_id')
+        )
+
+    rows = 0
+    for chunk in chunked(station_pks):
+        StationBaseline.objects.filter(station_id__in=chunk).delete()
+        rows += insert_from_queryset(
+            StationBaseline,
+            _baseline_queryset(StationMonthlyRollup.objects.filter(station_id__in=chunk), 'station_id'),
+        )
+    return rows
+
+
+def _region_baseline_values() -> Dict[Tuple[int, int], Tuple]:
+    fields = [f'{measure}_mean' for measure in ROLLUP_MEASURES]
+    return {
+        (row[0], row[1]): row[2:]
+        for row in RegionBaseline.objects.values_list('region_id', 'month', *fields)
+    }
+
+
+def _rebuild_region_baselines() -> Set[int]:
+    """
+    Rebuild the region baselines (a few dozen rows)
+
+    Returns:
+        Regions whose baseline values changed
+    """
+    before = _region_baseline_values()
+    RegionBaseline.objects.all().delete()
+    insert_from_queryset(RegionBaseline, _baseline_queryset(RegionMonthlyRollup.objects.all(), 'region_id'))
+    after = _region_baseline_values()
+    return {key[0] for key in set(before) | set(after) if before.get(key) != after.get(key)}
+
+
+def _rebuild_cells(region_months: Optional[Dict[int, Set[Tuple[int, int]]]],
+                   full_regions: Set[int]) -> int:
+    """
+    Recompute anomaly cube cells
+
+    Args:
+        region_months: {region pk: {(year, month), ...}} cells to rebuild,
+            or None to rebuild the whole cube
+        full_regions: Regions whose every cell must be rebuilt
+    """
+    baselines = defaultdict(dict)
+    for baseline in RegionBaseline.objects.all():
+        baselines[baseline.region_id][baseline.month] = baseline
+
+    rollups = RegionMonthlyRollup.objects.all()
+    cells = RegionAnomaly.objects.all()
+    if region_months is not None:
+        rollups = rollups.filter(region_id__in=full_regions | set(region_months))
+        cells = cells.filter(region_id__in=full_regions | set(region_months))
+
+    anomalies = []
+    for rollup in rollups.iterator():
+        if (region_months is not None and rollup.region_id not in full_regions
+                and (rollup.year, rollup.month) not in region_months[rollup.region_id]):
+            continue
+        baseline = baselines[rollup.region_id].get(rollup.month)
+        cell = RegionAnomaly(region_id=rollup.region_id, year=rollup.year, month=rollup.month)
+        for measure in ROLLUP_MEASURES:
+            mean = rollup_average(getattr(rollup, f'{measure}_sum'), getattr(rollup, f'{measure}_count'))
+            normal = getattr(baseline, f'{measure}_mean') if baseline else None
+            setattr(cell, f'{measure}_mean', mean)
+            setattr(cell, f'{measure}_anomaly', mean - normal if mean is not None and normal is not None else None)
+        anomalies.append(cell)
+
+    if region_months is None:
+        cells.delete()
+    else:
+        # Drop the affected cells, including months whose rollup row is gone
+        cells.filter(region_id__in=full_regions).delete()
+        regions_by_month = defaultdict(set)
+        for region_pk, months in region_months.items():
+            if region_pk not in full_regions:
+                for year, month in months:
+                    regions_by_month[(year, month)].add(region_pk)
+        for (year, month), region_pks in regions_by_month.items():
+            cells.filter(year=year, month=month, region_id__in=region_pks).delete()
+    RegionAnomaly.objects.bulk_create(anomalies, batch_size=1000)
+    return len(anomalies)
+
+
+def refresh_climatology(partitions: Optional[Iterable[Partition]] = None,
+                        region_partitions: Iterable[Partition] = ()) -> Dict[str, Any]:
+    """
+    Refresh baselines and anomaly cells after the rollups were refreshed
+
+    Station baselines are rebuilt only for stations with changes inside
+    the reference period. Region baselines are always rebuilt; a region
+    whose baseline moved gets its whole row of the cube recomputed,
+    otherwise only the touched (year, month) cells are.
+
+    Args:
+        partitions: (station pk, year, month) tuples that changed, or None
+            to rebuild everything
+        region_partitions: Extra (region pk, year, month) tuples, e.g. from
+            station moves or deletions
+
+    Returns:
+        Dictionary with the mode used, rows written and elapsed seconds
+    """
+    start_time = time.time()
+    start, end = reference_period()
+    stored = StationBaseline.objects.values_list('reference_start', 'reference_end').first()
+    if stored is not None and stored != (start, end):
+        # Reference period changed in settings
+        partitions = None
+
+    with transaction.atomic():
+        if partitions is None:
+            station_rows = _rebuild_station_baselines(None)
+            _rebuild_region_baselines()
+            cells = _rebuild_cells(None, set())
+        else:
+            partitions = set(partitions)
+            station_rows = _rebuild_station_baselines(
+                {pk for pk, year, _ in partitions if start <= int(year) <= end}
+            )
+            changed_regions = _rebuild_region_baselines()
+
+            station_regions = dict(
+                WeatherStation.objects.filter(
+                    pk__in={pk for pk, _, _ in partitions}
+                ).values_list('pk', 'region_id')
+            )
+            region_months = defaultdict(set)
+            for station_pk, year, month in partitions:
+                if station_pk in station_regions:
+                    region_months[station_regions[station_pk]].add((int(year), int(month)))
+            for region_pk, year, month in region_partitions:
+                region_months[region_pk].add((int(year), int(month)))
+            cells = _rebuild_cells(region_months, changed_regions)
+
+    stats = {
+        'mode': 'full' if partitions is None else 'incremental',
+        'reference_period': f'{start}-{end}',
+        'station_baselines': station_rows,
+        'anomaly_cells': cells,
+        'seconds': round(time.time() - start_time, 3),
+    }
+    logger.info(f"Refreshed climatology: {stats}")
+    return stats
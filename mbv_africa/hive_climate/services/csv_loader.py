@@ -0,0 +1,183 @@
+"""
+Parallel CSV Loader
+Splits large observation CSV files into byte-range shards aligned on line
+boundaries and parses them in a process pool. Each shard comes back as a
+batch of typed columns that a single writer in the parent process inserts.
+
+The shard parser is deliberately free of Django imports so worker
+processes start cheaply with both the fork and spawn start methods.
+"""
+import csv
+import io
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD_SIZE = 8 * 1024 * 1024  # 8 MB of CSV text per shard
+
+OBSERVATION_FLOAT_COLUMNS = [
+    'temp_max', 'temp_min', 'temp_mean', 'precipitation',
+    'humidity', 'sea_surface_temp', 'ocean_salinity',
+]
+
+OBSERVATION_BATCH_COLUMNS = [
+    'station_id', 'observation_date', 'year', 'month',
+] + OBSERVATION_FLOAT_COLUMNS
+
+
+def compute_shards(csv_path: Path, shard_size: int = DEFAULT_SHARD_SIZE) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Split a CSV file into byte ranges that start and end on line boundaries
+
+    Assumes no quoted field contains a newline, which holds for the files
+    written by scripts/generate_data.py and the Hive CSV exports.
+
+    Args:
+        csv_path: Path to the CSV file
+        shard_size: Approximate number of bytes per shard
+
+    Returns:
+        Tuple of (header column names, list of (start, end) byte offsets)
+    """
+    shard_size = max(int(shard_size), 1)
+    file_size = os.path.getsize(csv_path)
+
+    with open(csv_path, 'rb') as f:
+        header_line = f.readline()
+        offsets = [f.tell()]
+        while offsets[-1] + shard_size < file_size:
+            f.seek(offsets[-1] + shard_size)
+            f.readline()  # Move to the end of the line the seek landed in
+            position = f.tell()
+            if position >= file_size:
+                break
+            offsets.append(position)
+        offsets.append(file_size)
+
+    header = next(csv.reader([header_line.decode('utf-8-sig')]), [])
+    shards = [(start, end) for start, end in zip(offsets[:-1], offsets[1:]) if end > start]
+    return [name.strip() for name in header], shards
+
+
+def _to_float(value: str) -> Optional[float]:
+    """Convert a CSV cell to float, treating blanks as missing"""
+    value = value.strip()
+    return float(value) if value else None
+
+
+def parse_observation_shard(task: Tuple[str, List[str], int, int]) -> Dict[str, Any]:
+    """
+    Parse, validate and type-convert one shard of an observations CSV
+
+    Runs inside a worker process.
+
+    Args:
+        task: Tuple of (csv path, header columns, start offset, end offset)
+
+    Returns:
+        Dictionary with typed column lists plus row, skipped and error counts
+    """
+    csv_path, header, start, end = task
+    with open(csv_path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+
+    index = {name: i for i, name in enumerate(header)}
+    date_index = index.get('observation_date', index.get('date_col'))
+    year_index = index.get('year')
+    month_index = index.get('month')
+    float_indexes = [(name, index.get(name)) for name in OBSERVATION_FLOAT_COLUMNS]
+
+    columns = {name: [] for name in OBSERVATION_BATCH_COLUMNS}
+    skipped = 0
+    errors = 0
+
+    for row in csv.reader(io.StringIO(text)):
+        if not row:
+            continue
+        try:
+            station_id = row[index['station_id']].strip()
+            raw_date = row[date_index].strip() if date_index is not None else ''
+            if not station_id or not raw_date:
+                skipped += 1
+                continue
+
+            obs_date = date.fromisoformat(raw_date.split()[0])
+            year = int(row[year_index]) if year_index is not None and row[year_index] else obs_date.year
+            month = int(row[month_index]) if month_index is not None and row[month_index] else obs_date.month
+            if not 1 <= month <= 12:
+                raise ValueError(f"Invalid month {month}")
+
+            values = [
+                _to_float(row[i]) if i is not None and i < len(row) else None
+                for _, i in float_indexes
+            ]
+        except (ValueError, IndexError, KeyError):
+            errors += 1
+            continue
+
+        columns['station_id'].append(station_id)
+        columns['observation_date'].append(obs_date)
+        columns['year'].append(year)
+        columns['month'].append(month)
+        for (name, _), value in zip(float_indexes, values):
+            columns[name].append(value)
+
+    return {
+        'columns': columns,
+        'rows': len(columns['station_id']),
+        'skipped': skipped,
+        'errors': errors,
+    }
+
+
+def iter_observation_batches(csv_path: Path, workers: int = 1,
+                             shard_size: int = DEFAULT_SHARD_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yield typed column batches for an observations CSV, one per shard
+
+    With more than one worker the shards are parsed in a process pool.
+    At most two shards per worker are in flight so memory stays bounded
+    when the writer is slower than the parsers. Batches are yielded in
+    file order.
+
+    Args:
+        csv_path: Path to the observations CSV
+        workers: Number of parser processes (1 parses in-process)
+        shard_size: Approximate number of bytes per shard
+
+    Yields:
+        Batches as returned by parse_observation_shard
+    """
+    header, shards = compute_shards(csv_path, shard_size)
+    tasks = [(str(csv_path), header, start, end) for start, end in shards]
+    workers = max(1, min(int(workers or 1), len(tasks) or 1))
+    logger.info(f"Parsing {csv_path} as {len(tasks)} shards with {workers} worker(s)")
+
+    if workers == 1:
+        for task in tasks:
+            yield parse_observation_shard(task)
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        remaining = iter(tasks)
+        for task in remaining:
+            pending.append(pool.submit(parse_observation_shard, task))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            batch = pending.popleft().result()
+            next_task = next(remaining, None)
+            if next_task is not None:
+                pending.append(pool.submit(parse_observation_shard, next_task))
+            yield batch
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,269 @@
+"""
+Cube Service
+Answers ad hoc aggregations over observations: group by any of
+DIMENSIONS, compute any of AGGREGATES over the ROLLUP_MEASURES columns
+and filter on dimension values. Each query is served from the smallest
+source that has every dimension and filter it needs - the region
+rollup, then the station rollup, then the observation table - using
+the count, sum, min, max and sum of squares columns the rollups keep.
+"""
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db.models import Case, CharField, Count, F, Max, Min, Sum, Value, When
+
+from hive_climate.models import (
+    ClimateObservation, RegionMonthlyRollup, StationMonthlyRollup, ROLLUP_MEASURES,
+)
+from hive_climate.services.rollups import rollup_average, rollup_stddev
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ['region', 'country', 'station', 'year', 'month', 'season', 'is_coastal']
+
+# Attributes that can only be filtered on
+FILTER_ONLY = ['data_quality']
+
+AGGREGATES = ['avg', 'sum', 'min', 'max', 'count', 'stddev']
+
+# Meteorological seasons by month
+SEASONS = {
+    'DJF': [12, 1, 2],
+    'MAM': [3, 4, 5],
+    'JJA': [6, 7, 8],
+    'SON': [9, 10, 11],
+}
+
+# Rollup statistics each aggregate is computed from
+AGGREGATE_STATISTICS = {
+    'avg': ['sum', 'count'],
+    'sum': ['sum'],
+    'min': ['min'],
+    'max': ['max'],
+    'count': ['count'],
+    'stddev': ['sum', 'sumsq', 'count'],
+}
+
+
+class CubeSource:
+    """
+    A table the cube can aggregate
+
+    Args:
+        name: Name reported to clients
+        model: Model to query
+        paths: Attribute name -> lookup path on the model
+        rolled_up: Whether rows hold rollup statistics rather than raw values
+    """
+
+    def __init__(self, name: str, model, paths: Dict[str, str], rolled_up: bool):
+        self.name = name
+        self.model = model
+        self.paths = paths
+        self.rolled_up = rolled_up
+
+    def covers(self, attributes: Iterable[str]) -> bool:
+        return all(attribute == 'season' and 'month' in self.paths or attribute in self.paths
+                   for attribute in attributes)
+
+    def statistic(self, measure: Optional[str], stat: str):
+        """Aggregate expression for one rollup statistic of a measure (None for all rows)"""
+        if measure is None:
+            return Sum('observation_count') if self.rolled_up else Count('id')
+        if self.rolled_up:
+            return {'sum': Sum, 'count': Sum, 'sumsq': Sum, 'min': Min, 'max': Max}[stat](f'{measure}_{stat}')
+        if stat == 'sumsq':
+            return Sum(F(measure) * F(measure))
+        return {'sum': Sum, 'count': Count, 'min': Min, 'max': Max}[stat](measure)
+
+
+_STATION_PATHS = {
+    'region': 'station__region__code',
+    'country': 'station__country',
+    'station': 'station__station_id',
+    'is_coastal': 'station__is_coastal',
+    'year': 'year',
+    'month': 'month',
+}
+
+# Smallest first
+SOURCES = [
+    CubeSource('region_monthly_rollup', RegionMonthlyRollup, {
+        'region': 'region__code',
+        'year': 'year',
+        'month': 'month',
+    }, rolled_up=True),
+    CubeSource('station_monthly_rollup', StationMonthlyRollup, _STATION_PATHS, rolled_up=True),
+    CubeSource('observations', ClimateObservation, {
+        **_STATION_PATHS,
+        'data_quality': 'data_quality',
+    }, rolled_up=False),
+]
+
+
+def parse_measures(names: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Parse measure specs: 'count' (observations) or '<aggregate>:<column>'
+
+    Raises:
+        ValueError: Unknown aggregate or column
+    """
+    measures = []
+    for name in names:
+        if name == 'count':
+            measures.append({'name': 'count', 'aggregate': 'count', 'column': None})
+            continue
+        aggregate, _, column = name.partition(':')
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate '{aggregate}'; use one of {', '.join(AGGREGATES)}")
+        if column not in ROLLUP_MEASURES:
+            raise ValueError(f"Unknown column '{column}'; use one of {', '.join(ROLLUP_MEASURES)}")
+        measures.append({'name': f'{aggregate}_{column}', 'aggregate': aggregate, 'column': column})
+    if not measures:
+        raise ValueError("Pass at least one measure")
+    return measures
+
+
+def _coerce(attribute: str, value: str):
+    if attribute in ('year', 'month'):
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"{attribute} must be an integer")
+    if attribute == 'is_coastal':
+        if value.lower() not in ('true', 'false', '1', '0'):
+            raise ValueError("is_coastal must be true or false")
+        return value.lower() in ('true', '1')
+    return value
+
+
+def parse_filters(params: Dict[str, List[str]]) -> Dict[str, List[Any]]:
+    """
+    Typed filter values per attribute from {attribute: [raw values]}
+
+    Raises:
+        ValueError: Unknown attribute or badly typed value
+    """
+    filters = {}
+    for attribute, values in params.items():
+        if attribute not in DIMENSIONS + FILTER_ONLY:
+            raise ValueError(f"Cannot filter on '{attribute}'")
+        if attribute == 'season':
+            unknown = [value for value in values if value not in SEASONS]
+            if unknown:
+                raise ValueError(f"season must be one of {', '.join(SEASONS)}")
+        filters[attribute] = [_coerce(attribute, value) for value in values]
+    return filters
+
+
+def select_source(attributes: Iterable[str]) -> CubeSource:
+    """Smallest source that has every attribute"""
+    attributes = set(attributes)
+    for source in SOURCES:
+        if source.covers(attributes):
+            return source
+    raise ValueError(f"No source covers {', '.join(sorted(attributes))}")
+
+
+def _season_case():
+    return Case(
+        *[When(month__in=months, then=Value(season)) for season, months in SEASONS.items()],
+        output_field=CharField(),
+    )
+
+
+def query_cube(dimensions: List[str], measures: List[Dict[str, Any]],
+               filters: Dict[str, List[Any]] = None,
+               start_year: int = None, end_year: int = None) -> Dict[str, Any]:
+    """
+    Aggregate observations into cells
+
+    Args:
+        dimensions: Attributes to group by, from DIMENSIONS
+        measures: Parsed measure specs (see parse_measures)
+        filters: Allowed values per attribute (see parse_filters)
+        start_year: First year to include
+        end_year: Last year to include
+
+    Returns:
+        Dictionary with the cells, the source that served them, the
+        number of observations they cover, whether the cell list was cut
+        at settings.ANALYTICS_CUBE_MAX_CELLS, and the latency in ms
+
+    Raises:
+        ValueError: Unknown or repeated dimension
+    """
+    start = time.time()
+    filters = filters or {}
+    unknown = [dimension for dimension in dimensions if dimension not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown dimensions: {', '.join(unknown)}; use {', '.join(DIMENSIONS)}")
+    if len(set(dimensions)) != len(dimensions):
+        raise ValueError("Dimensions must not repeat")
+
+    source = select_source(list(dimensions) + list(filters))
+    queryset = source.model.objects.order_by()
+    for attribute, values in filters.items():
+        if attribute == 'season':
+            queryset = queryset.filter(month__in=[month for season in values for month in SEASONS[season]])
+        else:
+            queryset = queryset.filter(**{f'{source.paths[attribute]}__in': values})
+    if start_year is not None:
+        queryset = queryset.filter(year__gte=start_year)
+    if end_year is not None:
+        queryset = queryset.filter(year__lte=end_year)
+
+    if 'season' in dimensions:
+        queryset = queryset.annotate(season=_season_case())
+    paths = ['season' if dimension == 'season' else source.paths[dimension] for dimension in dimensions]
+
+    statistics = {'rows': source.statistic(None, 'count')}
+    for measure in measures:
+        if measure['column'] is None:
+            continue
+        for stat in AGGREGATE_STATISTICS[measure['aggregate']]:
+            statistics[f"{measure['column']}_{stat}"] = source.statistic(measure['column'], stat)
+
+    max_cells = getattr(settings, 'ANALYTICS_CUBE_MAX_CELLS', 50000)
+    if paths:
+        grouped = queryset.values(*paths).annotate(**statistics).order_by(*paths)
+        rows = list(grouped[:max_cells + 1])
+    else:
+        rows = [queryset.aggregate(**statistics)]
+    truncated = len(rows) > max_cells
+
+    cells = []
+    observations = 0
+    for row in rows[:max_cells]:
+        observations += row['rows'] or 0
+        cell = {dimension: row[path] for dimension, path in zip(dimensions, paths)}
+        for measure in measures:
+            cell[measure['name']] = _measure_value(measure, row)
+        cells.append(cell)
+
+    result = {
+        'dimensions': dimensions,
+        'measures': [measure['name'] for measure in measures],
+        'source': source.name,
+        'cells': cells,
+        'truncated': truncated,
+        'observations': observations,
+        'latency_ms': round((time.time() - start) * 1000, 1),
+    }
+    logger.info(f"Cube query on {source.name}: {len(cells)} cells in {result['latency_ms']}ms")
+    return result
+
+
+def _measure_value(measure: Dict[str, Any], row: Dict[str, Any]):
+    column, aggregate = measure['column'], measure['aggregate']
+    if column is None:
+        return row['rows'] or 0
+    if aggregate == 'avg':
+        return rollup_average(row[f'{column}_sum'], row[f'{column}_count'])
+    if aggregate == 'stddev':
+        return rollup_stddev(row[f'{column}_sum'], row[f'{column}_sumsq'], row[f'{column}_count'])
+    if aggregate == 'count':
+        return row[f'{column}_count'] or 0
+    return row[f'{column}_{aggregate}']
@@ -5,26 +5,97 @@ With SQLite fallback support for offline development
 """
 import csv
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from django.db import transaction
+
+import pandas as pd
+from django.db import connection, transaction
+from django.db.models.constants import OnConflict
 from django.conf import settings
 from django.utils import timezone
 
 from hive_climate.models import Region, WeatherStation, ClimateObservation, DataImportLog
 from hive_climate.hive_connector import get_hive_manager, is_hive_available, is_hive_enabled
+from hive_climate.services.data_version import block_writes, bump_data_version
+from hive_climate.services.derived import refresh_derived_data
+from hive_climate.services.maintenance import fast_clear
+from hive_climate.services.staging import StagingTable
+from hive_climate.services.csv_loader import (
+    DEFAULT_SHARD_SIZE, OBSERVATION_BATCH_COLUMNS, iter_observation_batches
+)
 
 logger = logging.getLogger(__name__)
 
+# Column order of the tuples built by DataSyncService._observation_rows
+OBSERVATION_INSERT_FIELDS = [
+    'station', 'observation_date', 'year', 'month',
+    'temp_max', 'temp_min', 'temp_mean', 'precipitation',
+    'humidity', 'sea_surface_temp', 'ocean_salinity',
+    'data_quality', 'created_at', 'updated_at',
+]
+
+
+def insert_observation_rows(rows: List[tuple], table: str = None,
+                            update_existing: bool = False, batch_size: int = 5000) -> int:
+    """
+    Insert observation tuples with one parameterised statement per batch
+    
+    Skips the per-object ORM machinery of bulk_create. Rows that collide
+    with an existing (station, observation_date) pair are ignored, or
+    have their measurements overwritten when update_existing is set.
+    
+    Args:
+        rows: Tuples in OBSERVATION_INSERT_FIELDS order
+        table: Target table (defaults to the live observations table)
+        update_existing: Upsert instead of ignoring conflicts
+        batch_size: Rows per executemany() call
+        
+    Returns:
+        Number of rows inserted or updated
+    """
+    if not rows:
+        return 0
+    
+    ops = connection.ops
+    meta = ClimateObservation._meta
+    fields = [meta.get_field(name) for name in OBSERVATION_INSERT_FIELDS]
+    on_conflict = OnConflict.UPDATE if update_existing else OnConflict.IGNORE
+    unique_columns = [meta.get_field(name).column for name in ('station', 'observation_date')]
+    update_columns = [
+        field.column for field in fields
+        if field.column not in unique_columns and field.name != 'created_at'
+    ]
+    
+    columns = ', '.join(ops.quote_name(field.column) for field in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    sql = (
+        f"{ops.insert_statement(on_conflict=on_conflict)} "
+        f"{ops.quote_name(table or meta.db_table)} ({columns}) VALUES ({placeholders}) "
+        f"{ops.on_conflict_suffix_sql(fields, on_conflict, update_columns, unique_columns)}"
+    )
+    
+    written = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        for i in range(0, len(rows), batch_size):
+            cursor.executemany(sql, rows[i:i + batch_size])
+            written += max(cursor.rowcount, 0)
+    return written
+
 
 class DataSyncService:
     """Service to synchronize data from Hive to Django database"""
     
+    batch_size = 5000
+    
     def __init__(self):
         self.hive = None
         self.hive_available = False
         self.import_log = None
+        self.touched_partitions = set()
+        # Stations and regions written since the last derived refresh
+        self.touched_stations = set()
+        self.regions_changed = False
         self._check_hive_availability()
     
     def _check_hive_availability(self):
@@ -39,23 +110,80 @@ class DataSyncService:
         else:
             logger.info("Hive is disabled - running in SQLite-only mode")
     
-    def start_import_log(self, import_type='manual', user=None):
+    def start_import_log(self, import_type='manual', user=None, source='hive'):
         """Create import log entry"""
         self.import_log = DataImportLog.objects.create(
             import_type=import_type,
-            source='hive',
+            source=source,
             status='running',
             executed_by=user
         )
         return self.import_log
     
     def finish_import_log(self, status='completed', error_message=''):
-        """Update import log with final status"""
+        """
+        Update import log with final status and bump the data version
+        
+        Derived data still pending, e.g. after a load that only wrote
+        stations or regions, is refreshed first.
+        """
+        try:
+            self.refresh_derived()
+        except Exception as e:
+            if status != 'failed':
+                raise
+            logger.error(f"Error refreshing derived data after failed import: {str(e)}")
+        
         if self.import_log:
             self.import_log.status = status
             self.import_log.end_time = timezone.now()
             self.import_log.error_message = error_message
             self.import_log.save()
+            
+            # Even a failed import may have written some rows
+            bump_data_version(f"import {self.import_log.id} {status}")
+    
+    def refresh_derived(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Refresh rollups and other derived tables for the written partitions
+        
+        Station and region writes refresh the statistics snapshot, the
+        summaries and the written stations' profiles even when no
+        observation partition changed.
+        
+        Args:
+            full: Rebuild everything instead of the touched partitions
+            
+        Returns:
+            Dictionary with refresh statistics
+        """
+        partitions = None if full else self.touched_partitions
+        stations = self.touched_stations
+        regions_changed = self.regions_changed
+        self.touched_partitions = set()
+        self.touched_stations = set()
+        self.regions_changed = False
+        if partitions is not None and not partitions and not stations and not regions_changed:
+            return {}
+        return refresh_derived_data(partitions, stations=stations)
+    
+    def clear_data(self, vacuum: bool = True) -> Dict[str, Any]:
+        """
+        Remove all observations, stations and regions
+        
+        Uses set-based DELETE/TRUNCATE in dependency order instead of the
+        ORM deletion collector (see services.maintenance.fast_clear).
+        
+        Args:
+            vacuum: Reclaim disk space afterwards
+            
+        Returns:
+            Dictionary with cleared tables, mode used and elapsed seconds
+        """
+        logger.info("Clearing climate data...")
+        stats = fast_clear([ClimateObservation, WeatherStation, Region], vacuum=vacuum)
+        logger.info(f"Climate data cleared: {stats}")
+        return stats
     
     def sync_regions(self) -> Dict[str, Any]:
         """
@@ -89,6 +217,7 @@ class DataSyncService:
                     stats['created'] += 1
                 else:
                     stats['updated'] += 1
+                self.regions_changed = True
             
             logger.info(f"Region sync completed: {stats}")
             return stats
@@ -132,40 +261,26 @@ class DataSyncService:
             
             df = self.hive.execute_query_to_dataframe(query)
             
-            for _, row in df.iterrows():
+            station_rows = []
+            for row in df.to_dict('records'):
                 try:
-                    # Find region
-                    region_obj = Region.objects.filter(name__iexact=row['region']).first()
-                    if not region_obj:
-                        logger.warning(f"Region not found for station {row['station_id']}: {row['region']}")
-                        # Create a default region if needed
-                        region_obj, _ = Region.objects.get_or_create(
-                            code=row['region'].upper()[:10],
-                            defaults={'name': row['region']}
-                        )
-                    
-                    # Create or update station
-                    station, created = WeatherStation.objects.update_or_create(
-                        station_id=row['station_id'],
-                        defaults={
-                            'station_name': row['station_name'],
-                            'country': row['country'],
-                            'region': region_obj,
-                            'latitude': float(row['latitude']),
-                            'longitude': float(row['longitude']),
-                            'is_coastal': row['has_ocean_data'] is not None and row['has_ocean_data'] != ''
-                        }
-                    )
-                    
-                    if created:
-                        stats['created'] += 1
-                    else:
-                        stats['updated'] += 1
-                        
+                    station_rows.append({
+                        'station_id': row['station_id'],
+                        'station_name': row['station_name'],
+                        'country': row['country'],
+                        'region': row['region'],
+                        'latitude': float(row['latitude']),
+                        'longitude': float(row['longitude']),
+                        'is_coastal': row['has_ocean_data'] is not None and row['has_ocean_data'] != '',
+                    })
                 except Exception as e:
-                    logger.error(f"Error processing station {row['station_id']}: {str(e)}")
+                    logger.error(f"Error processing station {row.get('station_id')}: {str(e)}")
                     stats['errors'] += 1
             
+            upserted = self._bulk_upsert_stations(station_rows)
+            stats['created'] += upserted['created']
+            stats['updated'] += upserted['updated']
+            
             logger.info(f"Weather station sync completed: {stats}")
             return stats
             
@@ -175,7 +290,7 @@ class DataSyncService:
     
     def sync_climate_observations(self, table_name='africa_climate_observations', 
                                   start_date=None, end_date=None, 
-                                  limit=None) -> Dict[str, Any]:
+                                  limit=None, target_table=None) -> Dict[str, Any]:
         """
         Sync climate observations from Hive
         
@@ -184,6 +299,8 @@ class DataSyncService:
             start_date: Optional start date for filtering
             end_date: Optional end date for filtering
             limit: Optional limit on number of records
+            target_table: Table to write into (defaults to the live table;
+                full_sync passes a staging table)
             
         Returns:
             Dictionary with sync statistics
@@ -231,80 +348,28 @@ class DataSyncService:
             df = self.hive.execute_query_to_dataframe(query)
             logger.info(f"Retrieved {len(df)} observations from Hive")
             
-            # Process in batches
-            batch_size = 1000
-            observations_to_create = []
-            observations_to_update = []
+            # Convert to typed columns and upsert in batches
+            station_map = dict(WeatherStation.objects.values_list('station_id', 'id'))
+            before = self._count_rows(target_table)
+            upserted = 0
             
-            for _, row in df.iterrows():
+            for start in range(0, len(df), self.batch_size):
+                chunk = df.iloc[start:start + self.batch_size]
                 try:
-                    # Find station
-                    station = WeatherStation.objects.filter(station_id=row['station_id']).first()
-                    if not station:
-                        logger.warning(f"Station not found: {row['station_id']}")
-                        stats['skipped'] += 1
-                        continue
-                    
-                    # Prepare observation data
-                    obs_data = {
-                        'station': station,
-                        'observation_date': row['observation_date'],
-                        'year': int(row['year']),
-                        'month': int(row['month']),
-                        'temp_max': float(row['temp_max']) if row['temp_max'] is not None else None,
-                        'temp_min': float(row['temp_min']) if row['temp_min'] is not None else None,
-                        'temp_mean': float(row['temp_mean']) if row['temp_mean'] is not None else None,
-                        'precipitation': float(row['precipitation']) if row['precipitation'] is not None else None,
-                        'humidity': float(row['humidity']) if row['humidity'] is not None else None,
-                        'sea_surface_temp': float(row['sea_surface_temp']) if row['sea_surface_temp'] is not None else None,
-                        'ocean_salinity': float(row['ocean_salinity']) if row['ocean_salinity'] is not None else None,
-                    }
-                    
-                    # Check if observation exists
-                    existing = ClimateObservation.objects.filter(
-                        station=station,
-                        observation_date=row['observation_date']
-                    ).first()
-                    
-                    if existing:
-                        # Update existing
-                        for key, value in obs_data.items():
-                            if key != 'station':  # Don't update station FK
-                                setattr(existing, key, value)
-                        observations_to_update.append(existing)
-                        stats['updated'] += 1
-                    else:
-                        # Create new
-                        observations_to_create.append(ClimateObservation(**obs_data))
-                        stats['created'] += 1
-                    
-                    # Batch insert/update
-                    if len(observations_to_create) >= batch_size:
-                        ClimateObservation.objects.bulk_create(observations_to_create, ignore_conflicts=True)
-                        observations_to_create = []
-                    
-                    if len(observations_to_update) >= batch_size:
-                        ClimateObservation.objects.bulk_update(
-                            observations_to_update,
-                            ['temp_max', 'temp_min', 'temp_mean', 'precipitation', 
-                             'humidity', 'sea_surface_temp', 'ocean_salinity']
-                        )
-                        observations_to_update = []
-                        
+                    columns = self._dataframe_columns(chunk)
                 except Exception as e:
-                    logger.error(f"Error processing observation: {str(e)}")
-                    stats['errors'] += 1
+                    logger.error(f"Error processing observations {start}-{start + len(chunk)}: {str(e)}")
+                    stats['errors'] += len(chunk)
+                    continue
+                rows = self._observation_rows(columns, station_map, stats)
+                upserted += self._insert_observation_rows(rows, table=target_table, update_existing=True)
             
-            # Final batch insert/update
-            if observations_to_create:
-                ClimateObservation.objects.bulk_create(observations_to_create, ignore_conflicts=True)
+            stats['created'] = self._count_rows(target_table) - before
+            stats['updated'] = upserted - stats['created']
             
-            if observations_to_update:
-                ClimateObservation.objects.bulk_update(
-                    observations_to_update,
-                    ['temp_max', 'temp_min', 'temp_mean', 'precipitation', 
-                     'humidity', 'sea_surface_temp', 'ocean_salinity']
-                )
+            # Staged syncs refresh after the swap
+            if target_table is None:
+                self.refresh_derived()
             
             logger.info(f"Climate observation sync completed: {stats}")
             return stats
@@ -313,12 +378,15 @@ class DataSyncService:
             logger.error(f"Error syncing climate observations: {str(e)}")
             raise
     
-    def full_sync(self, limit=None) -> Dict[str, Any]:
+    def full_sync(self, limit=None, clear=False) -> Dict[str, Any]:
         """
         Perform full data synchronization
         
         Args:
             limit: Optional limit on observations
+            clear: Clear existing climate data before syncing. With
+                STAGED_LOADS only observations are replaced; stations and
+                regions missing from Hive are kept
             
         Returns:
             Dictionary with overall statistics
@@ -332,7 +400,16 @@ class DataSyncService:
             'success': False
         }
         
+        staged = getattr(settings, 'STAGED_LOADS', True)
+        
         try:
+            # Only clear when there is a source to reload from. Staged loads
+            # replace observations on swap and upsert stations/regions instead
+            if clear and self.hive_available and not staged:
+                overall_stats['cleared'] = self.clear_data()
+            elif clear and not self.hive_available:
+                logger.warning("Hive not available - keeping existing data instead of clearing")
+            
             # Sync regions
             overall_stats['regions'] = self.sync_regions()
             
@@ -340,7 +417,23 @@ class DataSyncService:
             overall_stats['stations'] = self.sync_weather_stations()
             
             # Sync climate observations
-            overall_stats['observations'] = self.sync_climate_observations(limit=limit)
+            if staged and self.hive_available:
+                # API writes made between the copy and the swap would be lost
+                with block_writes('staged Hive sync'):
+                    with StagingTable(ClimateObservation) as staging:
+                        if not clear:
+                            staging.copy_live_rows()
+                        overall_stats['observations'] = self.sync_climate_observations(
+                            limit=limit, target_table=staging.db_table
+                        )
+                        staging.build_indexes()
+                        staging.swap()
+                    self.refresh_derived(full=clear)
+            else:
+                overall_stats['observations'] = self.sync_climate_observations(limit=limit)
+            
+            # Station and region updates when no observations were synced
+            self.refresh_derived()
             
             overall_stats['success'] = True
             overall_stats['hive_available'] = self.hive_available
@@ -387,52 +480,73 @@ class DataSyncService:
         # Load portfolio observations
         observations_file = data_dir / 'portfolio_observations.csv'
         if observations_file.exists():
-            stats['observations'] = self._load_observations_from_csv(observations_file)
+            if getattr(settings, 'STAGED_LOADS', True):
+                stats['observations'] = self.load_observations_staged(observations_file)
+            else:
+                stats['observations'] = self._load_observations_from_csv(observations_file)
         else:
             logger.warning(f"Observations file not found: {observations_file}")
+        self.refresh_derived()
         
         stats['success'] = stats['stations'].get('errors', 0) == 0 and stats['observations'].get('errors', 0) == 0
         return stats
     
+    def load_observations_staged(self, csv_path: Path, replace: bool = False, **kwargs) -> Dict[str, Any]:
+        """
+        Load observations from CSV through a staging table and swap it in
+        
+        Readers keep seeing the previous observations until the load is
+        complete; the swap itself is a single short transaction. Guarded
+        writes (see data_version.guard_writes) are refused until it ends.
+        
+        Args:
+            csv_path: Path to the observations CSV
+            replace: Start from an empty staging table instead of a copy
+                of the current observations
+            **kwargs: Passed on to _load_observations_from_csv
+            
+        Returns:
+            Dictionary with load statistics
+        """
+        # API writes made between the copy and the swap would be lost
+        with block_writes(f'staged load of {csv_path.name}'):
+            with StagingTable(ClimateObservation) as staging:
+                if not replace:
+                    staging.copy_live_rows()
+                stats = self._load_observations_from_csv(csv_path, table=staging.db_table, **kwargs)
+                staging.build_indexes()
+                staging.swap()
+            self.refresh_derived(full=replace)
+        return stats
+    
     def _load_stations_from_csv(self, csv_path: Path) -> Dict[str, Any]:
         """Load weather stations from CSV file"""
         stats = {'created': 0, 'updated': 0, 'errors': 0}
         
         try:
+            station_rows = []
             with open(csv_path, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
                 for row in reader:
                     try:
-                        # Get or create region
-                        region_name = row.get('region', 'Unknown')
-                        region, _ = Region.objects.get_or_create(
-                            code=region_name.upper()[:10].replace(' ', '_'),
-                            defaults={'name': region_name}
-                        )
-                        
-                        # Create or update station
-                        station, created = WeatherStation.objects.update_or_create(
-                            station_id=row['station_id'],
-                            defaults={
-                                'station_name': row.get('station_name', row['station_id']),
-                                'country': row.get('country', 'Unknown'),
-                                'region': region,
-                                'latitude': float(row.get('latitude', 0)),
-                                'longitude': float(row.get('longitude', 0)),
-                                'elevation': float(row.get('elevation', 0)) if row.get('elevation') else None,
-                                'is_coastal': row.get('is_coastal', '').lower() in ('true', '1', 'yes'),
-                                'is_active': True
-                            }
-                        )
-                        
-                        if created:
-                            stats['created'] += 1
-                        else:
-                            stats['updated'] += 1
-                            
+                        station_rows.append({
+                            'station_id': row['station_id'],
+                            'station_name': row.get('station_name', row['station_id']),
+                            'country': row.get('country', 'Unknown'),
+                            'region': row.get('region', 'Unknown'),
+                            'latitude': float(row.get('latitude', 0)),
+                            'longitude': float(row.get('longitude', 0)),
+                            'elevation': float(row.get('elevation', 0)) if row.get('elevation') else None,
+                            'is_coastal': row.get('is_coastal', '').lower() in ('true', '1', 'yes'),
+                            'is_active': True,
+                        })
                     except Exception as e:
                         logger.error(f"Error loading station {row.get('station_id')}: {e}")
                         stats['errors'] += 1
+            
+            upserted = self._bulk_upsert_stations(station_rows)
+            stats['created'] += upserted['created']
+            stats['updated'] += upserted['updated']
         
         except Exception as e:
             logger.error(f"Error reading stations CSV: {e}")
@@ -441,81 +555,204 @@ class DataSyncService:
         logger.info(f"Loaded stations from CSV: {stats}")
         return stats
     
-    def _load_observations_from_csv(self, csv_path: Path, limit: int = None) -> Dict[str, Any]:
-        """Load climate observations from CSV file"""
+    def _resolve_regions(self, region_names) -> Dict[str, Region]:
+        """
+        Map raw region names to Region rows
+        
+        Matches on region name first, then on the derived region code, so
+        both 'East' and 'East Africa' resolve to the EAST region. Regions
+        that do not exist yet are created in a single statement.
+        
+        Args:
+            region_names: Iterable of region names as found in the source data
+            
+        Returns:
+            Dictionary mapping each raw name to its Region
+        """
+        def region_code(name):
+            return name.upper()[:10].replace(' ', '_')
+        
+        lookup = {}
+        for region in Region.objects.all():
+            lookup[region.name.lower()] = region
+            lookup.setdefault(region.code.lower(), region)
+        
+        names = set(region_names)
+        resolved = {}
+        missing = {}
+        for name in names:
+            region = lookup.get(name.lower()) or lookup.get(region_code(name).lower())
+            if region:
+                resolved[name] = region
+            else:
+                missing.setdefault(region_code(name), name)
+        
+        if missing:
+            logger.warning(f"Creating regions not found in database: {sorted(missing.values())}")
+            Region.objects.bulk_create(
+                [Region(code=code, name=name) for code, name in missing.items()],
+                ignore_conflicts=True
+            )
+            self.regions_changed = True
+            created = Region.objects.in_bulk(list(missing), field_name='code')
+            for name in names - set(resolved):
+                resolved[name] = created[region_code(name)]
+        
+        return resolved
+    
+    def _bulk_upsert_stations(self, station_rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Create or update weather stations keyed on station_id
+        
+        Regions are resolved once, existing station ids are read in one
+        pass and all rows are written with a bulk INSERT ... ON CONFLICT
+        DO UPDATE inside a single transaction. If a station_id appears more
+        than once, the last row wins.
+        
+        Args:
+            station_rows: Station field dicts; 'region' holds the raw region name
+            
+        Returns:
+            Dictionary with true 'created' and 'updated' counts
+        """
+        rows = {row['station_id']: row for row in station_rows}
+        if not rows:
+            return {'created': 0, 'updated': 0}
+        
+        with transaction.atomic():
+            regions = self._resolve_regions(row['region'] or 'Unknown' for row in rows.values())
+            
+            station_ids = list(rows)
+            existing = set()
+            for i in range(0, len(station_ids), 500):
+                existing.update(WeatherStation.objects.filter(
+                    station_id__in=station_ids[i:i + 500]
+                ).values_list('station_id', flat=True))
+            
+            stations = [
+                WeatherStation(**{**row, 'region': regions[row['region'] or 'Unknown']})
+                for row in rows.values()
+            ]
+            update_fields = sorted(
+                {field for row in rows.values() for field in row if field != 'station_id'}
+                | {'updated_at'}
+            )
+            WeatherStation.objects.bulk_create(
+                stations,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=['station_id'],
+                update_fields=update_fields,
+            )
+            for i in range(0, len(station_ids), 500):
+                self.touched_stations.update(WeatherStation.objects.filter(
+                    station_id__in=station_ids[i:i + 500]
+                ).values_list('pk', flat=True))
+        
+        return {'created': len(rows) - len(existing), 'updated': len(existing)}
+    
+    def _load_observations_from_csv(self, csv_path: Path, limit: int = None,
+                                    workers: int = None, shard_size: int = None,
+                                    table: str = None) -> Dict[str, Any]:
+        """
+        Load climate observations from CSV file
+
+        Parsing is spread over a process pool (see services.csv_loader);
+        this process is the single writer for the parsed column batches.
+
+        Args:
+            csv_path: Path to the observations CSV
+            limit: Optional limit on number of records
+            workers: Parser processes (defaults to settings.CSV_LOAD_WORKERS)
+            shard_size: Bytes per shard (defaults to settings.CSV_LOAD_SHARD_SIZE)
+            table: Table to write into (defaults to the live table)
+        """
         stats = {'created': 0, 'updated': 0, 'errors': 0, 'skipped': 0}
-        observations_to_create = []
-        batch_size = 1000
+        workers = workers or getattr(settings, 'CSV_LOAD_WORKERS', 1)
+        shard_size = shard_size or getattr(settings, 'CSV_LOAD_SHARD_SIZE', DEFAULT_SHARD_SIZE)
         count = 0
         
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if limit and count >= limit:
-                        break
-                    
-                    try:
-                        # Find station
-                        station = WeatherStation.objects.filter(station_id=row['station_id']).first()
-                        if not station:
-                            stats['skipped'] += 1
-                            continue
-                        
-                        # Parse date
-                        obs_date = row.get('observation_date', row.get('date_col', ''))
-                        if not obs_date:
-                            stats['skipped'] += 1
-                            continue
-                        
-                        # Parse year and month
-                        try:
-                            date_obj = datetime.strptime(obs_date.split()[0], '%Y-%m-%d')
-                            year = int(row.get('year', date_obj.year))
-                            month = int(row.get('month', date_obj.month))
-                        except:
-                            year = int(row.get('year', 2024))
-                            month = int(row.get('month', 1))
-                        
-                        # Create observation object
-                        obs = ClimateObservation(
-                            station=station,
-                            observation_date=obs_date.split()[0],
-                            year=year,
-                            month=month,
-                            temp_max=float(row['temp_max']) if row.get('temp_max') else None,
-                            temp_min=float(row['temp_min']) if row.get('temp_min') else None,
-                            temp_mean=float(row['temp_mean']) if row.get('temp_mean') else None,
-                            precipitation=float(row['precipitation']) if row.get('precipitation') else None,
-                            humidity=float(row['humidity']) if row.get('humidity') else None,
-                            sea_surface_temp=float(row['sea_surface_temp']) if row.get('sea_surface_temp') else None,
-                            ocean_salinity=float(row['ocean_salinity']) if row.get('ocean_salinity') else None,
-                        )
-                        observations_to_create.append(obs)
-                        count += 1
-                        
-                        # Batch insert
-                        if len(observations_to_create) >= batch_size:
-                            ClimateObservation.objects.bulk_create(observations_to_create, ignore_conflicts=True)
-                            stats['created'] += len(observations_to_create)
-                            observations_to_create = []
-                            
-                    except Exception as e:
-                        logger.error(f"Error loading observation: {e}")
-                        stats['errors'] += 1
+            # Resolve every station once instead of querying per row
+            station_map = dict(WeatherStation.objects.values_list('station_id', 'id'))
             
-            # Final batch
-            if observations_to_create:
-                ClimateObservation.objects.bulk_create(observations_to_create, ignore_conflicts=True)
-                stats['created'] += len(observations_to_create)
+            for batch in iter_observation_batches(csv_path, workers=workers, shard_size=shard_size):
+                stats['skipped'] += batch['skipped']
+                stats['errors'] += batch['errors']
+                
+                rows = self._observation_rows(batch['columns'], station_map, stats)
+                if limit and count + len(rows) > limit:
+                    rows = rows[:limit - count]
+                
+                stats['created'] += self._insert_observation_rows(rows, table=table)
+                count += len(rows)
+                
+                if limit and count >= limit:
+                    break
         
         except Exception as e:
             logger.error(f"Error reading observations CSV: {e}")
             stats['errors'] += 1
         
+        # Staged loads refresh after the swap
+        if table is None:
+            self.refresh_derived()
+        
         logger.info(f"Loaded observations from CSV: {stats}")
         return stats
     
+    def _observation_rows(self, columns: Dict[str, list], station_map: Dict[str, int],
+                          stats: Dict[str, Any]) -> List[tuple]:
+        """
+        Turn a typed column batch into insert parameter tuples
+        
+        Rows for unknown stations are counted as skipped. Tuples follow
+        OBSERVATION_INSERT_FIELDS.
+        """
+        adapt_date = connection.ops.adapt_datefield_value
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        
+        rows = []
+        for station_id, obs_date, *values in zip(*(columns[name] for name in OBSERVATION_BATCH_COLUMNS)):
+            station_pk = station_map.get(station_id)
+            if station_pk is None:
+                stats['skipped'] += 1
+                continue
+            rows.append((station_pk, adapt_date(obs_date), *values, 'good', now, now))
+        return rows
+    
+    def _dataframe_columns(self, df) -> Dict[str, list]:
+        """Convert a Hive result DataFrame into typed observation columns"""
+        columns = {
+            'station_id': df['station_id'].astype(str).tolist(),
+            'observation_date': pd.to_datetime(df['observation_date']).dt.date.tolist(),
+            'year': df['year'].astype(int).tolist(),
+            'month': df['month'].astype(int).tolist(),
+        }
+        for name in OBSERVATION_BATCH_COLUMNS[4:]:
+            values = pd.to_numeric(df[name], errors='coerce')
+            columns[name] = [None if pd.isna(v) else float(v) for v in values]
+        return columns
+    
+    def _count_rows(self, table: str = None) -> int:
+        """Count rows in an observations table (live table by default)"""
+        table = table or ClimateObservation._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+            return cursor.fetchone()[0]
+    
+    def _insert_observation_rows(self, rows: List[tuple], table: str = None,
+                                 update_existing: bool = False) -> int:
+        """
+        Insert observation tuples (see insert_observation_rows) and record
+        their partitions for the rollup refresh
+        """
+        written = insert_observation_rows(rows, table=table, update_existing=update_existing,
+                                          batch_size=self.batch_size)
+        # (station, year, month) partitions for the rollup refresh
+        self.touched_partitions.update((row[0], row[2], row[3]) for row in rows)
+        return written
+    
     def get_status(self) -> Dict[str, Any]:
         """
         Get current sync service status
@@ -0,0 +1,196 @@
+"""
+Data Version Service
+A single version token that changes whenever climate data changes, and
+a cache decorator that stores results under the current version. Old
+versions are never invalidated explicitly; their keys simply stop being
+read and expire from the cache.
+
+Staged loads also take a write lock here: rows written to the live table
+between copying it and swapping in the new generation would be lost, so
+guarded writes are refused while the lock is held.
+"""
+import contextlib
+import functools
+import hashlib
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from hive_climate.models import DataVersion
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = 'hive_climate'
+
+
+def get_data_version() -> int:
+    """Current data version (0 before the first bump)"""
+    version = DataVersion.objects.filter(pk=1).values_list('version', flat=True).first()
+    return version or 0
+
+
+def _version_row(*fields) -> tuple:
+    """Fields of the version row, creating it first if it is missing"""
+    row = DataVersion.objects.filter(pk=1).values_list(*fields).first()
+    if row is None:
+        DataVersion.objects.get_or_create(pk=1)
+        row = DataVersion.objects.filter(pk=1).values_list(*fields).first()
+    return row
+
+
+def version_token(version: int, instance: uuid.UUID) -> str:
+    """
+    Data version qualified by the database instance
+
+    Versions restart at 0 in every new database, so the token keeps cache
+    entries and ETags of one database from matching another's.
+    """
+    return f"{instance.hex[:12]}.{version}"
+
+
+def get_data_token() -> str:
+    """Token for the current data version (see version_token)"""
+    return version_token(*_version_row('version', 'instance'))
+
+
+def get_data_state() -> Tuple[str, Optional[datetime]]:
+    """(current data version token, time of the last bump)"""
+    version, instance, changed_at = _version_row('version', 'instance', 'changed_at')
+    return version_token(version, instance), changed_at if version else None
+
+
+def bump_data_version(reason: str = '', warm_up: bool = True, background: bool = False) -> int:
+    """
+    Mark climate data as changed
+
+    Args:
+        reason: Short description stored with the version, e.g. 'import 12'
+        warm_up: Pre-populate the dashboard cache for the new version
+        background: Run the warm-up in a daemon thread instead of inline
+
+    Returns:
+        The new version number
+    """
+    with transaction.atomic():
+        updated = DataVersion.objects.filter(pk=1).update(
+            version=F('version') + 1, reason=reason[:100], changed_at=timezone.now()
+        )
+        if not updated:
+            DataVersion.objects.get_or_create(pk=1, defaults={'version': 1, 'reason': reason[:100]})
+    version = get_data_version()
+    logger.info(f"Data version bumped to {version} ({reason})")
+
+    if warm_up and getattr(settings, 'DASHBOARD_CACHE_WARM_UP', True):
+        if background:
+            transaction.on_commit(
+                lambda: threading.Thread(target=_warm_up, args=(version,), daemon=True).start()
+            )
+        else:
+            transaction.on_commit(lambda: _warm_up(version))
+    return version
+
+
+class WritesBlocked(Exception):
+    """Raised by guard_writes while a staged load holds the write lock"""
+
+    def __init__(self, until: datetime):
+        super().__init__(f"Writes are blocked by a data load until {until.isoformat()}")
+        self.until = until
+
+
+@contextlib.contextmanager
+def block_writes(reason: str = ''):
+    """
+    Hold the write lock for the duration of the block
+
+    The lock expires after settings.STAGED_LOAD_LOCK_TIMEOUT seconds so a
+    crashed load cannot block writes forever.
+    """
+    timeout = getattr(settings, 'STAGED_LOAD_LOCK_TIMEOUT', 6 * 60 * 60)
+    until = timezone.now() + timedelta(seconds=timeout)
+    with transaction.atomic():
+        DataVersion.objects.get_or_create(pk=1)
+        # Waits for guarded writes in flight, so the load sees their rows
+        DataVersion.objects.filter(pk=1).update(writes_blocked_until=until)
+    logger.info(f"Writes blocked for {reason or 'data load'}")
+    try:
+        yield
+    finally:
+        DataVersion.objects.filter(pk=1).update(writes_blocked_until=None)
+        logger.info(f"Writes unblocked after {reason or 'data load'}")
+
+
+@contextlib.contextmanager
+def guard_writes():
+    """
+    Run a write in a transaction that fails fast while the write lock is held
+
+    The lock row is read FOR UPDATE, so a load cannot take the lock until
+    the write has committed.
+
+    Raises:
+        WritesBlocked: A staged load is running
+    """
+    with transaction.atomic():
+        until = DataVersion.objects.select_for_update().filter(pk=1).values_list(
+            'writes_blocked_until', flat=True
+        ).first()
+        if until is not None and until > timezone.now():
+            raise WritesBlocked(until)
+        yield
+
+
+def _warm_up(version: int):
+    """Populate the dashboard cache, skipping if the version moved on"""
+    from hive_climate.views import warm_dashboard_cache
+
+    if get_data_version() != version:
+        return
+    try:
+        seconds = warm_dashboard_cache()
+        logger.info(f"Warmed dashboard cache for data version {version} in {seconds}s")
+    except Exception as e:
+        logger.error(f"Dashboard cache warm-up failed: {str(e)}")
+
+
+def versioned_cache_key(name: str, *args, **kwargs) -> str:
+    """Cache key for a named result under the current data version"""
+    key = f"{CACHE_KEY_PREFIX}:{name}:v{get_data_token()}"
+    if args or kwargs:
+        arguments = repr((args, sorted(kwargs.items())))
+        key += ':' + hashlib.md5(arguments.encode('utf-8')).hexdigest()
+    return key
+
+
+def versioned_cache(name: str, timeout: int = None) -> Callable:
+    """
+    Cache a function's result under the current data version
+
+    Arguments are part of the key, so they must have a stable repr.
+    Results must be picklable.
+
+    Args:
+        name: Cache key name for the function
+        timeout: Seconds to keep entries (defaults to settings.DATA_CACHE_TIMEOUT)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = versioned_cache_key(name, *args, **kwargs)
+            result = cache.get(key)
+            if result is None:
+                result = func(*args, **kwargs)
+                cache.set(key, result, timeout or getattr(settings, 'DATA_CACHE_TIMEOUT', 86400))
+            return result
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
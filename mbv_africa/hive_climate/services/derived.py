@@ -0,0 +1,73 @@
+"""
+Derived Data Service
+Single entry point that brings every table derived from ClimateObservation
+up to date after observations were loaded, synced or edited
+"""
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+from django.db import transaction
+
+from hive_climate.services.climatology import refresh_climatology
+from hive_climate.services.data_version import bump_data_version
+from hive_climate.services.profiles import refresh_profiles
+from hive_climate.services.rollups import Partition, refresh_rollups
+from hive_climate.services.statistics import refresh_statistics
+from hive_climate.services.summaries import refresh_summaries
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_derived_data(partitions: Optional[Iterable[Partition]] = None,
+                         region_partitions: Iterable[Partition] = (),
+                         stations: Iterable[int] = ()) -> Dict[str, Any]:
+    """
+    Refresh derived tables after observations changed
+    
+    Runs in one transaction, so readers never see rollups and statistics
+    from different states of the data.
+
+    Args:
+        partitions: (station pk, year, month) tuples that changed, or None
+            after a full reload
+        region_partitions: Extra (region pk, year, month) tuples affected
+            by station moves or deletions
+        stations: Pks of stations whose own fields were written; their
+            summaries and profiles are rebuilt as well
+
+    Returns:
+        Dictionary with refresh statistics per derived table
+    """
+    station_pks = None
+    if partitions is not None:
+        partitions = set(partitions)
+        station_pks = {station_pk for station_pk, _, _ in partitions} | set(stations)
+    with transaction.atomic():
+        rollup_stats = refresh_rollups(partitions, region_partitions)
+        climatology_stats = refresh_climatology(partitions, region_partitions)
+        summary_stats = refresh_summaries(station_pks)
+        profile_stats = refresh_profiles(station_pks)
+        snapshot = refresh_statistics(full=partitions is None)
+    return {
+        'rollups': rollup_stats,
+        'climatology': climatology_stats,
+        'summaries': summary_stats,
+        'profiles': profile_stats,
+        'statistics': {
+            'observations': snapshot.observation_count,
+            'stations': snapshot.station_count,
+        },
+    }
+
+
+def data_changed(partitions: Iterable[Partition] = (), region_partitions: Iterable[Partition] = (),
+                 reason: str = 'api write') -> Dict[str, Any]:
+    """
+    Refresh derived tables and bump the data version after a single write
+
+    Used by the API write paths. Bulk loads refresh as they go and bump
+    the version once when their import log finishes.
+    """
+    stats = refresh_derived_data(partitions, region_partitions)
+    stats['version'] = bump_data_version(reason, background=True)
+    return stats
@@ -0,0 +1,172 @@
+"""
+Downsampling Service
+Reduces station and region time series to a fixed point budget so chart
+payloads stay the same size however long the history is. Supports
+Largest-Triangle-Three-Buckets, which keeps the visual shape, and min/max
+bucketing, which keeps every extreme.
+"""
+import logging
+from datetime import date
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from hive_climate.models import (
+    ClimateObservation, Region, RegionMonthlyRollup, StationMonthlyRollup, WeatherStation,
+    ROLLUP_MEASURES,
+)
+from hive_climate.services.data_version import versioned_cache
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('lttb', 'minmax')
+RESOLUTIONS = ('daily', 'monthly')
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets
+
+    Keeps the first and last point and, from each of threshold - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket.
+
+    Args:
+        x: Increasing x values
+        y: Values at x
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted indices of the kept points
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket i spans [edges[i], edges[i + 1]) over the points between first and last
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    x_means = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes
+    y_means = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes
+    # The bucket after the last one is the final point
+    x_next = np.append(x_means[1:], x[n - 1])
+    y_next = np.append(y_means[1:], y[n - 1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - x_next[i]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (y_next[i] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Min/max bucketing
+
+    Splits the series into threshold / 2 equal buckets and keeps the
+    minimum and maximum of each.
+
+    Args:
+        y: Series values
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted indices of the kept points
+    """
+    n = len(y)
+    buckets = threshold // 2
+    if threshold >= n or buckets < 1:
+        return np.arange(n)
+
+    bucket_ids = np.arange(n) * buckets // n
+    # Sort by bucket, then value: each bucket's first entry is its minimum, last its maximum
+    order = np.lexsort((y, bucket_ids))
+    starts = np.searchsorted(bucket_ids[order], np.arange(buckets))
+    ends = np.append(starts[1:], n) - 1
+    return np.unique(np.concatenate([order[starts], order[ends]]))
+
+
+def load_series(scope: str, key: str, measure: str, resolution: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Full time series of a measure for one station or region
+
+    Args:
+        scope: 'station' or 'region'
+        key: Station ID or region code
+        measure: One of ROLLUP_MEASURES
+        resolution: 'daily' observations (stations only) or 'monthly' averages
+
+    Returns:
+        (dates, values) arrays; dates are datetime.date objects
+    """
+    if scope == 'station':
+        station = WeatherStation.objects.get(station_id=key)
+        if resolution == 'daily':
+            rows = list(ClimateObservation.objects.filter(
+                station=station, **{f'{measure}__isnull': False}
+            ).order_by('observation_date').values_list('observation_date', measure))
+            dates = np.array([row[0] for row in rows], dtype=object)
+            values = np.array([row[1] for row in rows], dtype=float)
+            return dates, values
+        rollups = StationMonthlyRollup.objects.filter(station=station)
+    else:
+        rollups = RegionMonthlyRollup.objects.filter(region=Region.objects.get(code=key))
+
+    rows = list(rollups.filter(**{f'{measure}_count__gt': 0}).order_by('year', 'month').values_list(
+        'year', 'month', f'{measure}_sum', f'{measure}_count'
+    ))
+    dates = np.array([date(year, month, 1) for year, month, _, _ in rows], dtype=object)
+    values = np.array([total / count for _, _, total, count in rows], dtype=float)
+    return dates, values
+
+
+@versioned_cache('downsampled_series')
+def get_downsampled_series(scope: str, key: str, measure: str, points: int,
+                           method: str = 'lttb', resolution: str = 'daily') -> Dict[str, Any]:
+    """
+    Time series reduced to at most `points` points
+
+    Args:
+        scope: 'station' or 'region'
+        key: Station ID or region code
+        measure: One of ROLLUP_MEASURES
+        points: Point budget
+        method: 'lttb' or 'minmax'
+        resolution: 'daily' or 'monthly'; regions are always monthly
+
+    Returns:
+        Dictionary with the series description, original length and the
+        kept dates and values
+    """
+    if measure not in ROLLUP_MEASURES:
+        raise ValueError(f"Unknown measure: {measure}")
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    if scope == 'region':
+        resolution = 'monthly'
+
+    dates, values = load_series(scope, key, measure, resolution)
+    if method == 'lttb':
+        x = np.array([d.toordinal() for d in dates], dtype=float)
+        kept = lttb(x, values, points)
+    else:
+        kept = minmax(values, points)
+
+    return {
+        scope: key,
+        'measure': measure,
+        'method': method,
+        'resolution': resolution,
+        'total_points': len(values),
+        'points': len(kept),
+        'dates': [d.isoformat() for d in dates[kept]],
+        'values': [round(float(v), 2) for v in values[kept]],
+    }
@@ -0,0 +1,247 @@
+"""
+Export Service
+Streams filtered observations as CSV, NDJSON, Parquet or an Arrow IPC
+stream. Rows are read with values_list().iterator() in chunks and encoded
+chunk by chunk, so memory use does not depend on the size of the export.
+"""
+import csv
+import json
+import logging
+from datetime import date
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _pyarrow_available = True
+except ImportError:
+    _pyarrow_available = False
+
+# (output name, ORM path, CSV header, Arrow type name)
+EXPORT_FIELDS = [
+    ('station_id', 'station__station_id', 'Station ID', 'string'),
+    ('station_name', 'station__station_name', 'Station Name', 'string'),
+    ('country', 'station__country', 'Country', 'string'),
+    ('region', 'station__region__name', 'Region', 'string'),
+    ('observation_date', 'observation_date', 'Date', 'date32'),
+    ('temp_max', 'temp_max', 'Temp Max', 'float64'),
+    ('temp_min', 'temp_min', 'Temp Min', 'float64'),
+    ('temp_mean', 'temp_mean', 'Temp Mean', 'float64'),
+    ('precipitation', 'precipitation', 'Precipitation', 'float64'),
+    ('humidity', 'humidity', 'Humidity', 'float64'),
+    ('sea_surface_temp', 'sea_surface_temp', 'SST', 'float64'),
+    ('ocean_salinity', 'ocean_salinity', 'Salinity', 'float64'),
+]
+
+EXPORT_NAMES = [field[0] for field in EXPORT_FIELDS]
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+# Formats that need pyarrow
+ARROW_FORMATS = ('parquet', 'arrow')
+
+# Model field internal type -> Arrow type name, for values() rows
+ARROW_FIELD_TYPES = {
+    'AutoField': 'int64',
+    'BigAutoField': 'int64',
+    'IntegerField': 'int64',
+    'BigIntegerField': 'int64',
+    'PositiveIntegerField': 'int64',
+    'PositiveBigIntegerField': 'int64',
+    'SmallIntegerField': 'int64',
+    'ForeignKey': 'int64',
+    'FloatField': 'float64',
+    'BooleanField': 'bool_',
+    'CharField': 'string',
+    'TextField': 'string',
+    'DateField': 'date32',
+}
+
+
+def is_parquet_available() -> bool:
+    """Whether pyarrow is installed (Parquet and Arrow formats)"""
+    return _pyarrow_available
+
+
+def export_schema():
+    return pa.schema([(name, getattr(pa, type_name)()) for name, _, _, type_name in EXPORT_FIELDS])
+
+
+def rows_schema(rows):
+    """
+    Arrow schema for a serializers.ValuesRows spec
+
+    Timestamps are microseconds in UTC; annotations without a model
+    field are strings.
+    """
+    fields = []
+    for name, path in rows.fields:
+        internal_type = rows.internal_types[path]
+        if internal_type == 'DateTimeField':
+            arrow_type = pa.timestamp('us', tz='UTC')
+        else:
+            arrow_type = getattr(pa, ARROW_FIELD_TYPES.get(internal_type, 'string'))()
+        fields.append((name, arrow_type))
+    return pa.schema(fields)
+
+
+def _record_batch(schema, columns):
+    return pa.record_batch(
+        [pa.array(column, type=schema.field(i).type) for i, column in enumerate(columns)],
+        schema=schema,
+    )
+
+
+def export_chunk_size() -> int:
+    """Rows fetched per database round trip and per Parquet row group"""
+    return getattr(settings, 'EXPORT_CHUNK_SIZE', 10000)
+
+
+def _batched(iterator: Iterator, size: int) -> Iterator[List]:
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_chunks(queryset, chunk_size: int = None) -> Iterator[List[Tuple]]:
+    """Export rows of a ClimateObservation queryset, in lists of chunk_size tuples"""
+    chunk_size = chunk_size or export_chunk_size()
+    paths = [field[1] for field in EXPORT_FIELDS]
+    return _batched(queryset.values_list(*paths).iterator(chunk_size=chunk_size), chunk_size)
+
+
+def iter_objects(queryset, chunk_size: int = None) -> Iterator[List]:
+    """Items of a queryset (instances or values() rows), in lists of chunk_size"""
+    chunk_size = chunk_size or export_chunk_size()
+    return _batched(queryset.iterator(chunk_size=chunk_size), chunk_size)
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(chunks: Iterable[List[Tuple]]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow([field[2] for field in EXPORT_FIELDS])
+    for chunk in chunks:
+        yield ''.join(writer.writerow(row) for row in chunk)
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def stream_ndjson(chunks: Iterable[List[Tuple]]) -> Iterator[str]:
+    for chunk in chunks:
+        yield ''.join(
+            json.dumps(dict(zip(EXPORT_NAMES, row)), default=_json_default) + '\n'
+            for row in chunk
+        )
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back between row groups"""
+
+    def __init__(self):
+        self.parts = []
+        self.closed = False
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def stream_parquet(chunks: Iterable[List[Tuple]]) -> Iterator[bytes]:
+    """Parquet file with one row group per chunk"""
+    if not _pyarrow_available:
+        raise RuntimeError("Parquet export requires pyarrow")
+
+    schema = export_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    try:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_batches([_record_batch(schema, list(zip(*chunk)))]))
+            yield sink.drain()
+    finally:
+        writer.close()
+    # Footer
+    yield sink.drain()
+
+
+def stream_arrow(schema, column_chunks: Iterable[List[List]]) -> Iterator[bytes]:
+    """
+    Arrow IPC stream with one record batch per chunk
+
+    Args:
+        schema: Arrow schema of the columns
+        column_chunks: Chunks as lists of columns
+    """
+    if not _pyarrow_available:
+        raise RuntimeError("Arrow output requires pyarrow")
+
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    try:
+        for columns in column_chunks:
+            writer.write_batch(_record_batch(schema, columns))
+            yield sink.drain()
+    finally:
+        writer.close()
+    # End-of-stream marker
+    yield sink.drain()
+
+
+def stream_rows_arrow(rows, chunks: Iterable[List[dict]]) -> Iterator[bytes]:
+    """Arrow IPC stream of values() rows of a serializers.ValuesRows spec"""
+    if not _pyarrow_available:
+        raise RuntimeError("Arrow output requires pyarrow")
+    paths = [path for _, path in rows.fields]
+    return stream_arrow(
+        rows_schema(rows),
+        ([[row[path] for row in chunk] for path in paths] for chunk in chunks),
+    )
+
+
+def stream_export(queryset, export_format: str) -> Iterator:
+    """Encoded export of a ClimateObservation queryset in csv, ndjson, parquet or arrow"""
+    if export_format in ARROW_FORMATS and not _pyarrow_available:
+        raise RuntimeError(f"{export_format} export requires pyarrow")
+    chunks = iter_chunks(queryset)
+    if export_format == 'csv':
+        return stream_csv(chunks)
+    if export_format == 'ndjson':
+        return stream_ndjson(chunks)
+    if export_format == 'parquet':
+        return stream_parquet(chunks)
+    if export_format == 'arrow':
+        return stream_arrow(export_schema(), (list(zip(*chunk)) for chunk in chunks))
+    raise ValueError(f"Unknown export format: {export_format}")
@@ -0,0 +1,209 @@
+"""
+Batch Ingest Service
+Validates and upserts a batch of observations posted as NDJSON or CSV.
+Validation is done column-wise with pandas, stations are resolved with
+one query, and the accepted rows are written with one upsert statement
+per batch inside a single transaction. Invalid rows are rejected
+individually without failing the batch.
+"""
+import io
+import json
+import logging
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from hive_climate.models import ClimateObservation, WeatherStation
+from hive_climate.services.csv_loader import OBSERVATION_FLOAT_COLUMNS
+from hive_climate.services.data_sync import insert_observation_rows
+from hive_climate.services.derived import data_changed
+
+logger = logging.getLogger(__name__)
+
+QUALITY_CHOICES = {value for value, _ in ClimateObservation._meta.get_field('data_quality').choices}
+
+
+class IngestError(Exception):
+    """The batch as a whole can't be read"""
+
+
+def max_rows() -> int:
+    return getattr(settings, 'INGEST_MAX_ROWS', 50000)
+
+
+def read_batch(body: bytes, batch_format: str) -> pd.DataFrame:
+    """
+    Parse an NDJSON or CSV body into a DataFrame of raw cells
+
+    Raises:
+        IngestError: Unreadable body, missing columns or too many rows
+    """
+    if not body.strip():
+        raise IngestError("Empty body")
+    try:
+        if batch_format == 'csv':
+            df = pd.read_csv(io.BytesIO(body), dtype=str, keep_default_na=False, skipinitialspace=True)
+        else:
+            records = [json.loads(line) for line in body.decode('utf-8').splitlines() if line.strip()]
+            if not all(isinstance(record, dict) for record in records):
+                raise IngestError("Each NDJSON line must be an object")
+            df = pd.DataFrame.from_records(records)
+    except (ValueError, UnicodeDecodeError, pd.errors.ParserError) as e:
+        raise IngestError(f"Could not parse {batch_format} body: {str(e)}")
+
+    missing = {'station_id', 'observation_date'} - set(df.columns)
+    if missing:
+        raise IngestError(f"Missing required columns: {', '.join(sorted(missing))}")
+    if len(df) > max_rows():
+        raise IngestError(f"Batch has {len(df)} rows; the limit is {max_rows()}")
+    return df
+
+
+def _blank(series: pd.Series) -> pd.Series:
+    return series.isna() | (series.astype(str).str.strip() == '')
+
+
+def validate_batch(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Validate and type a batch column by column
+
+    Returns:
+        Dictionary with the typed columns (as a DataFrame, 'valid' rows
+        only) and a list of {row, station_id, errors} rejects; row is the
+        1-based position in the batch
+    """
+    n = len(df)
+    errors = {}
+
+    def reject(mask: pd.Series, message: str):
+        for position in mask[mask].index:
+            errors.setdefault(position, []).append(message)
+
+    station_ids = df['station_id'].astype(object).where(~_blank(df['station_id']), None)
+    station_ids = station_ids.map(lambda value: str(value).strip() if value is not None else None)
+    reject(station_ids.isna(), 'station_id is required')
+
+    dates = pd.to_datetime(df['observation_date'].where(~_blank(df['observation_date']), None),
+                           errors='coerce', format='ISO8601')
+    reject(_blank(df['observation_date']), 'observation_date is required')
+    reject(~_blank(df['observation_date']) & dates.isna(), 'observation_date is not a valid date')
+
+    # One query for every station in the batch
+    station_map = dict(WeatherStation.objects.filter(
+        station_id__in=set(station_ids.dropna())
+    ).values_list('station_id', 'id'))
+    station_pks = station_ids.map(station_map)
+    reject(station_ids.notna() & station_pks.isna(), 'unknown station_id')
+
+    typed = pd.DataFrame(index=df.index)
+    typed['station'] = station_pks
+    typed['observation_date'] = dates.dt.date
+    for name, derived in (('year', dates.dt.year), ('month', dates.dt.month)):
+        if name in df.columns:
+            given = pd.to_numeric(df[name].where(~_blank(df[name]), None), errors='coerce')
+            reject(~_blank(df[name]) & given.isna(), f'{name} is not a number')
+            reject(given.notna() & dates.notna() & (given != derived), f'{name} must match observation_date')
+        typed[name] = derived
+
+    for name in OBSERVATION_FLOAT_COLUMNS:
+        if name in df.columns:
+            values = pd.to_numeric(df[name].where(~_blank(df[name]), None), errors='coerce')
+            reject(~_blank(df[name]) & values.isna(), f'{name} is not a number')
+            # inf and overflowing values like 1e400 parse as numbers but can't be stored as JSON
+            reject(~np.isfinite(values.fillna(0)), f'{name} is not a finite number')
+            typed[name] = values
+        else:
+            typed[name] = None
+
+    if 'data_quality' in df.columns:
+        quality = df['data_quality'].where(~_blank(df['data_quality']), 'good').astype(str).str.strip()
+        reject(~quality.isin(QUALITY_CHOICES), f"data_quality must be one of {', '.join(sorted(QUALITY_CHOICES))}")
+        typed['data_quality'] = quality
+    else:
+        typed['data_quality'] = 'good'
+
+    valid = pd.Series(True, index=df.index)
+    valid[list(errors)] = False
+    # Of the valid readings for a (station, date) pair the last one wins
+    duplicate = valid & typed[valid].duplicated(subset=['station', 'observation_date'], keep='last').reindex(
+        df.index, fill_value=False
+    )
+    reject(duplicate, 'superseded by a later row for the same station and date')
+    valid &= ~duplicate
+    rejects = [
+        {'row': position + 1, 'station_id': station_ids[position], 'errors': messages}
+        for position, messages in sorted(errors.items())
+    ]
+    return {'rows': typed[valid], 'rejects': rejects, 'received': n}
+
+
+def _insert_tuples(rows: pd.DataFrame) -> List[tuple]:
+    adapt_date = connection.ops.adapt_datefield_value
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    columns = [
+        rows['station'].astype(int).tolist(),
+        [adapt_date(value) for value in rows['observation_date']],
+        rows['year'].astype(int).tolist(),
+        rows['month'].astype(int).tolist(),
+    ]
+    for name in OBSERVATION_FLOAT_COLUMNS:
+        values = rows[name].astype(object)
+        columns.append(values.where(values.notna(), None).tolist())
+    columns.append(rows['data_quality'].tolist())
+    return [(*row, now, now) for row in zip(*columns)]
+
+
+def ingest_batch(body: bytes, batch_format: str) -> Dict[str, Any]:
+    """
+    Validate and upsert a batch of observations
+
+    Existing (station, observation_date) rows are overwritten. Derived
+    data is refreshed for the touched partitions in the same transaction.
+
+    Args:
+        body: NDJSON or CSV text
+        batch_format: 'ndjson' or 'csv'
+
+    Returns:
+        Dictionary with received, created, updated and rejected counts,
+        the per-row rejects and elapsed seconds
+
+    Raises:
+        IngestError: The batch as a whole can't be read
+    """
+    start = time.time()
+    checked = validate_batch(read_batch(body, batch_format))
+    rows = checked['rows']
+    tuples = _insert_tuples(rows) if len(rows) else []
+
+    created = updated = 0
+    if tuples:
+        with transaction.atomic():
+            existing = set(ClimateObservation.objects.filter(
+                station_id__in=set(row[0] for row in tuples),
+                observation_date__gte=rows['observation_date'].min(),
+                observation_date__lte=rows['observation_date'].max(),
+            ).values_list('station_id', 'observation_date'))
+            updated = sum((pk, day) in existing for pk, day in zip(rows['station'].astype(int), rows['observation_date']))
+            created = len(tuples) - updated
+            insert_observation_rows(tuples, update_existing=True)
+            data_changed({(row[0], row[2], row[3]) for row in tuples}, reason='ingest')
+
+    stats = {
+        'received': checked['received'],
+        'created': created,
+        'updated': updated,
+        'rejected': len(checked['rejects']),
+        'rejects': checked['rejects'],
+        'seconds': round(time.time() - start, 3),
+    }
+    logger.info(
+        f"Ingested batch: {stats['received']} received, {created} created, "
+        f"{updated} updated, {stats['rejected']} rejected"
+    )
+    return stats
@@ -0,0 +1,136 @@
+"""
+Database Maintenance Service
+Set-based clearing of climate tables and space reclamation
+"""
+import logging
+import time
+from typing import Any, Dict, List
+
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, models
+from django.db.models.signals import post_delete, pre_delete
+
+logger = logging.getLogger(__name__)
+
+
+def _dependency_order(targets: List[type]) -> List[type]:
+    """
+    Expand targets with every model that references them and sort children first
+
+    Raises:
+        ValueError: If a referencing model would need SET_NULL/PROTECT handling
+    """
+    ordered = []
+    visiting = set()
+
+    def visit(model):
+        if model in ordered:
+            return
+        if model in visiting:
+            raise ValueError(f"Circular relation involving {model._meta.label}")
+        visiting.add(model)
+        for rel in model._meta.related_objects:
+            if rel.on_delete not in (models.CASCADE, models.DO_NOTHING):
+                raise ValueError(
+                    f"{rel.related_model._meta.label}.{rel.field.name} uses "
+                    f"{rel.on_delete.__name__} and needs the deletion collector"
+                )
+            if rel.related_model is not model:
+                visit(rel.related_model)
+        visiting.discard(model)
+        ordered.append(model)
+
+    for model in targets:
+        visit(model)
+    return ordered
+
+
+def _has_delete_signals(model_list: List[type]) -> bool:
+    """Check whether any model has pre/post delete receivers attached"""
+    return any(
+        pre_delete.has_listeners(model) or post_delete.has_listeners(model)
+        for model in model_list
+    )
+
+
+def reclaim_space(tables: List[str], using: str = DEFAULT_DB_ALIAS) -> bool:
+    """
+    Return freed pages to the filesystem after a large delete
+
+    Runs VACUUM on SQLite and PostgreSQL and OPTIMIZE TABLE on MySQL. These
+    statements cannot run inside a transaction, so nothing happens when
+    called from within an atomic block.
+
+    Args:
+        tables: Table names that were cleared
+        using: Database alias
+
+    Returns:
+        True if space was reclaimed, False if skipped
+    """
+    connection = connections[using]
+    if connection.in_atomic_block:
+        logger.warning("Skipping space reclamation inside a transaction")
+        return False
+
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute("VACUUM")
+        elif connection.vendor == 'postgresql':
+            for table in tables:
+                cursor.execute(f"VACUUM ANALYZE {quote(table)}")
+        elif connection.vendor == 'mysql':
+            cursor.execute(f"OPTIMIZE TABLE {', '.join(quote(table) for table in tables)}")
+        else:
+            return False
+    return True
+
+
+def fast_clear(model_list: List[type], vacuum: bool = True,
+               using: str = DEFAULT_DB_ALIAS) -> Dict[str, Any]:
+    """
+    Delete every row of the given models and of all models referencing them
+
+    Uses the backend's flush SQL (TRUNCATE on PostgreSQL, plain DELETE on
+    SQLite) in dependency order, bypassing Django's deletion collector. The
+    collector is only used when delete signals are registered or a
+    relation needs SET_NULL/PROTECT handling.
+
+    Args:
+        model_list: Models to clear, e.g. [ClimateObservation, WeatherStation, Region]
+        vacuum: Reclaim disk space afterwards
+        using: Database alias
+
+    Returns:
+        Dictionary with cleared tables, mode used and elapsed seconds
+    """
+    start = time.time()
+    connection = connections[using]
+
+    try:
+        ordered = _dependency_order(model_list)
+        mode = 'collector' if _has_delete_signals(ordered) else 'flush'
+    except ValueError as e:
+        logger.warning(f"Fast clear not possible, using deletion collector: {e}")
+        ordered = list(model_list)
+        mode = 'collector'
+
+    tables = [model._meta.db_table for model in ordered]
+    logger.info(f"Clearing tables ({mode}): {', '.join(tables)}")
+
+    if mode == 'flush':
+        sql_list = connection.ops.sql_flush(no_style(), tables, reset_sequences=False)
+        connection.ops.execute_sql_flush(sql_list)
+    else:
+        for model in ordered:
+            model._base_manager.using(using).all().delete()
+
+    vacuumed = reclaim_space(tables, using=using) if vacuum else False
+
+    return {
+        'tables': tables,
+        'mode': mode,
+        'vacuumed': vacuumed,
+        'seconds': round(time.time() - start, 3),
+    }
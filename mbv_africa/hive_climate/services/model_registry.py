@@ -0,0 +1,154 @@
+"""
+Model Registry Service
+Persists fitted ML models keyed by (name, feature set, data version).
+Readers load the stored artifact; training only happens when the data
+version moves on, and then in the background while the previous
+artifact keeps being served.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from hive_climate.models import TrainedModel
+from hive_climate.services.data_version import get_data_version
+
+logger = logging.getLogger(__name__)
+
+# Trainers return {'intercept', 'coefficients', 'metrics', 'artifact'}
+Trainer = Callable[[], Dict[str, Any]]
+
+# Artifacts kept per model and feature set
+KEEP_VERSIONS = 3
+
+
+def _feature_set(features: List[str]) -> str:
+    return ','.join(features)
+
+
+def _claim(name: str, feature_set: str, version: int) -> Optional[TrainedModel]:
+    """
+    Reserve the (name, feature set, version) slot for training
+
+    Returns:
+        The claimed row, or None if another worker is training it or it is ready
+    """
+    try:
+        with transaction.atomic():
+            return TrainedModel.objects.create(name=name, feature_set=feature_set, data_version=version)
+    except IntegrityError:
+        pass
+
+    timeout = getattr(settings, 'ML_TRAINING_TIMEOUT', 600)
+    stale = timezone.now() - timedelta(seconds=timeout)
+    # Retry failed runs and runs abandoned by a dead worker
+    retryable = Q(status='failed') | Q(status='training', created_at__lt=stale)
+    claimed = TrainedModel.objects.filter(
+        retryable, name=name, feature_set=feature_set, data_version=version
+    ).update(status='training', created_at=timezone.now())
+    if not claimed:
+        return None
+    return TrainedModel.objects.get(name=name, feature_set=feature_set, data_version=version)
+
+
+def train_model(name: str, features: List[str], trainer: Trainer,
+                version: int = None) -> Optional[TrainedModel]:
+    """
+    Train and persist a model for a data version unless it already exists
+
+    Args:
+        name: Model name, e.g. 'temperature_regression'
+        features: Feature names the trainer uses
+        trainer: Callable that fits the model and builds its artifact
+        version: Data version to train for (defaults to the current one)
+
+    Returns:
+        The ready TrainedModel, or None if training failed or is running elsewhere
+    """
+    version = get_data_version() if version is None else version
+    feature_set = _feature_set(features)
+    record = _claim(name, feature_set, version)
+    if record is None:
+        return TrainedModel.objects.filter(
+            name=name, feature_set=feature_set, data_version=version, status='ready'
+        ).first()
+
+    start = time.time()
+    try:
+        fitted = trainer()
+    except Exception as e:
+        logger.error(f"Training {name} for data version {version} failed: {str(e)}")
+        record.status = 'failed'
+        record.error_message = str(e)
+        record.save(update_fields=['status', 'error_message'])
+        return None
+
+    record.intercept = fitted.get('intercept')
+    record.coefficients = fitted.get('coefficients', [])
+    record.metrics = fitted.get('metrics', {})
+    record.artifact = fitted.get('artifact', {})
+    record.status = 'ready'
+    record.error_message = ''
+    record.training_time = round(time.time() - start, 3)
+    record.trained_at = timezone.now()
+    record.save()
+    logger.info(f"Trained {name} for data version {version} in {record.training_time}s")
+
+    # Drop artifacts of old data versions
+    keep = TrainedModel.objects.filter(
+        name=name, feature_set=feature_set
+    ).order_by('-data_version').values_list('pk', flat=True)[:KEEP_VERSIONS]
+    TrainedModel.objects.filter(name=name, feature_set=feature_set).exclude(pk__in=list(keep)).delete()
+    return record
+
+
+def train_in_background(name: str, features: List[str], trainer: Trainer, version: int):
+    """Train a model in a daemon thread"""
+    def run():
+        try:
+            train_model(name, features, trainer, version)
+        finally:
+            close_old_connections()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def load_artifact(name: str, features: List[str], trainer: Trainer) -> Dict[str, Any]:
+    """
+    Artifact of the model trained on the current data version
+
+    When the data changed since the last training, the previous artifact is
+    returned and a background retrain is started. Only the very first call,
+    with nothing persisted yet, trains inline.
+
+    Args:
+        name: Model name
+        features: Feature names the trainer uses
+        trainer: Callable that fits the model and builds its artifact
+
+    Returns:
+        The stored artifact dictionary
+    """
+    version = get_data_version()
+    ready = TrainedModel.objects.filter(
+        name=name, feature_set=_feature_set(features), status='ready'
+    ).order_by('-data_version').only('data_version', 'artifact').first()
+
+    if ready is not None and ready.data_version == version:
+        return ready.artifact
+
+    if ready is not None:
+        train_in_background(name, features, trainer, version)
+        return ready.artifact
+
+    record = train_model(name, features, trainer, version)
+    if record is not None:
+        return record.artifact
+    # Someone else is training the first model; answer without persisting
+    return trainer()['artifact']
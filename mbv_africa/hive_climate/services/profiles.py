@@ -0,0 +1,144 @@
+"""
+Station Profile Service
+Materializes what the station page and the station statistics endpoint
+show: lifetime statistics, a 12-month climatology and the most recent
+observations. Aggregates are combined from the station rollup, so only
+the recent window reads ClimateObservation.
+"""
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import F, Max, Min, Sum, Window
+from django.db.models.functions import RowNumber
+
+from hive_climate.models import (
+    ClimateObservation, StationMonthlyRollup, StationProfile, StationSummary, WeatherStation,
+)
+from hive_climate.services.rollups import chunked, rollup_average
+
+logger = logging.getLogger(__name__)
+
+# Observations kept in each profile's recent window
+RECENT_OBSERVATIONS = 30
+
+RECENT_FIELDS = [
+    'observation_date', 'year', 'month',
+    'temp_max', 'temp_min', 'temp_mean',
+    'precipitation', 'humidity',
+    'sea_surface_temp', 'ocean_salinity', 'data_quality',
+]
+
+
+def _average_aggregates(measures: Dict[str, str]) -> Dict[str, Any]:
+    """Sum and count aggregates for {output name: rollup measure}"""
+    aggregates = {}
+    for name, measure in measures.items():
+        aggregates[f'{name}_sum'] = Sum(f'{measure}_sum')
+        aggregates[f'{name}_count'] = Sum(f'{measure}_count')
+    return aggregates
+
+
+def _averages(item: Dict[str, Any], names: Iterable[str]) -> Dict[str, Optional[float]]:
+    return {name: rollup_average(item[f'{name}_sum'], item[f'{name}_count']) for name in names}
+
+
+def _lifetime_statistics(station_pks: List[int]) -> Dict[int, Dict[str, Any]]:
+    measures = {'avg_temp': 'temp_mean', 'avg_precip': 'precipitation', 'avg_humidity': 'humidity'}
+    dates = dict(
+        (pk, (first, last)) for pk, first, last in StationSummary.objects.filter(
+            station_id__in=station_pks
+        ).values_list('station_id', 'first_observation_date', 'last_observation_date')
+    )
+
+    statistics = {}
+    for item in StationMonthlyRollup.objects.filter(station_id__in=station_pks).order_by().values(
+        'station_id'
+    ).annotate(
+        total_observations=Sum('observation_count'),
+        min_temp=Min('temp_min_min'),
+        max_temp=Max('temp_max_max'),
+        **_average_aggregates(measures)
+    ):
+        first_date, last_date = dates.get(item['station_id'], (None, None))
+        statistics[item['station_id']] = {
+            **_averages(item, measures),
+            'min_temp': item['min_temp'],
+            'max_temp': item['max_temp'],
+            'total_observations': item['total_observations'],
+            'min_date': first_date,
+            'max_date': last_date,
+        }
+    return statistics
+
+
+def _climatology(station_pks: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    measures = {'avg_temp': 'temp_mean', 'avg_precip': 'precipitation'}
+    climatology = defaultdict(list)
+    for item in StationMonthlyRollup.objects.filter(station_id__in=station_pks).order_by(
+        'station_id', 'month'
+    ).values('station_id', 'month').annotate(**_average_aggregates(measures)):
+        climatology[item['station_id']].append({'month': item['month'], **_averages(item, measures)})
+    return climatology
+
+
+def _recent_observations(station_pks: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    recent = defaultdict(list)
+    for item in ClimateObservation.objects.filter(station_id__in=station_pks).annotate(
+        position=Window(RowNumber(), partition_by=[F('station_id')], order_by=F('observation_date').desc())
+    ).filter(position__lte=RECENT_OBSERVATIONS).order_by('station_id', '-observation_date').values(
+        'station_id', *RECENT_FIELDS
+    ):
+        recent[item.pop('station_id')].append(item)
+    return recent
+
+
+def refresh_profiles(station_pks: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+    """
+    Rebuild the profiles of the given stations
+
+    Must run after the rollups and station summaries are refreshed.
+
+    Args:
+        station_pks: Stations whose observations changed, or None to
+            rebuild every profile
+
+    Returns:
+        Dictionary with profiles written and elapsed seconds
+    """
+    start = time.time()
+    full = station_pks is None
+    if full:
+        station_pks = WeatherStation.objects.values_list('pk', flat=True)
+
+    rows = 0
+    with transaction.atomic():
+        if full:
+            StationProfile.objects.all().delete()
+        for chunk in chunked(set(station_pks)):
+            statistics = _lifetime_statistics(chunk)
+            climatology = _climatology(chunk)
+            recent = _recent_observations(chunk)
+            if not full:
+                StationProfile.objects.filter(station_id__in=chunk).delete()
+            profiles = [
+                StationProfile(
+                    station_id=pk,
+                    statistics=statistics[pk],
+                    climatology=climatology[pk],
+                    recent_observations=recent[pk],
+                )
+                for pk in chunk if pk in statistics
+            ]
+            StationProfile.objects.bulk_create(profiles)
+            rows += len(profiles)
+
+    stats = {
+        'mode': 'full' if full else 'incremental',
+        'profiles': rows,
+        'seconds': round(time.time() - start, 3),
+    }
+    logger.info(f"Refreshed station profiles: {stats}")
+    return stats
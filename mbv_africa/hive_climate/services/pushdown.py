@@ -0,0 +1,206 @@
+"""
+Hive Pushdown Service
+Runs the analytics aggregations on the Hive warehouse instead of the
+local copy when the local data can't answer them: the requested years
+are outside what was synced, or the range covers more observations than
+settings.HIVE_PUSHDOWN_ROW_THRESHOLD. The HiveQL produces the same rows,
+under the same keys, as the local rollup queries, and filters on the
+year partition column so Hive prunes partitions.
+
+Availability is probed at most every settings.HIVE_AVAILABILITY_TTL
+seconds. Hive-side data changes are not tracked by the local data
+version, so Hive results are cached for settings.HIVE_PUSHDOWN_CACHE_TIMEOUT
+seconds only and are not sent with validators (see AnalyticsViewSet).
+"""
+import logging
+from typing import Any, Callable, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+
+from hive_climate.hive_connector import get_hive_manager, is_hive_available_cached, is_hive_enabled
+from hive_climate.models import RegionMonthlyRollup
+from hive_climate.services.data_version import versioned_cache_key
+from hive_climate.services.statistics import get_statistics
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ('auto', 'local', 'hive')
+
+LOCAL_ENGINE = 'sqlite'
+HIVE_ENGINE = 'hive'
+
+
+class PushdownError(Exception):
+    """Hive could not serve a pushdown query"""
+
+
+def observations_table() -> str:
+    return getattr(settings, 'HIVE_OBSERVATIONS_TABLE', 'africa_climate_observations')
+
+
+def select_engine(requested: str, first_year: int, last_year: int) -> str:
+    """
+    Engine for an aggregation over [first_year, last_year]
+
+    Args:
+        requested: 'auto', 'local' or 'hive'
+        first_year: First year of the requested range
+        last_year: Last year of the requested range
+
+    Returns:
+        LOCAL_ENGINE or HIVE_ENGINE
+
+    Raises:
+        ValueError: Unknown engine
+        PushdownError: 'hive' was requested but Hive is not available
+    """
+    if requested not in ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
+    mode = getattr(settings, 'HIVE_PUSHDOWN', 'auto')
+    if requested == 'local' or mode == 'off':
+        return LOCAL_ENGINE
+    if requested == 'hive':
+        if not is_hive_available_cached():
+            raise PushdownError("Hive is not available")
+        return HIVE_ENGINE
+
+    if not _needs_pushdown(first_year, last_year):
+        return LOCAL_ENGINE
+    return HIVE_ENGINE if is_hive_available_cached() else LOCAL_ENGINE
+
+
+def engine_state() -> str:
+    """
+    Inputs of select_engine that the local data version doesn't capture
+
+    Conditional GET mixes this into the ETag of pushdown-capable
+    endpoints, so a body served locally is not revalidated once Hive
+    comes up (or the reverse).
+    """
+    if getattr(settings, 'HIVE_PUSHDOWN', 'auto') == 'off' or not is_hive_enabled():
+        return 'pushdown-off'
+    return 'hive-up' if is_hive_available_cached() else 'hive-down'
+
+
+def _needs_pushdown(first_year: int, last_year: int) -> bool:
+    """Whether the local copy is missing or too large for the range"""
+    statistics = get_statistics()
+    if statistics.first_observation_date is None:
+        return True
+    if first_year < statistics.first_observation_date.year or last_year > statistics.last_observation_date.year:
+        return True
+    rows = RegionMonthlyRollup.objects.filter(
+        year__gte=first_year, year__lte=last_year
+    ).aggregate(total=Sum('observation_count'))['total'] or 0
+    return rows > getattr(settings, 'HIVE_PUSHDOWN_ROW_THRESHOLD', 5000000)
+
+
+def run(query: str) -> List[Dict[str, Any]]:
+    """
+    Execute HiveQL, caching the rows
+
+    Results are kept for settings.HIVE_PUSHDOWN_CACHE_TIMEOUT seconds
+    under the current data version.
+
+    Raises:
+        PushdownError: The query failed
+    """
+    key = versioned_cache_key('hive_pushdown', query)
+    rows = cache.get(key)
+    if rows is not None:
+        return rows
+
+    try:
+        df = get_hive_manager().execute_query_to_dataframe(query)
+    except Exception as e:
+        raise PushdownError(f"Hive query failed: {str(e)}") from e
+    # Hive may prefix column names with the table name
+    df.columns = [column.split('.')[-1] for column in df.columns]
+    df = df.astype(object).where(df.notna(), None)
+    rows = df.to_dict('records')
+
+    cache.set(key, rows, getattr(settings, 'HIVE_PUSHDOWN_CACHE_TIMEOUT', 300))
+    logger.info(f"Hive pushdown returned {len(rows)} rows")
+    return rows
+
+
+def _sum_and_count(column: str, alias: str = None) -> str:
+    alias = alias or column
+    return f"SUM({column}) AS {alias}_sum, COUNT({column}) AS {alias}_count"
+
+
+def temperature_trends_query(start_year: int, end_year: int) -> str:
+    """Per (year, region) temperature sums and counts, keyed like the local rollup query"""
+    measures = ', '.join(_sum_and_count(measure) for measure in ('temp_max', 'temp_min', 'temp_mean'))
+    return (
+        f"SELECT year, region AS region__name, {measures} "
+        f"FROM {observations_table()} "
+        f"WHERE year BETWEEN {int(start_year)} AND {int(end_year)} "
+        f"GROUP BY year, region ORDER BY year, region__name"
+    )
+
+
+def precipitation_query(year: int) -> str:
+    """Per region precipitation total and count for one year"""
+    return (
+        f"SELECT region AS region__name, SUM(precipitation) AS total_precipitation, "
+        f"COUNT(precipitation) AS observation_count "
+        f"FROM {observations_table()} "
+        f"WHERE year = {int(year)} AND precipitation IS NOT NULL "
+        f"GROUP BY region"
+    )
+
+
+def ocean_conditions_query(year: int) -> str:
+    """Per month sea surface temperature and salinity sums and counts for one year"""
+    return (
+        f"SELECT month, {_sum_and_count('sea_surface_temp', 'sst')}, "
+        f"{_sum_and_count('ocean_salinity', 'salinity')}, "
+        f"COUNT(DISTINCT station_id) AS station_count "
+        f"FROM {observations_table()} "
+        f"WHERE year = {int(year)} AND sea_surface_temp IS NOT NULL "
+        f"GROUP BY month ORDER BY month"
+    )
+
+
+def temperature_trends(start_year: int, end_year: int) -> List[Dict[str, Any]]:
+    return run(temperature_trends_query(start_year, end_year))
+
+
+def precipitation(year: int) -> List[Dict[str, Any]]:
+    return run(precipitation_query(year))
+
+
+def ocean_conditions(year: int) -> List[Dict[str, Any]]:
+    return run(ocean_conditions_query(year))
+
+
+def aggregate(requested: str, first_year: int, last_year: int,
+              local: Callable[[], List], remote: Callable[[], List]):
+    """
+    Rows of an aggregation from the selected engine
+
+    An automatic pushdown that fails falls back to the local copy; an
+    explicit engine=hive request does not.
+
+    Args:
+        requested: 'auto', 'local' or 'hive'
+        first_year: First year of the requested range
+        last_year: Last year of the requested range
+        local: Returns the rows from the local database
+        remote: Returns the rows from Hive
+
+    Returns:
+        (rows, engine name)
+    """
+    engine = select_engine(requested, first_year, last_year)
+    if engine == HIVE_ENGINE:
+        try:
+            return remote(), HIVE_ENGINE
+        except PushdownError as e:
+            if requested == 'hive':
+                raise
+            logger.warning(f"Hive pushdown failed, using local data: {str(e)}")
+    return list(local()), LOCAL_ENGINE
@@ -0,0 +1,402 @@
+"""
+Query Job Service
+Runs Hive queries in a background worker pool instead of the request.
+Rows are fetched in chunks and spooled to a local Parquet file (one row
+group per chunk; newline-delimited JSON when pyarrow is missing), so a
+result of any size can be paged by offset without refetching it. Jobs
+can be cancelled and expire after settings.HIVE_QUERY_JOB_TTL seconds.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import timedelta
+from itertools import islice
+from typing import Any, Dict, List, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from hive_climate.hive_connector import get_hive_manager
+from hive_climate.models import HiveQueryJob, HiveQueryLog
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _pyarrow_available = True
+except ImportError:
+    _pyarrow_available = False
+
+# Statuses after which a job never changes again (except expiring)
+FINISHED_STATUSES = ('succeeded', 'failed', 'cancelled', 'expired')
+
+# PyHive type codes -> column kind used for the spool schema
+HIVE_COLUMN_KINDS = {
+    'BOOLEAN_TYPE': 'bool',
+    'TINYINT_TYPE': 'int', 'SMALLINT_TYPE': 'int', 'INT_TYPE': 'int', 'BIGINT_TYPE': 'int',
+    'FLOAT_TYPE': 'float', 'DOUBLE_TYPE': 'float', 'DECIMAL_TYPE': 'float',
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+_futures = {}
+# Cursors of running jobs in this process, for cancellation
+_cursors = {}
+
+
+class JobExpired(Exception):
+    """The job's results are no longer available"""
+
+
+class JobNotReady(Exception):
+    """The job has no results to page yet"""
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'HIVE_QUERY_WORKERS', 4),
+                thread_name_prefix='hive-query-job',
+            )
+        return _executor
+
+
+def spool_dir() -> str:
+    path = getattr(settings, 'HIVE_QUERY_SPOOL_DIR', None) or os.path.join(
+        tempfile.gettempdir(), 'mbv_africa_query_spool'
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def fetch_size() -> int:
+    """Rows per fetchmany() call and per spooled row group"""
+    return getattr(settings, 'HIVE_QUERY_FETCH_SIZE', 10000)
+
+
+def submit_job(query: str, user=None, fetch_results: bool = True) -> HiveQueryJob:
+    """
+    Create a job and queue it on the worker pool
+
+    Expired jobs are purged on the way.
+
+    Args:
+        query: HiveQL to execute
+        user: Submitting user, if authenticated
+        fetch_results: Spool the result rows (False for statements)
+
+    Returns:
+        The queued HiveQueryJob
+    """
+    expire_jobs()
+    job = HiveQueryJob.objects.create(
+        query=query,
+        fetch_results=fetch_results,
+        submitted_by=user if user is not None and user.is_authenticated else None,
+        expires_at=timezone.now() + timedelta(seconds=getattr(settings, 'HIVE_QUERY_JOB_TTL', 3600)),
+    )
+    job_id = job.pk
+    transaction.on_commit(lambda: _futures.__setitem__(job_id, _get_executor().submit(_run_job, job_id)))
+    logger.info(f"Queued Hive query job {job_id}")
+    return job
+
+
+def wait_for_job(job: HiveQueryJob, timeout: float) -> HiveQueryJob:
+    """
+    Wait up to timeout seconds for a job run by this process to finish
+
+    Returns:
+        The job, reloaded
+    """
+    future = _futures.get(job.pk)
+    if future is not None and timeout > 0:
+        try:
+            future.result(timeout=timeout)
+        except FutureTimeout:
+            pass
+    job.refresh_from_db()
+    return job
+
+
+def run_job(query: str, user=None, fetch_results: bool = True, wait: float = None) -> HiveQueryJob:
+    """
+    Submit a job and wait briefly for it, for callers that used to run
+    queries inline
+
+    Args:
+        wait: Seconds to wait (defaults to settings.HIVE_QUERY_SYNC_WAIT)
+
+    Returns:
+        The job, finished or still queued/running
+    """
+    job = submit_job(query, user=user, fetch_results=fetch_results)
+    if wait is None:
+        wait = getattr(settings, 'HIVE_QUERY_SYNC_WAIT', 10)
+    return wait_for_job(job, wait)
+
+
+def cancel_job(job: HiveQueryJob) -> HiveQueryJob:
+    """
+    Cancel a queued or running job
+
+    A queued job never starts. A running job is flagged; the worker stops
+    at the next chunk, and the Hive operation is cancelled right away when
+    it runs in this process.
+    """
+    if job.status == 'queued':
+        HiveQueryJob.objects.filter(pk=job.pk, status='queued').update(
+            status='cancelled', cancel_requested=True, finished_at=timezone.now()
+        )
+    elif job.status == 'running':
+        HiveQueryJob.objects.filter(pk=job.pk).update(cancel_requested=True)
+        cursor = _cursors.get(job.pk)
+        if cursor is not None:
+            try:
+                cursor.cancel()
+            except Exception as e:
+                logger.warning(f"Could not cancel Hive operation for job {job.pk}: {str(e)}")
+    job.refresh_from_db()
+    return job
+
+
+def expire_jobs() -> int:
+    """
+    Expire jobs past their expiry time and fail jobs whose worker died
+
+    Returns:
+        Number of jobs expired
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=getattr(settings, 'HIVE_QUERY_JOB_TIMEOUT', 3600))
+    HiveQueryJob.objects.filter(status__in=('queued', 'running'), created_at__lt=stale).exclude(
+        pk__in=list(_futures)
+    ).update(status='failed', error_message='Job abandoned by its worker', finished_at=now)
+
+    expired = list(HiveQueryJob.objects.filter(expires_at__lt=now).exclude(
+        status__in=('expired', 'queued', 'running')
+    ))
+    for job in expired:
+        _remove_spool(job.result_path)
+    HiveQueryJob.objects.filter(pk__in=[job.pk for job in expired]).update(status='expired', result_path='')
+    for job_id, future in list(_futures.items()):
+        if future.done():
+            _futures.pop(job_id, None)
+    if expired:
+        logger.info(f"Expired {len(expired)} Hive query jobs")
+    return len(expired)
+
+
+def _remove_spool(path: str):
+    if path:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _column_kinds(description) -> List[str]:
+    return [HIVE_COLUMN_KINDS.get(str(column[1]).upper(), 'string') for column in description]
+
+
+def _convert(value, kind: str):
+    if value is None:
+        return None
+    if kind == 'float':
+        return float(value)
+    if kind == 'int':
+        return int(value)
+    if kind == 'bool':
+        return bool(value)
+    return value if isinstance(value, str) else str(value)
+
+
+class _ParquetSpool:
+    """Parquet file written one row group per chunk"""
+    format = 'parquet'
+    arrow_types = {'bool': 'bool_', 'int': 'int64', 'float': 'float64', 'string': 'string'}
+
+    def __init__(self, path: str, columns: List[str], kinds: List[str]):
+        self.schema = pa.schema([
+            (name, getattr(pa, self.arrow_types[kind])()) for name, kind in zip(columns, kinds)
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema, compression='snappy')
+
+    def write(self, columns: List[List]):
+        self.writer.write_table(pa.Table.from_arrays(
+            [pa.array(column, type=self.schema.field(i).type) for i, column in enumerate(columns)],
+            schema=self.schema,
+        ))
+
+    def close(self):
+        self.writer.close()
+
+
+class _NDJSONSpool:
+    """One JSON array per row"""
+    format = 'ndjson'
+
+    def __init__(self, path: str, columns: List[str], kinds: List[str]):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, columns: List[List]):
+        self.file.write(''.join(json.dumps(list(row)) + '\n' for row in zip(*columns)))
+
+    def close(self):
+        self.file.close()
+
+
+def _run_job(job_id):
+    """Worker: execute the query and spool its rows"""
+    close_old_connections()
+    try:
+        started = HiveQueryJob.objects.filter(pk=job_id, status='queued').update(
+            status='running', started_at=timezone.now()
+        )
+        if not started:
+            return
+        job = HiveQueryJob.objects.get(pk=job_id)
+        try:
+            _execute(job)
+        except Exception as e:
+            _remove_spool(job.result_path)
+            job.refresh_from_db(fields=['cancel_requested'])
+            job.status = 'cancelled' if job.cancel_requested else 'failed'
+            job.error_message = '' if job.cancel_requested else str(e)
+            job.result_path = ''
+            job.finished_at = timezone.now()
+            job.save(update_fields=['status', 'error_message', 'result_path', 'finished_at'])
+            if job.status == 'failed':
+                logger.error(f"Hive query job {job_id} failed: {str(e)}")
+        _log_query(job)
+    finally:
+        _cursors.pop(job_id, None)
+        close_old_connections()
+
+
+def _execute(job: HiveQueryJob):
+    with get_hive_manager().get_cursor() as cursor:
+        _cursors[job.pk] = cursor
+        cursor.execute(job.query)
+        if not job.fetch_results:
+            job.status = 'succeeded'
+            job.finished_at = timezone.now()
+            job.save(update_fields=['status', 'finished_at'])
+            return
+
+        columns = [column[0].split('.')[-1] for column in cursor.description or []]
+        kinds = _column_kinds(cursor.description or [])
+        spool_class = _ParquetSpool if _pyarrow_available else _NDJSONSpool
+        job.columns = columns
+        job.result_format = spool_class.format
+        job.result_path = os.path.join(spool_dir(), f'{job.pk}.{spool_class.format}')
+        job.save(update_fields=['columns', 'result_format', 'result_path'])
+
+        spool = spool_class(job.result_path, columns, kinds)
+        rows = 0
+        try:
+            while True:
+                chunk = cursor.fetchmany(fetch_size())
+                if not chunk:
+                    break
+                spool.write([
+                    [_convert(value, kind) for value in column]
+                    for column, kind in zip(zip(*chunk), kinds)
+                ])
+                rows += len(chunk)
+                if HiveQueryJob.objects.filter(pk=job.pk, cancel_requested=True).exists():
+                    raise RuntimeError('Cancelled')
+        finally:
+            spool.close()
+
+    job.row_count = rows
+    job.status = 'succeeded'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['row_count', 'status', 'finished_at'])
+    logger.info(f"Hive query job {job.pk} spooled {rows} rows")
+
+
+def _log_query(job: HiveQueryJob):
+    if job.status == 'cancelled':
+        return
+    HiveQueryLog.objects.create(
+        query=job.query,
+        query_type='select' if job.fetch_results else 'other',
+        execution_time=job.execution_time or 0,
+        rows_returned=job.row_count,
+        status='success' if job.status == 'succeeded' else 'error',
+        error_message=job.error_message,
+        executed_by=job.submitted_by,
+    )
+
+
+def read_page(job: HiveQueryJob, offset: int, limit: int) -> Tuple[List[str], List[List[Any]]]:
+    """
+    Rows [offset, offset + limit) of a finished job's result
+
+    Parquet spools only read the row groups that overlap the page.
+
+    Returns:
+        (column names, rows as lists)
+
+    Raises:
+        JobNotReady: The job has not succeeded (yet)
+        JobExpired: The spool is gone
+    """
+    if job.status == 'expired' or job.expires_at < timezone.now():
+        raise JobExpired(f"Job {job.pk} has expired")
+    if job.status != 'succeeded' or not job.fetch_results:
+        raise JobNotReady(f"Job {job.pk} is {job.status}")
+    if not job.result_path or not os.path.exists(job.result_path):
+        raise JobExpired(f"Results of job {job.pk} are no longer available")
+
+    if job.result_format == 'parquet':
+        rows = _read_parquet_page(job.result_path, offset, limit)
+    else:
+        with open(job.result_path, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in islice(f, offset, offset + limit)]
+    return job.columns, rows
+
+
+def _read_parquet_page(path: str, offset: int, limit: int) -> List[List[Any]]:
+    parquet = pq.ParquetFile(path)
+    groups = []
+    first_row = None
+    position = 0
+    for index in range(parquet.num_row_groups):
+        size = parquet.metadata.row_group(index).num_rows
+        if position + size > offset and position < offset + limit:
+            groups.append(index)
+            if first_row is None:
+                first_row = position
+        position += size
+    if not groups:
+        return []
+    table = parquet.read_row_groups(groups).slice(offset - first_row, limit)
+    return [list(row) for row in zip(*(column.to_pylist() for column in table.columns))]
+
+
+def job_status(job: HiveQueryJob) -> Dict[str, Any]:
+    """Status payload of a job, expiring it if its time is up"""
+    if job.status not in ('expired', 'queued', 'running') and job.expires_at < timezone.now():
+        expire_jobs()
+        job.refresh_from_db()
+    return {
+        'job_id': str(job.pk),
+        'status': job.status,
+        'query': job.query,
+        'columns': job.columns,
+        'row_count': job.row_count,
+        'error': job.error_message or None,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'execution_time': job.execution_time,
+        'expires_at': job.expires_at,
+    }
@@ -0,0 +1,209 @@
+"""
+Rollup Service
+Maintains the (station, year, month) and (region, year, month) rollup
+tables from ClimateObservation. A refresh rebuilds only the partitions
+a load or sync touched; passing no partitions rebuilds everything.
+"""
+import logging
+import math
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, Min, Q, Sum
+
+from hive_climate.models import (
+    ClimateObservation, WeatherStation, StationMonthlyRollup, RegionMonthlyRollup,
+    ROLLUP_MEASURES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Keeps IN (...) lists well below SQLite's bound parameter limit
+PARTITION_CHUNK_SIZE = 500
+
+# Above this share of existing station partitions a full rebuild is cheaper
+FULL_REBUILD_FRACTION = 0.2
+
+Partition = Tuple[int, int, int]  # (station or region pk, year, month)
+
+
+def rollup_average(total: Optional[float], count: Optional[int]) -> Optional[float]:
+    """Average from a rollup sum and count"""
+    if not count or total is None:
+        return None
+    return total / count
+
+
+def rollup_stddev(total: Optional[float], sumsq: Optional[float], count: Optional[int]) -> Optional[float]:
+    """Population standard deviation from a rollup sum, sum of squares and count"""
+    if not count or total is None or sumsq is None:
+        return None
+    mean = total / count
+    return math.sqrt(max(sumsq / count - mean * mean, 0.0))
+
+
+def _observation_aggregates() -> Dict[str, Any]:
+    """Aggregates that build station rollup columns from observations"""
+    aggregates = {'observation_count': Count('id')}
+    for measure in ROLLUP_MEASURES:
+        aggregates[f'{measure}_count'] = Count(measure)
+        aggregates[f'{measure}_sum'] = Sum(measure)
+        aggregates[f'{measure}_min'] = Min(measure)
+        aggregates[f'{measure}_max'] = Max(measure)
+        aggregates[f'{measure}_sumsq'] = Sum(F(measure) * F(measure))
+    with_sst = Q(sea_surface_temp__isnull=False)
+    aggregates['sst_salinity_count'] = Count('ocean_salinity', filter=with_sst)
+    aggregates['sst_salinity_sum'] = Sum('ocean_salinity', filter=with_sst)
+    return aggregates
+
+
+def _rollup_aggregates() -> Dict[str, Any]:
+    """Aggregates that combine station rollup rows into region rollup columns"""
+    aggregates = {'observation_count': Sum('observation_count')}
+    for measure in ROLLUP_MEASURES:
+        aggregates[f'{measure}_count'] = Sum(f'{measure}_count')
+        aggregates[f'{measure}_sum'] = Sum(f'{measure}_sum')
+        aggregates[f'{measure}_min'] = Min(f'{measure}_min')
+        aggregates[f'{measure}_max'] = Max(f'{measure}_max')
+        aggregates[f'{measure}_sumsq'] = Sum(f'{measure}_sumsq')
+    aggregates['sst_salinity_count'] = Sum('sst_salinity_count')
+    aggregates['sst_salinity_sum'] = Sum('sst_salinity_sum')
+    return aggregates
+
+
+def insert_from_queryset(model, queryset) -> int:
+    """
+    Run INSERT INTO <model table> SELECT ... for a values().annotate() queryset
+
+    Output names of the queryset must match field names (or attnames) of
+    the target model. The rows never leave the database.
+    """
+    query = queryset.query
+    names = list(query.values_select) + list(query.annotation_select)
+    columns = ', '.join(
+        connection.ops.quote_name(model._meta.get_field(name).column) for name in names
+    )
+    sql, params = query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {connection.ops.quote_name(model._meta.db_table)} ({columns}) {sql}",
+            params,
+        )
+        return max(cursor.rowcount, 0)
+
+
+def _station_rollup_queryset():
+    return ClimateObservation.objects.order_by().values(
+        'station_id', 'year', 'month'
+    ).annotate(**_observation_aggregates())
+
+
+def _region_rollup_queryset():
+    return StationMonthlyRollup.objects.order_by().values(
+        'year', 'month', region_id=F('station__region_id')
+    ).annotate(**_rollup_aggregates())
+
+
+def _group_by_month(partitions: Iterable[Partition]) -> Dict[Tuple[int, int], Set[int]]:
+    """Group (pk, year, month) partitions into {(year, month): {pk, ...}}"""
+    grouped = defaultdict(set)
+    for pk, year, month in partitions:
+        grouped[(int(year), int(month))].add(pk)
+    return grouped
+
+
+def chunked(values: Set[int]):
+    values = sorted(values)
+    for i in range(0, len(values), PARTITION_CHUNK_SIZE):
+        yield values[i:i + PARTITION_CHUNK_SIZE]
+
+
+def rebuild_rollups() -> Dict[str, int]:
+    """Rebuild both rollup tables from scratch"""
+    with transaction.atomic():
+        RegionMonthlyRollup.objects.all().delete()
+        StationMonthlyRollup.objects.all().delete()
+        stations = insert_from_queryset(StationMonthlyRollup, _station_rollup_queryset())
+        regions = insert_from_queryset(RegionMonthlyRollup, _region_rollup_queryset())
+    return {'station_rows': stations, 'region_rows': regions}
+
+
+def refresh_rollups(partitions: Optional[Iterable[Partition]] = None,
+                    region_partitions: Iterable[Partition] = ()) -> Dict[str, Any]:
+    """
+    Recompute rollup rows for the partitions touched by a write
+
+    Station partitions are rebuilt from ClimateObservation and the region
+    partitions they fall into are rebuilt from the station rollup.
+
+    Args:
+        partitions: (station pk, year, month) tuples that changed, or None
+            to rebuild both tables from scratch. Large sets fall back to a
+            full rebuild as well
+        region_partitions: Extra (region pk, year, month) tuples to rebuild,
+            e.g. for a station that was moved to another region or deleted
+
+    Returns:
+        Dictionary with the mode used, rows written and elapsed seconds
+    """
+    start = time.time()
+
+    if partitions is not None:
+        partitions = set(partitions)
+        existing = StationMonthlyRollup.objects.count()
+        if len(partitions) > max(existing * FULL_REBUILD_FRACTION, PARTITION_CHUNK_SIZE):
+            partitions = None
+
+    if partitions is None:
+        stats = rebuild_rollups()
+        stats.update({'mode': 'full', 'seconds': round(time.time() - start, 3)})
+        logger.info(f"Rebuilt rollup tables: {stats}")
+        return stats
+
+    station_months = _group_by_month(partitions)
+    station_regions = dict(
+        WeatherStation.objects.filter(
+            pk__in={pk for pks in station_months.values() for pk in pks}
+        ).values_list('pk', 'region_id')
+    )
+    region_months = _group_by_month(region_partitions)
+    for (year, month), station_pks in station_months.items():
+        region_months[(year, month)].update(
+            station_regions[pk] for pk in station_pks if pk in station_regions
+        )
+
+    stats = {'station_rows': 0, 'region_rows': 0}
+    with transaction.atomic():
+        for (year, month), station_pks in station_months.items():
+            for chunk in chunked(station_pks):
+                StationMonthlyRollup.objects.filter(year=year, month=month, station_id__in=chunk).delete()
+                stats['station_rows'] += insert_from_queryset(
+                    StationMonthlyRollup,
+                    _station_rollup_queryset().filter(year=year, month=month, station_id__in=chunk),
+                )
+
+        for (year, month), region_pks in region_months.items():
+            for chunk in chunked(region_pks):
+                RegionMonthlyRollup.objects.filter(year=year, month=month, region_id__in=chunk).delete()
+                stats['region_rows'] += insert_from_queryset(
+                    RegionMonthlyRollup,
+                    _region_rollup_queryset().filter(year=year, month=month, station__region_id__in=chunk),
+                )
+
+    stats.update({
+        'mode': 'incremental',
+        'partitions': sum(len(pks) for pks in station_months.values()),
+        'seconds': round(time.time() - start, 3),
+    })
+    logger.info(f"Refreshed rollup partitions: {stats}")
+    return stats
+
+
+def station_partitions(station) -> Set[Partition]:
+    """(region pk, year, month) partitions a station currently contributes to"""
+    return {
+        (station.region_id, year, month)
+        for year, month in station.monthly_rollups.values_list('year', 'month')
+    }
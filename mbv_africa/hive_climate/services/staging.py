@@ -0,0 +1,214 @@
+"""
+Staging Table Service
+Loads data into a shadow copy of a table and swaps it in atomically,
+so readers keep seeing the previous generation until the load is done
+"""
+import logging
+from typing import List
+
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.migrations.state import ModelState, ProjectState
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class StagingTable:
+    """
+    Shadow staging table for reload-and-swap loads
+
+    The staging table has the live table's columns and constraints under a
+    generation-specific name. Callers write into ``db_table``, then call
+    ``build_indexes()`` and ``swap()``. The swap renames the tables and
+    drops the old generation in one transaction. If the block exits without
+    a swap, the staging table is dropped.
+
+    Rows written to the live table while a staged load is running are not
+    carried over to the new generation; callers hold
+    data_version.block_writes() around the block to refuse API writes.
+
+    Usage:
+        with block_writes('staged load'), StagingTable(ClimateObservation) as staging:
+            staging.copy_live_rows()
+            ...insert into staging.db_table...
+            staging.build_indexes()
+            staging.swap()
+    """
+
+    def __init__(self, model, using: str = DEFAULT_DB_ALIAS):
+        """
+        Args:
+            model: Live model whose table is being reloaded
+            using: Database alias
+        """
+        self.model = model
+        self.using = using
+        self.connection = connections[using]
+        self.live_table = model._meta.db_table
+        self.generation = timezone.now().strftime('%Y%m%d%H%M%S')
+        self.db_table = f"{self.live_table}_stg{self.generation}"
+        self.retired_table = f"{self.live_table}_old{self.generation}"
+        self.staging_model = self._build_staging_model()
+        self.created = False
+        self.swapped = False
+        self.staged_indexes = []
+
+    def __enter__(self):
+        self.create()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.created and not self.swapped:
+            self.discard()
+        return False
+
+    def _build_staging_model(self):
+        """Render an unregistered model class that maps onto the staging table"""
+        state = ProjectState()
+        pending = [self.model]
+        seen = set()
+        while pending:
+            model = pending.pop()
+            for field in model._meta.get_fields():
+                related = field.related_model if field.concrete else None
+                if related and related not in seen and related is not self.model:
+                    seen.add(related)
+                    pending.append(related)
+        for related in seen:
+            state.add_model(ModelState.from_model(related))
+
+        model_state = ModelState.from_model(self.model)
+        model_state.name = f"{self.model.__name__}Stg{self.generation}"
+        model_state.options = {
+            **model_state.options,
+            'db_table': self.db_table,
+            'indexes': [],  # Built after the load by build_indexes()
+        }
+        state.add_model(model_state)
+        return state.apps.get_model(self.model._meta.app_label, model_state.name)
+
+    def _quote(self, name: str) -> str:
+        return self.connection.ops.quote_name(name)
+
+    def _concrete_columns(self) -> List[str]:
+        return [field.column for field in self.model._meta.concrete_fields]
+
+    def cleanup_abandoned(self):
+        """Drop staging or retired tables left behind by interrupted loads"""
+        prefixes = (f"{self.live_table}_stg", f"{self.live_table}_old")
+        tables = self.connection.introspection.table_names()
+        with self.connection.cursor() as cursor:
+            for table in tables:
+                if table.startswith(prefixes) and table != self.db_table:
+                    logger.warning(f"Dropping abandoned staging table {table}")
+                    cursor.execute(f"DROP TABLE {self._quote(table)}")
+
+    def create(self):
+        """Create the empty staging table with the live table's columns and constraints"""
+        self.cleanup_abandoned()
+        with self.connection.schema_editor() as editor:
+            editor.create_model(self.staging_model)
+        self.created = True
+        logger.info(f"Created staging table {self.db_table}")
+
+    def copy_live_rows(self) -> int:
+        """
+        Seed the staging table with the current live rows
+
+        Keeps primary keys so existing ids stay stable across the swap.
+
+        Returns:
+            Number of rows copied
+        """
+        columns = ', '.join(self._quote(column) for column in self._concrete_columns())
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self._quote(self.db_table)} ({columns}) "
+                f"SELECT {columns} FROM {self._quote(self.live_table)}"
+            )
+            copied = cursor.rowcount
+            for sql in self.connection.ops.sequence_reset_sql(no_style(), [self.staging_model]):
+                cursor.execute(sql)
+        logger.info(f"Copied {copied} live rows into {self.db_table}")
+        return copied
+
+    def build_indexes(self):
+        """
+        Build the live model's Meta.indexes on the staging table
+
+        Backends that can rename indexes get them built here under
+        generation-specific names and renamed during the swap. On SQLite,
+        which cannot rename indexes, they are built inside the swap
+        transaction once the old generation has released the names.
+        """
+        if not self.connection.features.can_rename_index:
+            return
+        with self.connection.schema_editor() as editor:
+            for index in self.model._meta.indexes:
+                staged = index.clone()
+                staged.name = ''
+                staged.set_name_with_model(self.staging_model)
+                editor.add_index(self.staging_model, staged)
+                self.staged_indexes.append((staged, index))
+        logger.info(f"Built {len(self.staged_indexes)} indexes on {self.db_table}")
+
+    def _canonical_index_sql(self) -> List[str]:
+        """CREATE INDEX statements Django would emit for the live table"""
+        with self.connection.schema_editor(collect_sql=True, atomic=False) as editor:
+            editor.create_model(self.model)
+        return [
+            sql.rstrip(';') for sql in editor.collected_sql
+            if sql.startswith(('CREATE INDEX', 'CREATE UNIQUE INDEX'))
+        ]
+
+    def _staged_field_indexes(self, cursor) -> dict:
+        """Indexes on the swapped-in table still named after the staging table"""
+        constraints = self.connection.introspection.get_constraints(cursor, self.live_table)
+        return {
+            name: info for name, info in constraints.items()
+            if self.db_table in name and (info['index'] or info['unique'])
+            and not info['primary_key'] and not info['foreign_key']
+        }
+
+    def swap(self):
+        """
+        Atomically replace the live table with the staging table
+
+        Readers see either the old generation or the complete new one.
+        With SQLite in WAL mode they are not blocked while this runs.
+        Indexes end up with the names migrations expect for the live table.
+        """
+        can_rename = self.connection.features.can_rename_index
+        canonical_sql = [] if can_rename else self._canonical_index_sql()
+        editor = self.connection.schema_editor(collect_sql=True)
+
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {self._quote(self.live_table)} RENAME TO {self._quote(self.retired_table)}")
+            cursor.execute(f"ALTER TABLE {self._quote(self.db_table)} RENAME TO {self._quote(self.live_table)}")
+            cursor.execute(f"DROP TABLE {self._quote(self.retired_table)}")
+
+            staged_field_indexes = self._staged_field_indexes(cursor)
+            if can_rename:
+                for name, info in staged_field_indexes.items():
+                    canonical = editor._create_index_name(
+                        self.live_table, info['columns'], suffix='_uniq' if info['unique'] else ''
+                    )
+                    cursor.execute(str(editor._rename_index_sql(self.model, name, canonical)))
+                for staged, index in self.staged_indexes:
+                    cursor.execute(str(editor._rename_index_sql(self.model, staged.name, index.name)))
+            else:
+                for name in staged_field_indexes:
+                    cursor.execute(f"DROP INDEX {self._quote(name)}")
+                for sql in canonical_sql:
+                    cursor.execute(sql)
+
+        self.swapped = True
+        logger.info(f"Swapped {self.db_table} in as {self.live_table}")
+
+    def discard(self):
+        """Drop the staging table without touching the live table"""
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {self._quote(self.db_table)}")
+        self.created = False
+        logger.info(f"Discarded staging table {self.db_table}")
@@ -0,0 +1,115 @@
+"""
+Statistics Service
+Maintains the single-row DataStatistics snapshot. Observation counts come
+from the region rollups and date bounds from the observation_date index,
+so a refresh never scans the observation table.
+"""
+import logging
+from typing import Optional
+
+from django.db import connection, transaction
+from django.db.models import Max, Min, Sum
+
+from hive_climate.models import (
+    ClimateObservation, DataStatistics, Region, RegionMonthlyRollup, WeatherStation,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _database_bytes() -> Optional[int]:
+    """Size of the whole database, if the backend reports it cheaply"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('PRAGMA page_count')
+            page_count = cursor.fetchone()[0]
+            cursor.execute('PRAGMA page_size')
+            return page_count * cursor.fetchone()[0]
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_database_size(current_database())')
+            return cursor.fetchone()[0]
+    return None
+
+
+def _table_bytes(table: str) -> Optional[int]:
+    """
+    On-disk size of a table including its indexes
+
+    On SQLite this walks the table's pages through the dbstat virtual
+    table, so it is only measured on full refreshes.
+    """
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name = %s "
+                    "OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s)",
+                    [table, table]
+                )
+                return cursor.fetchone()[0]
+            if connection.vendor == 'postgresql':
+                cursor.execute('SELECT pg_total_relation_size(%s)', [table])
+                return cursor.fetchone()[0]
+    except Exception as e:
+        # dbstat is a compile-time option of SQLite
+        logger.warning(f"Could not measure size of {table}: {str(e)}")
+    return None
+
+
+def _observation_bytes(observation_count: int, previous: Optional[DataStatistics], measure: bool) -> Optional[int]:
+    """Measured observation table size, or the previous size scaled to the new row count"""
+    if measure or connection.vendor != 'sqlite':
+        return _table_bytes(ClimateObservation._meta.db_table)
+    if previous is None or not previous.observation_bytes or not previous.observation_count:
+        return None
+    return round(previous.observation_bytes / previous.observation_count * observation_count)
+
+
+def refresh_statistics(full: bool = True) -> DataStatistics:
+    """
+    Recompute the statistics snapshot
+
+    Must run after the rollups are refreshed, since observation counts
+    are read from them.
+
+    Args:
+        full: Measure table sizes even where that is expensive
+
+    Returns:
+        The updated DataStatistics row
+    """
+    totals = RegionMonthlyRollup.objects.aggregate(
+        observations=Sum('observation_count'),
+        coastal_observations=Sum('sea_surface_temp_count'),
+    )
+    observation_count = totals['observations'] or 0
+    date_range = ClimateObservation.objects.aggregate(
+        first_date=Min('observation_date'),
+        last_date=Max('observation_date'),
+    )
+    stations = WeatherStation.objects.all()
+
+    with transaction.atomic():
+        previous = DataStatistics.objects.select_for_update().filter(pk=1).first()
+        snapshot, _ = DataStatistics.objects.update_or_create(pk=1, defaults={
+            'observation_count': observation_count,
+            'station_count': stations.count(),
+            'active_station_count': stations.filter(is_active=True).count(),
+            'coastal_station_count': stations.filter(is_coastal=True).count(),
+            'region_count': Region.objects.count(),
+            'country_count': stations.values('country').distinct().count(),
+            'coastal_observation_count': totals['coastal_observations'] or 0,
+            'first_observation_date': date_range['first_date'],
+            'last_observation_date': date_range['last_date'],
+            'observation_bytes': _observation_bytes(observation_count, previous, full),
+            'database_bytes': _database_bytes(),
+        })
+    return snapshot
+
+
+def get_statistics() -> DataStatistics:
+    """Current statistics snapshot, built on first use after an upgrade"""
+    snapshot = DataStatistics.objects.filter(pk=1).first()
+    if snapshot is None:
+        snapshot = refresh_statistics()
+    return snapshot
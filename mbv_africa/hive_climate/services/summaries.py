@@ -0,0 +1,121 @@
+"""
+Summary Service
+Maintains per-station and per-region observation counters so summary
+views read one row per station or region instead of counting
+observations on every request.
+"""
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Sum
+
+from hive_climate.models import (
+    ClimateObservation, Region, RegionSummary, StationSummary, WeatherStation,
+)
+from hive_climate.services.rollups import chunked, insert_from_queryset
+
+logger = logging.getLogger(__name__)
+
+
+def _station_summary_queryset():
+    return ClimateObservation.objects.order_by().values('station_id').annotate(
+        observation_count=Count('id'),
+        coastal_observation_count=Count('sea_surface_temp'),
+        first_observation_date=Min('observation_date'),
+        last_observation_date=Max('observation_date'),
+    )
+
+
+def refresh_station_summaries(station_pks: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute station counters from ClimateObservation
+
+    Args:
+        station_pks: Stations whose observations changed, or None to
+            rebuild every station
+
+    Returns:
+        Number of summary rows written
+    """
+    if station_pks is None:
+        StationSummary.objects.all().delete()
+        return insert_from_queryset(StationSummary, _station_summary_queryset())
+
+    rows = 0
+    for chunk in chunked(set(station_pks)):
+        StationSummary.objects.filter(station_id__in=chunk).delete()
+        rows += insert_from_queryset(
+            StationSummary, _station_summary_queryset().filter(station_id__in=chunk)
+        )
+    return rows
+
+
+def refresh_region_summaries() -> int:
+    """
+    Recompute every region's counters from the station summaries
+
+    There are only a handful of regions, so they are always rebuilt;
+    this also picks up stations that were added, moved or deleted.
+
+    Returns:
+        Number of summary rows written
+    """
+    station_counts = dict(
+        WeatherStation.objects.order_by().values('region_id').annotate(
+            count=Count('id')
+        ).values_list('region_id', 'count')
+    )
+    totals = {
+        item['region_id']: item
+        for item in StationSummary.objects.order_by().values(
+            region_id=F('station__region_id')
+        ).annotate(
+            observations=Sum('observation_count'),
+            coastal_observations=Sum('coastal_observation_count'),
+            first_date=Min('first_observation_date'),
+            last_date=Max('last_observation_date'),
+        )
+    }
+
+    summaries = []
+    for region_pk in Region.objects.values_list('pk', flat=True):
+        item = totals.get(region_pk, {})
+        summaries.append(RegionSummary(
+            region_id=region_pk,
+            station_count=station_counts.get(region_pk, 0),
+            observation_count=item.get('observations') or 0,
+            coastal_observation_count=item.get('coastal_observations') or 0,
+            first_observation_date=item.get('first_date'),
+            last_observation_date=item.get('last_date'),
+        ))
+
+    RegionSummary.objects.all().delete()
+    RegionSummary.objects.bulk_create(summaries)
+    return len(summaries)
+
+
+def refresh_summaries(station_pks: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+    """
+    Refresh station counters for the given stations and all region counters
+
+    Args:
+        station_pks: Stations whose observations changed, or None to
+            rebuild every station
+
+    Returns:
+        Dictionary with rows written and elapsed seconds
+    """
+    start = time.time()
+    with transaction.atomic():
+        stations = refresh_station_summaries(station_pks)
+        regions = refresh_region_summaries()
+    stats = {
+        'mode': 'full' if station_pks is None else 'incremental',
+        'station_rows': stations,
+        'region_rows': regions,
+        'seconds': round(time.time() - start, 3),
+    }
+    logger.info(f"Refreshed observation summaries: {stats}")
+    return stats
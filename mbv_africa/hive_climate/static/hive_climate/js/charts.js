@@ -1,33 +1,326 @@
+// Chart initializers per tab, called with the tab's chart data
+const tabInitializers = {
+    ml: initializeMLCharts,
+    trends: initializeTrendsCharts,
+};
+
 // Tab Navigation
 function switchTab(tabName) {
     // Hide all tab contents
     document.querySelectorAll('.tab-content').forEach(content => {
         content.classList.remove('active');
     });
-    
+
     // Remove active class from all buttons
     document.querySelectorAll('.tab-button').forEach(button => {
         button.classList.remove('active');
     });
-    
+
     // Show selected tab content
-    document.getElementById(tabName).classList.add('active');
-    
+    const content = document.getElementById(tabName);
+    content.classList.add('active');
+
     // Add active class to clicked button
     document.querySelector(`[data-tab="${tabName}"]`).classList.add('active');
-    
-    // Initialize charts if needed
-    if (tabName === 'trends' && typeof initializeTrendsCharts === 'function') {
-        setTimeout(initializeTrendsCharts, 100);
+
+    // Fetch the tab on first activation
+    if (content.dataset.src && !content.dataset.loaded) {
+        loadTab(content);
+    }
+}
+
+// Fetch a tab's rendered HTML and chart data from its JSON endpoint
+function loadTab(content) {
+    content.dataset.loaded = 'loading';
+    fetch(content.dataset.src, { headers: { 'Accept': 'application/json' } })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            return response.json();
+        })
+        .then(payload => {
+            content.innerHTML = payload.html;
+            content.dataset.loaded = 'true';
+            const initialize = tabInitializers[payload.tab];
+            if (initialize) {
+                initialize(payload.charts);
+            }
+        })
+        .catch(error => {
+            // Allow a retry on the next activation
+            delete content.dataset.loaded;
+            content.innerHTML = `<p class="text-sm text-muted">Could not load this tab (${error.message}).</p>`;
+        });
+}
+
+// ETL tab: show the Hive query of a pipeline step
+function toggleQuery(stepId) {
+    const queryDiv = document.getElementById('query-' + stepId);
+    if (queryDiv.style.display === 'none') {
+        // Hide all other queries first
+        document.querySelectorAll('.query-section').forEach(q => q.style.display = 'none');
+        queryDiv.style.display = 'block';
+    } else {
+        queryDiv.style.display = 'none';
+    }
+}
+
+// ML tab charts
+function initializeMLCharts(charts) {
+    const monthlyPredictions = charts.monthly_predictions || [];
+
+    // Prediction vs Actual Line Chart
+    const predCtx = document.getElementById('predictionChart');
+    if (predCtx && monthlyPredictions.length > 0) {
+        new Chart(predCtx, {
+            type: 'line',
+            data: {
+                labels: monthlyPredictions.map(d => d.month),
+                datasets: [
+                    {
+                        label: 'Actual Temperature',
+                        data: monthlyPredictions.map(d => d.actual),
+                        borderColor: '#10b981',
+                        backgroundColor: 'rgba(16, 185, 129, 0.1)',
+                        tension: 0.4,
+                        fill: true
+                    },
+                    {
+                        label: 'Predicted Temperature',
+                        data: monthlyPredictions.map(d => d.predicted),
+                        borderColor: '#3b82f6',
+                        backgroundColor: 'rgba(59, 130, 246, 0.1)',
+                        borderDash: [5, 5],
+                        tension: 0.4
+                    }
+                ]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    legend: { position: 'bottom' }
+                },
+                scales: {
+                    y: {
+                        title: { display: true, text: 'Temperature (°C)' }
+                    }
+                }
+            }
+        });
+    }
+
+    // Scatter Plot - Actual vs Predicted
+    const scatterCtx = document.getElementById('scatterChart');
+    const actuals = charts.actuals || [];
+    const predictions = charts.predictions || [];
+
+    if (scatterCtx && actuals.length > 0) {
+        const scatterData = actuals.map((a, i) => ({ x: a, y: predictions[i] }));
+
+        // Calculate min/max for diagonal line
+        const allVals = [...actuals, ...predictions];
+        const minVal = Math.min(...allVals) - 2;
+        const maxVal = Math.max(...allVals) + 2;
+
+        new Chart(scatterCtx, {
+            type: 'scatter',
+            data: {
+                datasets: [
+                    {
+                        label: 'Predictions',
+                        data: scatterData,
+                        backgroundColor: 'rgba(59, 130, 246, 0.6)',
+                        pointRadius: 4
+                    },
+                    {
+                        label: 'Perfect Prediction',
+                        data: [{ x: minVal, y: minVal }, { x: maxVal, y: maxVal }],
+                        type: 'line',
+                        borderColor: '#10b981',
+                        borderDash: [5, 5],
+                        pointRadius: 0,
+                        fill: false
+                    }
+                ]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    legend: { position: 'bottom' }
+                },
+                scales: {
+                    x: { title: { display: true, text: 'Actual Temperature (°C)' } },
+                    y: { title: { display: true, text: 'Predicted Temperature (°C)' } }
+                }
+            }
+        });
+    }
+}
+
+// Trends tab charts
+function initializeTrendsCharts(charts) {
+    const temperatureData = charts.temperature_trends || [];
+
+    // Temperature Anomalies Chart
+    const tempCtx = document.getElementById('temperatureChart');
+    if (tempCtx) {
+        new Chart(tempCtx, {
+            type: 'line',
+            data: {
+                labels: temperatureData.map(d => d.year),
+                datasets: [
+                    {
+                        label: 'East Africa',
+                        data: temperatureData.map(d => d.east),
+                        borderColor: '#10b981',
+                        backgroundColor: 'rgba(16, 185, 129, 0.1)',
+                        tension: 0.4
+                    },
+                    {
+                        label: 'West Africa',
+                        data: temperatureData.map(d => d.west),
+                        borderColor: '#f59e0b',
+                        backgroundColor: 'rgba(245, 158, 11, 0.1)',
+                        tension: 0.4
+                    },
+                    {
+                        label: 'North Africa',
+                        data: temperatureData.map(d => d.north),
+                        borderColor: '#3b82f6',
+                        backgroundColor: 'rgba(59, 130, 246, 0.1)',
+                        tension: 0.4
+                    },
+                    {
+                        label: 'South Africa',
+                        data: temperatureData.map(d => d.south),
+                        borderColor: '#8b5cf6',
+                        backgroundColor: 'rgba(139, 92, 246, 0.1)',
+                        tension: 0.4
+                    },
+                    {
+                        label: 'Central Africa',
+                        data: temperatureData.map(d => d.central),
+                        borderColor: '#ef4444',
+                        backgroundColor: 'rgba(239, 68, 68, 0.1)',
+                        tension: 0.4
+                    }
+                ]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    legend: {
+                        position: 'bottom'
+                    }
+                },
+                scales: {
+                    y: {
+                        beginAtZero: true
+                    }
+                }
+            }
+        });
+    }
+
+    // Precipitation Chart
+    const precipitationData = charts.precipitation_data || [];
+    const precipCtx = document.getElementById('precipitationChart');
+    if (precipCtx) {
+        new Chart(precipCtx, {
+            type: 'bar',
+            data: {
+                labels: precipitationData.map(d => d.region),
+                datasets: [
+                    {
+                        label: 'Actual 2024',
+                        data: precipitationData.map(d => d.actual),
+                        backgroundColor: '#10b981'
+                    },
+                    {
+                        label: 'ML Predicted',
+                        data: precipitationData.map(d => d.predicted),
+                        backgroundColor: '#3b82f6'
+                    },
+                    {
+                        label: '30-yr Baseline',
+                        data: precipitationData.map(d => d.baseline),
+                        backgroundColor: '#6b7280'
+                    }
+                ]
+            },
+            options: {
+                indexAxis: 'y',
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    legend: {
+                        position: 'bottom'
+                    }
+                }
+            }
+        });
+    }
+
+    // Ocean Chart
+    const oceanData = charts.ocean_data || [];
+    const oceanCtx = document.getElementById('oceanChart');
+    if (oceanCtx) {
+        new Chart(oceanCtx, {
+            type: 'line',
+            data: {
+                labels: oceanData.map(d => d.month),
+                datasets: [
+                    {
+                        label: 'SST (°C)',
+                        data: oceanData.map(d => d.sst),
+                        borderColor: '#10b981',
+                        backgroundColor: 'rgba(16, 185, 129, 0.1)',
+                        yAxisID: 'y',
+                        tension: 0.4
+                    },
+                    {
+                        label: 'Salinity (PSU)',
+                        data: oceanData.map(d => d.salinity),
+                        borderColor: '#3b82f6',
+                        backgroundColor: 'rgba(59, 130, 246, 0.1)',
+                        yAxisID: 'y1',
+                        tension: 0.4
+                    }
+                ]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    legend: {
+                        position: 'bottom'
+                    }
+                },
+                scales: {
+                    y: {
+                        type: 'linear',
+                        display: true,
+                        position: 'left'
+                    },
+                    y1: {
+                        type: 'linear',
+                        display: true,
+                        position: 'right',
+                        grid: {
+                            drawOnChartArea: false
+                        }
+                    }
+                }
+            }
+        });
     }
 }
 
 // Initialize default tab on load
 document.addEventListener('DOMContentLoaded', function() {
     switchTab('schema');
-    
-    // Initialize Chart.js if available
-    if (typeof Chart !== 'undefined') {
-        // Charts will be initialized by individual tab scripts
-    }
 });
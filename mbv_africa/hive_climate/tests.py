@@ -1,3 +1,140 @@
+import uuid
+
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from hive_climate.models import ClimateObservation, DataVersion, Region, WeatherStation
+from hive_climate.services.data_version import versioned_cache_key
+
+
+class StationRegionQueryCountTests(TestCase):
+    """
+    Station and region endpoints run a fixed number of queries
+
+    Each endpoint is checked at two result sizes: a per-object query
+    (e.g. a station_count or region lookup per row) would make the count
+    grow with the page.
+    """
+    SIZES = [2, 20]
+
+    def setUp(self):
+        self.region = Region.objects.create(name='West Africa', code='WA')
+        self.station = self.add_stations(self.region, 1)[0]
+
+    def add_stations(self, region, count):
+        start = WeatherStation.objects.count()
+        return WeatherStation.objects.bulk_create([
+            WeatherStation(
+                station_id=f'ST{start + i:05d}', station_name=f'Station {start + i}',
+                country='GH', region=region, latitude=5.6, longitude=-0.2,
+            )
+            for i in range(count)
+        ])
+
+    def fill_to(self, model, size, create):
+        """Top the table up to size rows"""
+        missing = size - model.objects.count()
+        if missing > 0:
+            create(missing)
+
+    def add_regions(self, count):
+        start = Region.objects.count()
+        regions = Region.objects.bulk_create([
+            Region(name=f'Region {start + i}', code=f'R{start + i}') for i in range(count)
+        ])
+        for region in regions:
+            self.add_stations(region, 2)
+
+    def assert_queries(self, url, queries, expected_rows):
+        with self.assertNumQueries(queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        rows = data['results'] if isinstance(data, dict) and 'results' in data else data
+        if expected_rows is not None:
+            self.assertEqual(len(rows), expected_rows)
+        return data
+
+    def test_region_list(self):
+        for size in self.SIZES:
+            with self.subTest(size=size):
+                self.fill_to(Region, size, self.add_regions)
+                data = self.assert_queries('/api/regions/', 3, size)
+                counts = {row['code']: row['station_count'] for row in data['results']}
+                self.assertEqual(counts['WA'], 1)
+
+    def test_station_list(self):
+        for size in self.SIZES:
+            with self.subTest(size=size):
+                self.fill_to(WeatherStation, size, lambda count: self.add_stations(self.region, count))
+                data = self.assert_queries('/api/stations/', 3, size)
+                self.assertEqual(data['results'][0]['region_name'], 'West Africa')
+
+    def test_station_detail(self):
+        for size in self.SIZES:
+            with self.subTest(size=size):
+                self.fill_to(WeatherStation, size, lambda count: self.add_stations(self.region, count))
+                data = self.assert_queries(f'/api/stations/{self.station.pk}/', 1, None)
+                self.assertEqual(data['station_id'], self.station.station_id)
+
+    def test_region_stations(self):
+        for size in self.SIZES:
+            with self.subTest(size=size):
+                self.fill_to(WeatherStation, size, lambda count: self.add_stations(self.region, count))
+                self.assert_queries(f'/api/regions/{self.region.pk}/stations/', 2, size)
+
+
+class IngestTests(TestCase):
+    def setUp(self):
+        region = Region.objects.create(name='West Africa', code='WA')
+        self.station = WeatherStation.objects.create(
+            station_id='GH001', station_name='Accra', country='GH', region=region,
+            latitude=5.6, longitude=-0.2,
+        )
+        self.client.force_login(User.objects.create_user('ingest'))
+
+    def ingest(self, body, content_type):
+        return self.client.post('/api/observations/ingest/', body, content_type=content_type)
+
+    def test_non_finite_values_are_rejected_per_row_in_csv(self):
+        response = self.ingest(
+            'station_id,observation_date,temp_mean\n'
+            'GH001,2024-07-01,inf\n'
+            'GH001,2024-07-02,4\n'
+            'GH001,2024-07-03,1e400\n',
+            'text/csv',
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['created'], 1)
+        self.assertEqual([reject['row'] for reject in data['rejects']], [1, 3])
+        self.assertEqual(data['rejects'][0]['errors'], ['temp_mean is not a finite number'])
+        self.assertEqual(
+            list(ClimateObservation.objects.values_list('observation_date__day', 'temp_mean')), [(2, 4.0)]
+        )
+
+    def test_non_finite_values_are_rejected_per_row_in_ndjson(self):
+        response = self.ingest(
+            '{"station_id": "GH001", "observation_date": "2024-07-01", "temp_mean": -Infinity}\n'
+            '{"station_id": "GH001", "observation_date": "2024-07-02", "temp_mean": 4}\n',
+            'application/x-ndjson',
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['created'], 1)
+        self.assertEqual([reject['row'] for reject in data['rejects']], [1])
+        self.assertEqual(ClimateObservation.objects.count(), 1)
+
+
+class DataVersionInstanceTests(TestCase):
+    """Databases at the same version number don't share cache keys or ETags"""
+
+    def test_cache_key_and_etag_change_with_the_database_instance(self):
+        key = versioned_cache_key('dashboard')
+        etag = self.client.get('/api/regions/')['ETag']
+
+        # Same version number, different database
+        DataVersion.objects.filter(pk=1).update(instance=uuid.uuid4())
+
+        self.assertNotEqual(versioned_cache_key('dashboard'), key)
+        self.assertNotEqual(self.client.get('/api/regions/')['ETag'], etag)
@@ -5,4 +5,5 @@ app_name = 'hive_climate'
 
 urlpatterns = [
     path('', views.dashboard_view, name='dashboard'),
+    path('tabs/<str:tab>/', views.dashboard_tab_view, name='dashboard_tab'),
 ]
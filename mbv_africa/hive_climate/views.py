@@ -2,33 +2,35 @@
 Views for hive_climate app
 Dynamic data retrieval from SQLite database with Hive fallback
 """
+import time
+
+from django.http import Http404, JsonResponse
 from django.shortcuts import render, get_object_or_404
-from django.db.models import Avg, Count, Min, Max, Sum
-from django.db.models.functions import TruncMonth, TruncYear
+from django.template.loader import render_to_string
+from django.db.models import Avg, F, Sum
+from django.db.models.functions import Coalesce, TruncMonth, TruncYear
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 
 from hive_climate.models import (
     Region, WeatherStation, ClimateObservation, 
-    DataImportLog, HiveQueryLog
+    DataImportLog, HiveQueryLog, RegionMonthlyRollup, RegionAnomaly
 )
 from hive_climate.hive_connector import is_hive_available, is_hive_enabled
+from hive_climate.services.data_version import versioned_cache
+from hive_climate.services.rollups import rollup_average
+from hive_climate.services.statistics import get_statistics
 
 
+@versioned_cache('dashboard_stats')
 def get_dashboard_stats():
-    """Get real statistics from the database"""
-    stations_count = WeatherStation.objects.filter(is_active=True).count()
-    observations_count = ClimateObservation.objects.count()
-    countries = WeatherStation.objects.values('country').distinct().count()
-    regions_count = Region.objects.count()
-    
-    # Get date range
-    date_range = ClimateObservation.objects.aggregate(
-        min_date=Min('observation_date'),
-        max_date=Max('observation_date')
-    )
+    """Get real statistics from the maintained statistics snapshot"""
+    snapshot = get_statistics()
+    stations_count = snapshot.active_station_count
+    observations_count = snapshot.observation_count
     
-    min_year = date_range['min_date'].year if date_range['min_date'] else 'N/A'
-    max_year = date_range['max_date'].year if date_range['max_date'] else 'N/A'
+    min_year = snapshot.first_observation_date.year if snapshot.first_observation_date else 'N/A'
+    max_year = snapshot.last_observation_date.year if snapshot.last_observation_date else 'N/A'
     
     # Format large numbers
     if observations_count >= 1000000:
@@ -38,8 +40,11 @@ def get_dashboard_stats():
     else:
         obs_str = str(observations_count)
     
-    # Calculate data size estimate (rough approximation)
-    data_size_mb = observations_count * 0.0005  # ~0.5KB per record
+    # Measured table size, or a rough estimate (~0.5KB per record)
+    if snapshot.observation_bytes is not None:
+        data_size_mb = snapshot.observation_bytes / (1024 * 1024)
+    else:
+        data_size_mb = observations_count * 0.0005
     if data_size_mb >= 1024:
         data_size_str = f"{data_size_mb / 1024:.1f} GB"
     else:
@@ -48,15 +53,17 @@ def get_dashboard_stats():
     return {
         'total_records': obs_str,
         'stations': f"{stations_count:,}",
-        'countries': str(countries),
-        'regions': str(regions_count),
+        'countries': str(snapshot.country_count),
+        'regions': str(snapshot.region_count),
         'date_range': f"{min_year} - {max_year}",
         'observations_count': observations_count,
         'stations_count': stations_count,
+        'coastal_observations_count': snapshot.coastal_observation_count,
         'data_size': data_size_str,
     }
 
 
+@versioned_cache('sample_observations')
 def get_sample_observations(limit=10):
     """Get sample observations with station data"""
     observations = ClimateObservation.objects.select_related(
@@ -87,26 +94,23 @@ def get_sample_observations(limit=10):
     return sample_data
 
 
+@versioned_cache('temperature_trends')
 def get_temperature_trends():
     """Get temperature anomaly trends by year and region"""
-    # Get yearly averages by region
-    trends_qs = ClimateObservation.objects.filter(
-        temp_mean__isnull=False
-    ).values('year', 'station__region__name').annotate(
-        avg_temp=Avg('temp_mean')
+    # Yearly anomaly = mean of the monthly anomalies against each region's
+    # own climatology (see services.climatology)
+    trends_qs = RegionAnomaly.objects.filter(
+        temp_mean_anomaly__isnull=False
+    ).values('year', 'region__name').annotate(
+        anomaly=Avg('temp_mean_anomaly')
     ).order_by('year')
     
-    # Calculate baseline (average of all temps)
-    baseline = ClimateObservation.objects.filter(
-        temp_mean__isnull=False
-    ).aggregate(baseline=Avg('temp_mean'))['baseline'] or 25.0
-    
     # Group by year
     years_data = {}
     for item in trends_qs:
         year = str(item['year'])
-        region = (item['station__region__name'] or 'Unknown').lower().split()[0]
-        anomaly = round((item['avg_temp'] or 0) - baseline, 1)
+        region = (item['region__name'] or 'Unknown').lower().split()[0]
+        anomaly = round(item['anomaly'], 1)
         
         if year not in years_data:
             years_data[year] = {'year': year}
@@ -125,20 +129,21 @@ def get_temperature_trends():
     return trends[-10:] if len(trends) > 10 else trends
 
 
+@versioned_cache('precipitation_by_region')
 def get_precipitation_by_region():
     """Get precipitation statistics by region"""
-    precip_data = ClimateObservation.objects.filter(
-        precipitation__isnull=False
-    ).values('station__region__name').annotate(
-        total=Sum('precipitation'),
-        avg=Avg('precipitation'),
-        count=Count('id')
-    ).order_by('station__region__name')
+    precip_data = RegionMonthlyRollup.objects.filter(
+        precipitation_count__gt=0
+    ).values('region__name').annotate(
+        total=Sum('precipitation_sum'),
+        count=Sum('precipitation_count')
+    ).order_by('region__name')
     
     result = []
     for item in precip_data:
-        region_name = item['station__region__name'] or 'Unknown'
-        actual = round(item['avg'] * 12, 0) if item['avg'] else 0
+        region_name = item['region__name'] or 'Unknown'
+        avg = rollup_average(item['total'], item['count'])
+        actual = round(avg * 12, 0) if avg else 0
         baseline = actual * 1.1
         predicted = actual * 0.98
         
@@ -152,13 +157,17 @@ def get_precipitation_by_region():
     return result
 
 
+@versioned_cache('ocean_data')
 def get_ocean_data():
     """Get monthly ocean data (SST and salinity)"""
-    ocean_qs = ClimateObservation.objects.filter(
-        sea_surface_temp__isnull=False
+    ocean_qs = RegionMonthlyRollup.objects.filter(
+        sea_surface_temp_count__gt=0
     ).values('month').annotate(
-        avg_sst=Avg('sea_surface_temp'),
-        avg_salinity=Avg('ocean_salinity')
+        sst_sum=Sum('sea_surface_temp_sum'),
+        sst_count=Sum('sea_surface_temp_count'),
+        # Salinity only from readings that also have an SST, as in the API's ocean_conditions
+        salinity_sum=Sum('sst_salinity_sum'),
+        salinity_count=Sum('sst_salinity_count')
     ).order_by('month')
     
     month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
@@ -168,35 +177,37 @@ def get_ocean_data():
     for item in ocean_qs:
         month_idx = item['month'] - 1
         if 0 <= month_idx < 12:
+            avg_sst = rollup_average(item['sst_sum'], item['sst_count'])
+            avg_salinity = rollup_average(item['salinity_sum'], item['salinity_count'])
             result.append({
                 'month': month_names[month_idx],
-                'sst': round(item['avg_sst'], 1) if item['avg_sst'] else None,
-                'salinity': round(item['avg_salinity'], 1) if item['avg_salinity'] else None,
+                'sst': round(avg_sst, 1) if avg_sst else None,
+                'salinity': round(avg_salinity, 1) if avg_salinity else None,
             })
     
     return result
 
 
+@versioned_cache('regions_summary')
 def get_regions_summary():
     """Get summary of regions with station counts"""
     regions = Region.objects.annotate(
-        station_count=Count('stations'),
-        observation_count=Count('stations__observations')
+        station_count=Coalesce('summary__station_count', 0),
+        observation_count=Coalesce('summary__observation_count', 0)
     ).values('name', 'code', 'station_count', 'observation_count')
     
     return list(regions)
 
 
-def get_etl_pipeline_status():
+@versioned_cache('etl_pipeline_status')
+def get_etl_pipeline_status(hive_available=False):
     """Get real ETL pipeline status from database"""
     stats = get_dashboard_stats()
     
     # Check what data exists
     has_stations = stats['stations_count'] > 0
     has_observations = stats['observations_count'] > 0
-    has_coastal_data = ClimateObservation.objects.filter(
-        sea_surface_temp__isnull=False
-    ).exists()
+    has_coastal_data = stats['coastal_observations_count'] > 0
     
     # Get last import log
     last_import = DataImportLog.objects.order_by('-start_time').first()
@@ -289,7 +300,7 @@ GROUP BY region, year, month;''',
                 'Bucket by station_id (32 buckets) for efficient joins',
                 'SNAPPY compression for 75% size reduction',
             ],
-            'status': 'complete' if is_hive_available() else 'pending',
+            'status': 'complete' if hive_available else 'pending',
             'hive_query': '''-- Load to final ORC table
 INSERT OVERWRITE TABLE africa_climate_observations
 PARTITION (year, region)
@@ -304,48 +315,64 @@ DISTRIBUTE BY station_id;''',
     return pipeline_steps
 
 
-def dashboard_view(request):
-    """Main dashboard view with dynamic data from database"""
-    
-    # Import ML models here to avoid circular imports
-    from hive_climate.ml_models import train_temperature_model, get_monthly_predictions
-    
-    # Get database connection status
-    hive_status = {
-        'enabled': is_hive_enabled(),
-        'available': is_hive_available() if is_hive_enabled() else False,
-    }
-    
-    # Get real stats from database
-    stats = get_dashboard_stats()
-    
-    # Table Schema (static - describes the Hive table structure)
-    table_schema = {
-        'name': 'africa_climate_observations',
-        'format': 'ORC',
-        'compression': 'SNAPPY',
-        'partitioned_by': ['year', 'region'],
-        'clustered_by': 'station_id',
-        'columns': [
-            {'name': 'station_id', 'type': 'STRING', 'description': 'Unique weather station identifier'},
-            {'name': 'station_name', 'type': 'STRING', 'description': 'Weather station name'},
-            {'name': 'country', 'type': 'STRING', 'description': 'African country code (ISO 3166)'},
-            {'name': 'region', 'type': 'STRING', 'description': 'Geographic region (East, West, North, South, Central)'},
-            {'name': 'latitude', 'type': 'DOUBLE', 'description': 'Station latitude coordinate'},
-            {'name': 'longitude', 'type': 'DOUBLE', 'description': 'Station longitude coordinate'},
-            {'name': 'observation_date', 'type': 'DATE', 'description': 'Date of observation'},
-            {'name': 'year', 'type': 'INT', 'description': 'Observation year (partition key)'},
-            {'name': 'month', 'type': 'INT', 'description': 'Observation month'},
-            {'name': 'temp_max', 'type': 'DOUBLE', 'description': 'Maximum temperature (°C)'},
-            {'name': 'temp_min', 'type': 'DOUBLE', 'description': 'Minimum temperature (°C)'},
-            {'name': 'temp_mean', 'type': 'DOUBLE', 'description': 'Mean temperature (°C)'},
-            {'name': 'precipitation', 'type': 'DOUBLE', 'description': 'Precipitation amount (mm)'},
-            {'name': 'humidity', 'type': 'DOUBLE', 'description': 'Relative humidity (%)'},
-            {'name': 'sea_surface_temp', 'type': 'DOUBLE', 'description': 'Sea surface temperature (°C) - coastal stations'},
-            {'name': 'ocean_salinity', 'type': 'DOUBLE', 'description': 'Ocean salinity (PSU) - coastal stations'},
-        ]
+# Table Schema (static - describes the Hive table structure)
+TABLE_SCHEMA = {
+    'name': 'africa_climate_observations',
+    'format': 'ORC',
+    'compression': 'SNAPPY',
+    'partitioned_by': ['year', 'region'],
+    'clustered_by': 'station_id',
+    'columns': [
+        {'name': 'station_id', 'type': 'STRING', 'description': 'Unique weather station identifier'},
+        {'name': 'station_name', 'type': 'STRING', 'description': 'Weather station name'},
+        {'name': 'country', 'type': 'STRING', 'description': 'African country code (ISO 3166)'},
+        {'name': 'region', 'type': 'STRING', 'description': 'Geographic region (East, West, North, South, Central)'},
+        {'name': 'latitude', 'type': 'DOUBLE', 'description': 'Station latitude coordinate'},
+        {'name': 'longitude', 'type': 'DOUBLE', 'description': 'Station longitude coordinate'},
+        {'name': 'observation_date', 'type': 'DATE', 'description': 'Date of observation'},
+        {'name': 'year', 'type': 'INT', 'description': 'Observation year (partition key)'},
+        {'name': 'month', 'type': 'INT', 'description': 'Observation month'},
+        {'name': 'temp_max', 'type': 'DOUBLE', 'description': 'Maximum temperature (°C)'},
+        {'name': 'temp_min', 'type': 'DOUBLE', 'description': 'Minimum temperature (°C)'},
+        {'name': 'temp_mean', 'type': 'DOUBLE', 'description': 'Mean temperature (°C)'},
+        {'name': 'precipitation', 'type': 'DOUBLE', 'description': 'Precipitation amount (mm)'},
+        {'name': 'humidity', 'type': 'DOUBLE', 'description': 'Relative humidity (%)'},
+        {'name': 'sea_surface_temp', 'type': 'DOUBLE', 'description': 'Sea surface temperature (°C) - coastal stations'},
+        {'name': 'ocean_salinity', 'type': 'DOUBLE', 'description': 'Ocean salinity (PSU) - coastal stations'},
+    ]
+}
+
+# Hive Optimizations
+HIVE_OPTIMIZATIONS = [
+    {'name': 'Vectorized ORC Reads', 'description': 'Process 1024 rows per batch', 'setting': 'SET hive.vectorized.execution.enabled = true;'},
+    {'name': 'Predicate Pushdown', 'description': 'Filter at storage layer', 'setting': 'SET hive.optimize.ppd = true;'},
+    {'name': 'Cost-Based Optimizer', 'description': 'Statistics-driven query plans', 'setting': 'SET hive.cbo.enable = true;'},
+    {'name': 'Dynamic Partitioning', 'description': 'Auto-create partitions on INSERT', 'setting': 'SET hive.exec.dynamic.partition.mode = nonstrict;'},
+    {'name': 'Map-Side Join', 'description': 'Broadcast small tables to mappers', 'setting': 'SET hive.auto.convert.join = true;'},
+]
+
+# Dashboard tabs and their templates; 'schema' is rendered with the page,
+# the others are fetched from dashboard_tab_view on first activation
+DASHBOARD_TABS = {
+    'schema': 'hive_climate/tabs/schema.html',
+    'data': 'hive_climate/tabs/data_preview.html',
+    'etl': 'hive_climate/tabs/etl_pipeline.html',
+    'ml': 'hive_climate/tabs/ml_metrics.html',
+    'trends': 'hive_climate/tabs/climate_trends.html',
+}
+
+
+def get_hive_status():
+    """Hive connection status shown on the dashboard"""
+    enabled = is_hive_enabled()
+    return {
+        'enabled': enabled,
+        'available': is_hive_available() if enabled else False,
     }
-    
+
+
+def get_data_tab_context():
+    """Context for the Data tab"""
     # Get dynamic sample data from database
     sample_data = get_sample_observations(limit=10)
     
@@ -370,17 +397,26 @@ def dashboard_view(request):
             'ocean_salinity': None,
         }]
     
-    # ETL Pipeline Steps - now dynamic
-    pipeline_steps = get_etl_pipeline_status()
-    
-    # Hive Optimizations
-    optimizations = [
-        {'name': 'Vectorized ORC Reads', 'description': 'Process 1024 rows per batch', 'setting': 'SET hive.vectorized.execution.enabled = true;'},
-        {'name': 'Predicate Pushdown', 'description': 'Filter at storage layer', 'setting': 'SET hive.optimize.ppd = true;'},
-        {'name': 'Cost-Based Optimizer', 'description': 'Statistics-driven query plans', 'setting': 'SET hive.cbo.enable = true;'},
-        {'name': 'Dynamic Partitioning', 'description': 'Auto-create partitions on INSERT', 'setting': 'SET hive.exec.dynamic.partition.mode = nonstrict;'},
-        {'name': 'Map-Side Join', 'description': 'Broadcast small tables to mappers', 'setting': 'SET hive.auto.convert.join = true;'},
-    ]
+    return {
+        'stats': get_dashboard_stats(),
+        'sample_data': sample_data,
+        'regions': get_regions_summary(),
+    }, {}
+
+
+def get_etl_tab_context(hive_available=False):
+    """Context for the ETL tab"""
+    return {
+        'stats': get_dashboard_stats(),
+        'pipeline_steps': get_etl_pipeline_status(hive_available),
+        'optimizations': HIVE_OPTIMIZATIONS,
+    }, {}
+
+
+def get_ml_tab_context():
+    """Context and chart data for the ML Model tab"""
+    # Import ML models here to avoid circular imports
+    from hive_climate.ml_models import train_temperature_model, get_monthly_predictions
     
     # Train ML model and get results
     ml_result = train_temperature_model()
@@ -408,6 +444,21 @@ def dashboard_view(request):
             {'feature': 'precipitation', 'importance': 15, 'coefficient': 0},
         ]
     
+    context = {
+        'ml_models': ml_models,
+        'ml_result': ml_result,
+        'feature_importance': feature_importance,
+    }
+    charts = {
+        'monthly_predictions': monthly_predictions,
+        'actuals': ml_result.get('actuals', []),
+        'predictions': ml_result.get('predictions', []),
+    }
+    return context, charts
+
+
+def get_trends_tab_context():
+    """Context and chart data for the Trends tab"""
     # Dynamic data from database
     temperature_trends = get_temperature_trends()
     precipitation_data = get_precipitation_by_region()
@@ -424,31 +475,98 @@ def dashboard_view(request):
         ocean_data = [{'month': m, 'sst': 27.0, 'salinity': 35.0} for m in ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']]
     
     context = {
-        'table_schema': table_schema,
-        'sample_data': sample_data,
-        'stats': stats,
-        'pipeline_steps': pipeline_steps,
-        'optimizations': optimizations,
-        'ml_models': ml_models,
-        'ml_result': ml_result,
-        'monthly_predictions': monthly_predictions,
-        'feature_importance': feature_importance,
+        'stats': get_dashboard_stats(),
+        'regions': get_regions_summary(),
+    }
+    charts = {
         'temperature_trends': temperature_trends,
         'precipitation_data': precipitation_data,
         'ocean_data': ocean_data,
-        'hive_status': hive_status,
-        'regions': get_regions_summary(),
+    }
+    return context, charts
+
+
+@versioned_cache('dashboard_tab')
+def get_tab_payload(tab, hive_available=False):
+    """
+    Rendered HTML and chart data for one lazily loaded dashboard tab
+    
+    Args:
+        tab: One of DASHBOARD_TABS except 'schema'
+        hive_available: Hive status, shown on the ETL tab
+    """
+    if tab == 'data':
+        context, charts = get_data_tab_context()
+    elif tab == 'etl':
+        context, charts = get_etl_tab_context(hive_available)
+    elif tab == 'ml':
+        context, charts = get_ml_tab_context()
+    elif tab == 'trends':
+        context, charts = get_trends_tab_context()
+    else:
+        raise ValueError(f"Unknown dashboard tab: {tab}")
+    
+    return {
+        'tab': tab,
+        'html': render_to_string(DASHBOARD_TABS[tab], context),
+        'charts': charts,
+    }
+
+
+def warm_dashboard_cache():
+    """
+    Pre-compute every cached dashboard tab for the current data version
+    
+    Returns:
+        Elapsed seconds
+    """
+    # Import ML models here to avoid circular imports
+    from hive_climate.ml_models import ensure_temperature_model
+    
+    start = time.time()
+    hive_available = get_hive_status()['available']
+    ensure_temperature_model()
+    get_dashboard_stats()
+    for tab in DASHBOARD_TABS:
+        if tab not in ('schema', 'ml'):
+            get_tab_payload(tab, hive_available)
+    return round(time.time() - start, 3)
+
+
+def dashboard_view(request):
+    """Main dashboard view; only the default Schema tab is rendered up front"""
+    context = {
+        'table_schema': TABLE_SCHEMA,
+        'stats': get_dashboard_stats(),
+        'optimizations': HIVE_OPTIMIZATIONS,
+        'hive_status': get_hive_status(),
     }
     
     return render(request, 'hive_climate/dashboard.html', context)
 
 
+def dashboard_tab_view(request, tab):
+    """JSON payload for a dashboard tab, fetched by charts.js on first activation"""
+    if tab not in DASHBOARD_TABS or tab == 'schema':
+        raise Http404(f"Unknown dashboard tab: {tab}")
+    
+    if tab == 'ml':
+        # Served from the model registry, which may still hold the previous
+        # version's model while retraining; don't cache that under the new one
+        payload = get_tab_payload.uncached(tab)
+    else:
+        payload = get_tab_payload(tab, get_hive_status()['available'])
+    return JsonResponse(payload)
+
+
 def stations_list(request):
     """List all weather stations"""
     stations = WeatherStation.objects.select_related('region').filter(
         is_active=True
     ).annotate(
-        observation_count=Count('observations')
+        observation_count=Coalesce('summary__observation_count', 0),
+        first_observation_date=F('summary__first_observation_date'),
+        last_observation_date=F('summary__last_observation_date'),
     ).order_by('country', 'station_name')
     
     region_code = request.GET.get('region')
@@ -474,30 +592,30 @@ def stations_list(request):
 
 
 def station_detail(request, station_id):
-    """Detail view for a single station"""
-    station = get_object_or_404(WeatherStation.objects.select_related('region'), station_id=station_id)
-    
-    recent_observations = station.observations.order_by('-observation_date')[:30]
-    
-    stats = station.observations.aggregate(
-        avg_temp=Avg('temp_mean'),
-        avg_precip=Avg('precipitation'),
-        avg_humidity=Avg('humidity'),
-        min_temp=Min('temp_min'),
-        max_temp=Max('temp_max'),
-        total_observations=Count('id'),
+    """Detail view for a single station, served from its precomputed profile"""
+    station = get_object_or_404(
+        WeatherStation.objects.select_related('region', 'profile'), station_id=station_id
     )
     
-    monthly_data = station.observations.values('month').annotate(
-        avg_temp=Avg('temp_mean'),
-        avg_precip=Avg('precipitation'),
-    ).order_by('month')
+    profile = getattr(station, 'profile', None)
+    if profile is not None:
+        stats = profile.statistics
+        monthly_data = profile.climatology
+        recent_observations = [
+            {**obs, 'observation_date': parse_date(obs['observation_date'])}
+            for obs in profile.recent_observations
+        ]
+    else:
+        # No observations yet
+        stats = {'total_observations': 0}
+        monthly_data = []
+        recent_observations = []
     
     context = {
         'station': station,
         'recent_observations': recent_observations,
         'stats': stats,
-        'monthly_data': list(monthly_data),
+        'monthly_data': monthly_data,
     }
     
     return render(request, 'hive_climate/station_detail.html', context)
@@ -145,6 +145,10 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'hive_climate.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
@@ -184,5 +188,116 @@ HIVE_ENABLED = os.getenv('HIVE_ENABLED', 'true').lower() == 'true'
 # When True, the app gracefully falls back to SQLite when Hive is unavailable
 USE_SQLITE_FALLBACK = os.getenv('USE_SQLITE_FALLBACK', 'true').lower() == 'true'
 
+# Analytics pushdown (see hive_climate.services.pushdown): 'auto' runs an
+# aggregation on Hive when the local copy doesn't cover the requested years
+# or the range holds more than HIVE_PUSHDOWN_ROW_THRESHOLD observations;
+# 'off' always uses the local database
+HIVE_PUSHDOWN = os.getenv('HIVE_PUSHDOWN', 'auto')
+HIVE_PUSHDOWN_ROW_THRESHOLD = int(os.getenv('HIVE_PUSHDOWN_ROW_THRESHOLD', 5000000))
+# Hive-side changes don't bump the local data version, so keep this short
+HIVE_PUSHDOWN_CACHE_TIMEOUT = int(os.getenv('HIVE_PUSHDOWN_CACHE_TIMEOUT', 5 * 60))
+# Seconds a Hive availability probe is reused for per-request engine choice
+HIVE_AVAILABILITY_TTL = int(os.getenv('HIVE_AVAILABILITY_TTL', 30))
+HIVE_OBSERVATIONS_TABLE = os.getenv('HIVE_OBSERVATIONS_TABLE', 'africa_climate_observations')
+
+# Hive query jobs (see hive_climate.services.query_jobs): queries run on a
+# worker pool and their rows are spooled to HIVE_QUERY_SPOOL_DIR. The
+# synchronous execute endpoints wait HIVE_QUERY_SYNC_WAIT seconds before
+# answering 202 with the job to poll.
+HIVE_QUERY_WORKERS = int(os.getenv('HIVE_QUERY_WORKERS', 4))
+HIVE_QUERY_SYNC_WAIT = float(os.getenv('HIVE_QUERY_SYNC_WAIT', 10))
+HIVE_QUERY_JOB_TTL = int(os.getenv('HIVE_QUERY_JOB_TTL', 60 * 60))
+HIVE_QUERY_JOB_TIMEOUT = int(os.getenv('HIVE_QUERY_JOB_TIMEOUT', 60 * 60))
+HIVE_QUERY_FETCH_SIZE = int(os.getenv('HIVE_QUERY_FETCH_SIZE', 10000))
+HIVE_QUERY_PAGE_MAX = int(os.getenv('HIVE_QUERY_PAGE_MAX', 10000))
+HIVE_QUERY_SPOOL_DIR = os.getenv('HIVE_QUERY_SPOOL_DIR')
+
 # Data directory for CSV files (used for sample data loading)
 DATA_DIR = BASE_DIR / 'data'
+
+# Parallel CSV loading (load_sample_data)
+# Number of parser processes and approximate bytes of CSV text per shard
+CSV_LOAD_WORKERS = int(os.getenv('CSV_LOAD_WORKERS', os.cpu_count() or 1))
+CSV_LOAD_SHARD_SIZE = int(os.getenv('CSV_LOAD_SHARD_SIZE_MB', 8)) * 1024 * 1024
+
+# Limits for POST /api/observations/ingest/ batches
+INGEST_MAX_ROWS = int(os.getenv('INGEST_MAX_ROWS', 50000))
+INGEST_MAX_BYTES = int(os.getenv('INGEST_MAX_BYTES_MB', 32)) * 1024 * 1024
+
+# Load observations into a staging table and swap it in when complete
+STAGED_LOADS = os.getenv('STAGED_LOADS', 'true').lower() == 'true'
+# API writes are refused while a staged load runs; the lock expires after this many seconds
+STAGED_LOAD_LOCK_TIMEOUT = int(os.getenv('STAGED_LOAD_LOCK_TIMEOUT', 6 * 60 * 60))
+
+# Cache
+# Shared between worker processes: Redis when REDIS_URL is set, otherwise
+# a file-based cache on the local disk
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    import tempfile
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'mbv_africa_cache')),
+        }
+    }
+
+# Dashboard data is cached per data version (see hive_climate.services.data_version)
+DATA_CACHE_TIMEOUT = int(os.getenv('DATA_CACHE_TIMEOUT', 24 * 60 * 60))
+DASHBOARD_CACHE_WARM_UP = os.getenv('DASHBOARD_CACHE_WARM_UP', 'true').lower() == 'true'
+
+# Seconds shared caches may serve data-versioned API responses before
+# revalidating with the ETag (see hive_climate.conditional)
+API_CACHE_MAX_AGE = int(os.getenv('API_CACHE_MAX_AGE', 60))
+
+# Most cells an /api/analytics/cube/ response returns
+ANALYTICS_CUBE_MAX_CELLS = int(os.getenv('ANALYTICS_CUBE_MAX_CELLS', 50000))
+
+# Admission control for expensive endpoints (see hive_climate.admission).
+# Each class runs at most 'concurrency' requests per server process and
+# queues up to 'queue' more for 'timeout' seconds; beyond that requests
+# are shed with 429 (queue full) or 503 (waited too long) and Retry-After.
+ADMISSION_CONTROL_ENABLED = os.getenv('ADMISSION_CONTROL_ENABLED', 'True').lower() == 'true'
+ADMISSION_CONTROL = {
+    # Hive metadata, HDFS and docker stats collection
+    'metrics': {
+        'concurrency': int(os.getenv('ADMISSION_METRICS_CONCURRENCY', 1)),
+        'queue': int(os.getenv('ADMISSION_METRICS_QUEUE', 2)),
+        'timeout': float(os.getenv('ADMISSION_METRICS_TIMEOUT', 5)),
+    },
+    # Benchmark runs
+    'assessment': {
+        'concurrency': int(os.getenv('ADMISSION_ASSESSMENT_CONCURRENCY', 2)),
+        'queue': int(os.getenv('ADMISSION_ASSESSMENT_QUEUE', 4)),
+        'timeout': float(os.getenv('ADMISSION_ASSESSMENT_TIMEOUT', 10)),
+    },
+    # Analytics aggregations
+    'analytics': {
+        'concurrency': int(os.getenv('ADMISSION_ANALYTICS_CONCURRENCY', 4)),
+        'queue': int(os.getenv('ADMISSION_ANALYTICS_QUEUE', 16)),
+        'timeout': float(os.getenv('ADMISSION_ANALYTICS_TIMEOUT', 5)),
+    },
+}
+
+# ML models are trained once per data version (see hive_climate.services.model_registry);
+# a training run older than this many seconds is considered abandoned
+ML_TRAINING_TIMEOUT = int(os.getenv('ML_TRAINING_TIMEOUT', 600))
+
+# Largest point budget accepted by /api/analytics/series/
+SERIES_MAX_POINTS = int(os.getenv('SERIES_MAX_POINTS', 5000))
+
+# Reference period (first year, last year) for climatology baselines and anomalies
+CLIMATOLOGY_REFERENCE_PERIOD = (
+    int(os.getenv('CLIMATOLOGY_REFERENCE_START', 1991)),
+    int(os.getenv('CLIMATOLOGY_REFERENCE_END', 2020)),
+)
+
+# Rows per database fetch and per Parquet row group in streamed exports
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 10000))